@@ -4,10 +4,29 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+# "supabase" (default) or "sqlite" for a local database (load testing / benchmarks)
+DATA_BACKEND = os.getenv("DATA_BACKEND", "supabase").lower()
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("Missing Supabase environment variables! Please set SUPABASE_URL and SUPABASE_KEY.")
+if DATA_BACKEND == "sqlite":
+    from utils.sqlite_backend import SQLiteClient
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
+    # Same query builder as the Supabase client, backed by a local file (see seed_local_database.py)
+    # SQLITE_MAX_ROWS mirrors Supabase's 1000-row API cap; 0 turns it off
+    supabase = SQLiteClient(
+        os.getenv("SQLITE_PATH", "cesms_local.db"),
+        max_rows=int(os.getenv("SQLITE_MAX_ROWS", "1000"))
+    )
+else:
+    SUPABASE_URL = os.getenv("SUPABASE_URL")
+    SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Missing Supabase environment variables! Please set SUPABASE_URL and SUPABASE_KEY.")
+
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+# Time and record every query per request when QUERY_STATS=1 (see utils/query_stats.py)
+from utils.query_stats import QUERY_STATS_ENABLED, InstrumentedClient
+
+if QUERY_STATS_ENABLED:
+    supabase = InstrumentedClient(supabase)
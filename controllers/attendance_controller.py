@@ -1,6 +1,7 @@
 from flask import render_template, request, redirect, url_for, flash, session, jsonify
-from models.user import User
+from utils.identity import current_user
 from models.event_registrations import EventRegistrations
+from utils.checkin_sessions import checkin_sessions
 from config import supabase
 
 def scan_qr():
@@ -11,13 +12,11 @@ def scan_qr():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a department
     if user["role"] != "department":
         flash("Access denied. Department accounts only.", "danger")
@@ -33,8 +32,7 @@ def scan_qr():
         # Filter to show ONLY Ongoing events (not Active)
         from models.event_management import EventManagement
         scannable_events = []
-        for event in all_events:
-            display_status = EventManagement.get_event_display_status(event)
+        for event, display_status in zip(all_events, EventManagement.get_display_statuses(all_events)):
             # Only allow scanning for Ongoing events
             if display_status == "Ongoing":
                 event["display_status"] = display_status
@@ -61,12 +59,10 @@ def verify_qr():
         return jsonify({"success": False, "message": "Not authenticated"}), 401
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         return jsonify({"success": False, "message": "User not found"}), 401
     
-    user = user_response.data[0]
-    
     # Check if user is a department or OSAS
     if user["role"] not in ["department", "osas"]:
         return jsonify({"success": False, "message": "Access denied"}), 403
@@ -81,27 +77,25 @@ def verify_qr():
         
         organizer_id = user["id"]
         
-        # Verify event belongs to this department/OSAS
-        if not EventRegistrations.check_event_belongs_to_department(event_id, organizer_id):
+        # Open (or reuse) the in-memory check-in session for this event
+        # Also verifies the event belongs to this department/OSAS
+        checkin_session = checkin_sessions.get(event_id, organizer_id)
+        if not checkin_session:
             return jsonify({"success": False, "message": "Event does not belong to you"}), 403
         
-        # Find registration by unique code and event
-        registration_response = supabase.table("registrations").select(
-            "*, users!registrations_student_id_fkey(full_name, student_id, email)"
-        ).eq("unique_code", unique_code).eq("event_id", event_id).execute()
+        # Validate locally; the attended flag is written in the next batch
+        status, registration = checkin_session.scan(unique_code)
         
-        if not registration_response.data:
+        if status == "not_found":
             return jsonify({"success": False, "message": "Invalid QR code or event mismatch"}), 404
         
-        registration = registration_response.data[0]
-        
         # Check if registration is approved
-        if registration.get("registration_status") != "Approved":
+        if status == "not_approved":
             return jsonify({"success": False, "message": "Registration not approved"}), 400
         
         # Check if already attended
-        if registration.get("attended"):
-            student_name = registration.get("users", {}).get("full_name", "Student")
+        if status == "already_attended":
+            student_name = (registration.get("users") or {}).get("full_name", "Student")
             return jsonify({
                 "success": False, 
                 "message": f"{student_name} has already checked in",
@@ -109,13 +103,7 @@ def verify_qr():
                 "student": registration.get("users")
             }), 400
         
-        # Mark as attended
-        supabase.table("registrations").update({
-            "attended": True,
-            "attended_at": "now()"
-        }).eq("id", registration["id"]).execute()
-        
-        student = registration.get("users", {})
+        student = registration.get("users") or {}
         
         return jsonify({
             "success": True,
@@ -138,13 +126,11 @@ def view_attendance():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a department
     if user["role"] != "department":
         flash("Access denied. Department accounts only.", "danger")
@@ -172,6 +158,9 @@ def view_attendance():
         
         event = event_response.data[0]
         
+        # Write any buffered scans so the report is up to date
+        checkin_sessions.flush(event_id)
+        
         # Get display status for the event
         from models.event_management import EventManagement
         event_display_status = EventManagement.get_event_display_status(event)
@@ -1,6 +1,7 @@
 from flask import render_template, request, redirect, url_for, flash, session
 from models.event_management import EventManagement
-from models.user import User
+from models.records import Event
+from utils.identity import current_user
 
 def view_department_events():
     """Display all events for a specific department management"""
@@ -8,13 +9,11 @@ def view_department_events():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied. Department accounts only.", "danger")
         return redirect(url_for("home"))
@@ -23,16 +22,13 @@ def view_department_events():
         # Get department ID from user
         department_id = user["id"]
         
-        # Auto-update completed events in database
-        EventManagement.auto_update_completed_events()
-        
         # Get all events for this department
         events_response = EventManagement.get_events_by_department(department_id)
-        events = events_response.data if events_response.data else []
+        events = Event.from_rows(events_response.data)
         
         # Add display status to each event
-        for event in events:
-            event["display_status"] = EventManagement.get_event_display_status(event)
+        for event, display_status in zip(events, EventManagement.get_display_statuses(events)):
+            event["display_status"] = display_status
         
         # Get event counts for this department
         counts = EventManagement.get_event_counts_by_status_for_department(department_id)
@@ -69,13 +65,11 @@ def cancel_department_event():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -107,13 +101,11 @@ def postpone_department_event():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -1,7 +1,9 @@
-from flask import render_template, request, redirect, url_for, flash, session
+from datetime import datetime
+from flask import render_template, request, redirect, url_for, flash, session, jsonify
 from models.event_registrations import EventRegistrations
 from models.event_management import EventManagement
-from models.user import User
+from utils.identity import current_user
+from utils.page_cursor import parse_page_cursor
 
 def view_event_registrations():
     """Display all events with their registrations"""
@@ -11,13 +13,11 @@ def view_event_registrations():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied. Department accounts only.", "danger")
         return redirect(url_for("home"))
@@ -27,14 +27,16 @@ def view_event_registrations():
         events_response = EventRegistrations.get_all_department_events(user["id"])
         all_events = events_response.data if events_response.data else []
         
+        # Registration counts for every event in one grouped query
+        registration_counts = EventRegistrations.get_registration_counts_for_events([event["id"] for event in all_events])
+        
         # Add display_status and registration counts for each event
         events_with_counts = []
-        for event in all_events:
+        for event, display_status in zip(all_events, EventManagement.get_display_statuses(all_events)):
             # Add display status
-            event["display_status"] = EventManagement.get_event_display_status(event)
+            event["display_status"] = display_status
             
-            # Get registration counts
-            counts = EventRegistrations.get_registration_counts_by_event(event["id"])
+            counts = registration_counts[event["id"]]
             event["registration_counts"] = counts
             event["total_registrations"] = sum(counts.values())
             events_with_counts.append(event)
@@ -78,13 +80,11 @@ def view_event_registration_details():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -109,25 +109,21 @@ def view_event_registration_details():
         
         event = event_response.data[0]
         
-        # Get registrations for this event
-        registrations_response = EventRegistrations.get_registrations_by_event(event_id)
-        registrations = registrations_response.data if registrations_response.data else []
-        
         # Get registration counts
         counts = EventRegistrations.get_registration_counts_by_event(event_id)
         
         # Get filter from query parameters
         status_filter = request.args.get("status", "all")
         
-        # Filter registrations if needed
-        if status_filter != "all":
-            registrations = [r for r in registrations if r["registration_status"].lower() == status_filter.lower()]
+        # Only the first page is rendered; the rest is loaded from the API while scrolling
+        registrations, next_cursor = EventRegistrations.get_registrations_page(event_id, status=status_filter)
         
         return render_template(
             "department_event_registration_details.html",
             user=user,
             event=event,
             registrations=registrations,
+            next_cursor=next_cursor,
             counts=counts,
             status_filter=status_filter
         )
@@ -143,13 +139,11 @@ def approve_registration():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -167,13 +161,13 @@ def approve_registration():
             flash("Access denied.", "danger")
             return redirect(url_for("event_registrations.view_event_registrations"))
         
-        # Approve registration
-        result = EventRegistrations.approve_registration(registration_id)
+        # Approve registration (refused once the event is full)
+        success, message = EventRegistrations.approve_registration(registration_id, event_id)
         
-        if result:
-            flash("Registration approved successfully! QR code has been generated.", "success")
+        if success:
+            flash(message, "success")
         else:
-            flash("Error approving registration.", "danger")
+            flash(message, "danger")
             
     except Exception as e:
         flash(f"Error approving registration: {str(e)}", "danger")
@@ -187,13 +181,11 @@ def reject_registration():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -225,19 +217,123 @@ def reject_registration():
     return redirect(url_for("event_registrations.view_event_registration_details", event_id=event_id))
 
 
+def bulk_decide_registrations():
+    """
+    Approve or reject many registrations at once (API endpoint)
+    JSON body: {"event_id", "action": "approve"|"reject", "registration_ids": [...]}
+    or {"event_id", "action", "first_n": N} for the N oldest pending registrations
+    """
+    if "user_email" not in session:
+        return jsonify({"success": False, "message": "Not authenticated"}), 401
+    
+    user = current_user()
+    if not user:
+        return jsonify({"success": False, "message": "User not found"}), 401
+    
+    # Department or OSAS (for its own events)
+    if user["role"] not in ["department", "osas"]:
+        return jsonify({"success": False, "message": "Access denied"}), 403
+    
+    try:
+        data = request.get_json() or {}
+        event_id = data.get("event_id")
+        action = data.get("action")
+        registration_ids = data.get("registration_ids")
+        first_n = data.get("first_n")
+        
+        if not event_id or action not in ("approve", "reject"):
+            return jsonify({"success": False, "message": "event_id and a valid action are required"}), 400
+        
+        if registration_ids:
+            if not isinstance(registration_ids, list):
+                return jsonify({"success": False, "message": "registration_ids must be a list"}), 400
+            # Keep the given order, drop duplicates
+            registration_ids = list(dict.fromkeys(registration_ids))
+        else:
+            try:
+                first_n = int(first_n)
+            except (TypeError, ValueError):
+                return jsonify({"success": False, "message": "Provide registration_ids or first_n"}), 400
+            if first_n <= 0:
+                return jsonify({"success": False, "message": "first_n must be positive"}), 400
+        
+        # Verify event belongs to this department/OSAS
+        if not EventRegistrations.check_event_belongs_to_department(event_id, user["id"]):
+            return jsonify({"success": False, "message": "Event does not belong to you"}), 403
+        
+        success, message, outcomes = EventRegistrations.bulk_decide_registrations(
+            event_id,
+            action,
+            registration_ids=registration_ids,
+            first_n=first_n
+        )
+        
+        return jsonify({"success": success, "message": message, "results": outcomes}), 200 if success else 500
+        
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+
+
+def list_event_registrations():
+    """
+    One page of an event's registrations (API endpoint)
+    Query parameters: event_id, status (all|pending|approved|rejected), q (student name or ID), after (cursor)
+    """
+    if "user_email" not in session:
+        return jsonify({"success": False, "message": "Not authenticated"}), 401
+    
+    user = current_user()
+    if not user:
+        return jsonify({"success": False, "message": "User not found"}), 401
+    
+    # Department or OSAS (for its own events)
+    if user["role"] not in ["department", "osas"]:
+        return jsonify({"success": False, "message": "Access denied"}), 403
+    
+    event_id = request.args.get("event_id")
+    status_filter = request.args.get("status", "all").lower()
+    
+    if not event_id:
+        return jsonify({"success": False, "message": "event_id is required"}), 400
+    
+    if status_filter not in ("all", "pending", "approved", "rejected"):
+        return jsonify({"success": False, "message": "Invalid status filter"}), 400
+    
+    after = None
+    if request.args.get("after"):
+        after = parse_page_cursor(request.args.get("after"), datetime)
+        if after is None:
+            return jsonify({"success": False, "message": "Invalid cursor"}), 400
+    
+    try:
+        # Verify event belongs to this department/OSAS
+        if not EventRegistrations.check_event_belongs_to_department(event_id, user["id"]):
+            return jsonify({"success": False, "message": "Event does not belong to you"}), 403
+        
+        registrations, next_cursor = EventRegistrations.get_registrations_page(
+            event_id,
+            status=status_filter,
+            search=request.args.get("q"),
+            after=after
+        )
+        
+        return jsonify({"success": True, "registrations": registrations, "next_cursor": next_cursor}), 200
+        
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+
+
 def cancel_department_event():
     """Cancel an event (Department can only cancel their own events)"""
     if "user_email" not in session:
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -269,13 +365,11 @@ def postpone_department_event():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
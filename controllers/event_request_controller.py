@@ -1,6 +1,6 @@
 from flask import render_template, request, redirect, url_for, flash, session
 from models.event_request import EventRequest
-from models.user import User
+from utils.identity import current_user
 from config import supabase
 
 def request_event():
@@ -11,13 +11,11 @@ def request_event():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied. Department accounts only.", "danger")
         return redirect(url_for("home"))
@@ -1,6 +1,7 @@
 from flask import render_template, request, redirect, url_for, flash, session
 from models.event_request_management import EventRequestManagement
-from models.user import User
+from models.records import EventRequest
+from utils.identity import current_user
 
 def view_event_requests():
     """Display all pending event requests for OSAS approval"""
@@ -10,13 +11,11 @@ def view_event_requests():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied. OSAS accounts only.", "danger")
         return redirect(url_for("home"))
@@ -40,7 +39,7 @@ def view_event_requests():
             requests_response = EventRequestManagement.get_all_pending_requests()
             status_filter = "pending"
         
-        requests = requests_response.data if requests_response.data else []
+        requests = EventRequest.from_rows(requests_response.data)
         
         # Get request counts
         counts = EventRequestManagement.get_request_counts_by_status()
@@ -74,13 +73,11 @@ def approve_event_request():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -112,13 +109,11 @@ def reject_event_request():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
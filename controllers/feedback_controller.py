@@ -1,5 +1,5 @@
 from flask import render_template, request, redirect, url_for, flash, session, jsonify
-from models.user import User
+from utils.identity import current_user
 from models.event_feedback import EventFeedback
 from models.event_registrations import EventRegistrations
 from config import supabase
@@ -12,13 +12,11 @@ def submit_feedback():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
         return redirect(url_for("user.login"))
@@ -125,13 +123,11 @@ def view_event_feedback():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied. Department accounts only.", "danger")
         return redirect(url_for("user.login"))
@@ -1,7 +1,9 @@
 from flask import render_template, request, redirect, url_for, flash, session
-from models.user import User
+from utils.identity import current_user
 from models.event_management import EventManagement
 from config import supabase
+from utils.schedule_index import schedule_index
+from utils.status_scheduler import request_status_recheck
 
 def create_osas_event():
     """OSAS creates their own event directly"""
@@ -9,13 +11,11 @@ def create_osas_event():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied. OSAS accounts only.", "danger")
         return redirect(url_for("home"))
@@ -47,7 +47,8 @@ def create_osas_event():
                 location=location,
                 date=date,
                 start_time=start_time,
-                end_time=end_time
+                end_time=end_time,
+                fresh=True
             )
             
             if has_conflict:
@@ -81,6 +82,12 @@ def create_osas_event():
             if result.data:
                 event_id = result.data[0]["id"]
                 
+                # Block this slot for later conflict checks
+                schedule_index.sync_events(result.data)
+                
+                # Let the status worker know about the new event's end time
+                request_status_recheck()
+                
                 # Add requirements if this is a limited event
                 if participant_limit:
                     import json
@@ -89,12 +96,7 @@ def create_osas_event():
                         requirements = json.loads(requirements_json)
                         
                         from models.event_requirements import EventRequirements
-                        for req in requirements:
-                            EventRequirements.add_requirement_to_event(
-                                event_id,
-                                req.get("name"),
-                                req.get("description", "")
-                            )
+                        EventRequirements.add_requirements_to_event(event_id, requirements)
                     except Exception as e:
                         print(f"Error adding requirements: {e}")
                 
@@ -1,6 +1,6 @@
 from flask import render_template, request, redirect, url_for, flash, session
 from models.event_management import EventManagement
-from models.user import User
+from utils.identity import current_user
 from config import supabase
 
 def view_all_events():
@@ -9,74 +9,37 @@ def view_all_events():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied. OSAS accounts only.", "danger")
         return redirect(url_for("home"))
     
     try:
-        # Auto-update completed events in database
-        EventManagement.auto_update_completed_events()
-        
-        # Get all events
-        events_response = EventManagement.get_all_events()
-        all_events = events_response.data if events_response.data else []
-        
-        # Add display_status to each event
-        for event in all_events:
-            event["display_status"] = EventManagement.get_event_display_status(event)
-        
-        # Calculate counts based on display_status (from ALL events)
-        counts = {"Active": 0, "Ongoing": 0, "Completed": 0, "Cancelled": 0}
-        for event in all_events:
-            display_status = event["display_status"]
-            counts[display_status] = counts.get(display_status, 0) + 1
+        # Counts by display status across all events (aggregated in the database)
+        counts = EventManagement.get_event_display_counts()
         
         # Get filters from query parameters
         status_filter = request.args.get("status", "all")
         event_type_filter = request.args.get("event_type", "all")
         department_filter = request.args.get("department", "all")
         creator_filter = request.args.get("creator", "all")
+        after = request.args.get("after")
+        
+        # Only the rows on this page are fetched, filtered in the query
+        events, next_cursor = EventManagement.get_events_page(
+            status=status_filter,
+            event_type=event_type_filter,
+            creator=creator_filter,
+            department=department_filter,
+            after=after
+        )
         
-        # Start with all events for filtering
-        events = all_events.copy()
-        
-        # Filter by status (use display_status for filtering)
-        if status_filter != "all":
-            events = [e for e in events if e["display_status"].lower() == status_filter.lower()]
-        
-        # Filter by event type (limited vs free for all)
-        if event_type_filter == "limited":
-            events = [e for e in events if e.get("participant_limit") is not None]
-        elif event_type_filter == "free":
-            events = [e for e in events if e.get("participant_limit") is None]
-        
-        # Filter by creator (OSAS vs departments)
-        if creator_filter == "osas":
-            events = [e for e in events if e.get("users", {}).get("role") == "osas"]
-        elif creator_filter == "departments":
-            events = [e for e in events if e.get("users", {}).get("role") == "department"]
-        
-        # Filter by department
-        if department_filter != "all":
-            events = [e for e in events if e.get("users", {}).get("department_name") == department_filter]
-        
-        # Get unique departments for filter options
-        all_departments = set()
-        all_events_response = EventManagement.get_all_events()
-        all_events = all_events_response.data if all_events_response.data else []
-        for event in all_events:
-            dept_name = event.get("users", {}).get("department_name")
-            if dept_name:
-                all_departments.add(dept_name)
-        
-        departments = sorted(list(all_departments))
+        # Department filter options (cached)
+        departments = EventManagement.get_department_names()
         
         return render_template(
             "osas_event_management.html",
@@ -87,7 +50,9 @@ def view_all_events():
             event_type_filter=event_type_filter,
             department_filter=department_filter,
             creator_filter=creator_filter,
-            departments=departments
+            departments=departments,
+            after=after,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
@@ -101,7 +66,9 @@ def view_all_events():
             event_type_filter="all",
             department_filter="all",
             creator_filter="all",
-            departments=[]
+            departments=[],
+            after=None,
+            next_cursor=None
         )
 
 
@@ -111,13 +78,11 @@ def cancel_osas_event():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -148,13 +113,11 @@ def postpone_osas_event():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -205,13 +168,11 @@ def view_event_registrations():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied. OSAS accounts only.", "danger")
         return redirect(url_for("home"))
@@ -264,13 +225,11 @@ def view_event_attendance():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied. OSAS accounts only.", "danger")
         return redirect(url_for("home"))
@@ -302,6 +261,10 @@ def view_event_attendance():
         display_status = EventManagement.get_event_display_status(event)
         event["display_status"] = display_status
         
+        # Write any buffered scans so the report is up to date
+        from utils.checkin_sessions import checkin_sessions
+        checkin_sessions.flush(event_id)
+        
         # Get attendance data
         attendance_response = supabase.table("registrations").select(
             "id, event_id, student_id, registration_status, attended, attended_at, users!registrations_student_id_fkey(full_name, email, student_id)"
@@ -355,13 +318,11 @@ def view_event_feedback():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied. OSAS accounts only.", "danger")
         return redirect(url_for("home"))
@@ -415,13 +376,11 @@ def view_registration_details():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "osas":
         flash("Access denied. OSAS accounts only.", "danger")
         return redirect(url_for("home"))
@@ -453,14 +412,10 @@ def view_registration_details():
             flash("This is a free-for-all event. No registration management needed.", "info")
             return redirect(url_for("osas_event_management.view_all_events"))
         
-        # Get all registrations
-        registrations_response = EventRegistrations.get_registrations_by_event(event_id)
-        all_registrations = registrations_response.data if registrations_response.data else []
-        
-        # Separate by status
-        pending_registrations = [r for r in all_registrations if r["registration_status"] == "Pending"]
-        approved_registrations = [r for r in all_registrations if r["registration_status"] == "Approved"]
-        rejected_registrations = [r for r in all_registrations if r["registration_status"] == "Rejected"]
+        # First page of each status; further pages are loaded from the API while scrolling
+        pending_registrations, pending_cursor = EventRegistrations.get_registrations_page(event_id, status="pending")
+        approved_registrations, approved_cursor = EventRegistrations.get_registrations_page(event_id, status="approved")
+        rejected_registrations, rejected_cursor = EventRegistrations.get_registrations_page(event_id, status="rejected")
         
         # Get counts
         counts = EventRegistrations.get_registration_counts_by_event(event_id)
@@ -472,6 +427,7 @@ def view_registration_details():
             pending_registrations=pending_registrations,
             approved_registrations=approved_registrations,
             rejected_registrations=rejected_registrations,
+            cursors={"pending": pending_cursor, "approved": approved_cursor, "rejected": rejected_cursor},
             counts=counts
         )
         
@@ -485,8 +441,8 @@ def approve_registration():
     if "user_email" not in session:
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] != "osas":
+    user = current_user()
+    if not user or user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
     
@@ -507,9 +463,9 @@ def approve_registration():
         
         event_id = reg_response.data[0]["event_id"]
         
-        # Approve registration
-        EventRegistrations.approve_registration(registration_id)
-        flash("Registration approved successfully!", "success")
+        # Approve registration (refused once the event is full)
+        success, message = EventRegistrations.approve_registration(registration_id, event_id)
+        flash("Registration approved successfully!" if success else message, "success" if success else "danger")
         
         return redirect(url_for("osas_event_management.view_registration_details", event_id=event_id))
         
@@ -523,8 +479,8 @@ def reject_registration():
     if "user_email" not in session:
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] != "osas":
+    user = current_user()
+    if not user or user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
     
@@ -561,12 +517,11 @@ def view_registration_requirements():
     if "user_email" not in session:
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] != "osas":
+    user = current_user()
+    if not user or user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
     
-    user = user_response.data[0]
     registration_id = request.args.get("registration_id")
     
     if not registration_id:
@@ -641,12 +596,11 @@ def manage_event_requirements():
     if "user_email" not in session:
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] != "osas":
+    user = current_user()
+    if not user or user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
     
-    user = user_response.data[0]
     event_id = request.args.get("event_id")
     
     if not event_id:
@@ -691,12 +645,11 @@ def scan_qr():
     if "user_email" not in session:
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] != "osas":
+    user = current_user()
+    if not user or user["role"] != "osas":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
     
-    user = user_response.data[0]
     event_id = request.args.get("event_id")
     
     if not event_id:
@@ -1,6 +1,6 @@
 from flask import render_template, request, redirect, url_for, flash, session
 from models.request_status import RequestStatus
-from models.user import User
+from utils.identity import current_user
 
 def view_request_status():
     """Display all event requests with their status"""
@@ -10,13 +10,11 @@ def view_request_status():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied. Department accounts only.", "danger")
         return redirect(url_for("home"))
@@ -62,13 +60,11 @@ def delete_request():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -100,13 +96,11 @@ def edit_request():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
@@ -213,13 +207,11 @@ def cancel_request():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "department":
         flash("Access denied.", "danger")
         return redirect(url_for("home"))
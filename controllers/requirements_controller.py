@@ -1,5 +1,5 @@
 from flask import render_template, request, redirect, url_for, flash, session, jsonify
-from models.user import User
+from utils.identity import current_user
 from models.event_requirements import EventRequirements
 from models.event_registrations import EventRegistrations
 from config import supabase
@@ -12,13 +12,11 @@ def manage_event_requirements():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a department or OSAS
     if user["role"] not in ["department", "osas"]:
         flash("Access denied. Department or OSAS accounts only.", "danger")
@@ -66,8 +64,8 @@ def add_requirement():
     if "user_email" not in session:
         return jsonify({"success": False, "message": "Not authenticated"}), 401
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] not in ["department", "osas"]:
+    user = current_user()
+    if not user or user["role"] not in ["department", "osas"]:
         return jsonify({"success": False, "message": "Access denied"}), 403
     
     try:
@@ -80,7 +78,7 @@ def add_requirement():
             return jsonify({"success": False, "message": "Missing required fields"}), 400
         
         # Verify event belongs to department
-        department_id = user_response.data[0]["id"]
+        department_id = user["id"]
         if not EventRegistrations.check_event_belongs_to_department(event_id, department_id):
             return jsonify({"success": False, "message": "Access denied"}), 403
         
@@ -100,8 +98,8 @@ def delete_requirement():
     if "user_email" not in session:
         return jsonify({"success": False, "message": "Not authenticated"}), 401
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] not in ["department", "osas"]:
+    user = current_user()
+    if not user or user["role"] not in ["department", "osas"]:
         return jsonify({"success": False, "message": "Access denied"}), 403
     
     try:
@@ -127,13 +125,11 @@ def view_registration_requirements():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] not in ["department", "osas"]:
         flash("Access denied.", "danger")
         return redirect(url_for("user.login"))
@@ -204,21 +200,23 @@ def toggle_requirement_verification():
     if "user_email" not in session:
         return jsonify({"success": False, "message": "Not authenticated"}), 401
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] not in ["department", "osas"]:
+    user = current_user()
+    if not user or user["role"] not in ["department", "osas"]:
         return jsonify({"success": False, "message": "Access denied"}), 403
     
     try:
         data = request.get_json()
         registration_id = data.get("registration_id")
-        requirement_id = data.get("requirement_id")
         verified = data.get("verified", False)
         
-        if not registration_id or not requirement_id:
+        # One requirement_id, or requirement_ids to set several at once
+        requirement_ids = data.get("requirement_ids") or ([data["requirement_id"]] if data.get("requirement_id") else [])
+        
+        if not registration_id or not requirement_ids:
             return jsonify({"success": False, "message": "Missing required fields"}), 400
         
-        # Verify requirement
-        result = EventRequirements.verify_requirement(registration_id, requirement_id, verified)
+        # Verify requirements (one upsert)
+        result = EventRequirements.verify_requirements(registration_id, requirement_ids, verified)
         
         if result:
             # Check if all requirements are now verified
@@ -235,6 +233,74 @@ def toggle_requirement_verification():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+def get_requirement_matrix():
+    """Students x requirements of an event as JSON, for bulk verification (Department)"""
+    if "user_email" not in session:
+        return jsonify({"success": False, "message": "Not authenticated"}), 401
+    
+    user = current_user()
+    if not user or user["role"] not in ["department", "osas"]:
+        return jsonify({"success": False, "message": "Access denied"}), 403
+    
+    event_id = request.args.get("event_id")
+    if not event_id:
+        return jsonify({"success": False, "message": "Event ID required"}), 400
+    
+    try:
+        # Verify event belongs to department
+        if not EventRegistrations.check_event_belongs_to_department(event_id, user["id"]):
+            return jsonify({"success": False, "message": "Access denied"}), 403
+        
+        requirements, students = EventRequirements.get_requirement_matrix(event_id)
+        
+        return jsonify({
+            "success": True,
+            "requirements": [
+                {"id": req["id"], "requirement_name": req["requirement_name"], "description": req.get("description")}
+                for req in requirements
+            ],
+            "students": students,
+            "all_verified_count": sum(1 for student in students if student["all_verified"])
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+def bulk_verify_requirements():
+    """Verify/unverify many requirement cells of an event in one write (Department)"""
+    if "user_email" not in session:
+        return jsonify({"success": False, "message": "Not authenticated"}), 401
+    
+    user = current_user()
+    if not user or user["role"] not in ["department", "osas"]:
+        return jsonify({"success": False, "message": "Access denied"}), 403
+    
+    try:
+        data = request.get_json() or {}
+        event_id = data.get("event_id")
+        cells = data.get("cells")
+        
+        if not event_id or not isinstance(cells, list) or not cells:
+            return jsonify({"success": False, "message": "Missing required fields"}), 400
+        
+        # Verify event belongs to department
+        if not EventRegistrations.check_event_belongs_to_department(event_id, user["id"]):
+            return jsonify({"success": False, "message": "Access denied"}), 403
+        
+        updated, all_verified = EventRequirements.set_requirement_verifications(
+            event_id, [cell for cell in cells if isinstance(cell, dict)]
+        )
+        
+        return jsonify({
+            "success": True,
+            "updated": updated,
+            "all_verified": all_verified
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 # Student-side functions
 
 def view_my_requirements():
@@ -243,13 +309,11 @@ def view_my_requirements():
         flash("Please login first.", "warning")
         return redirect(url_for("user.login"))
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
         return redirect(url_for("user.login"))
@@ -316,27 +380,29 @@ def mark_requirement_submitted():
     if "user_email" not in session:
         return jsonify({"success": False, "message": "Not authenticated"}), 401
     
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data or user_response.data[0]["role"] != "student":
+    user = current_user()
+    if not user or user["role"] != "student":
         return jsonify({"success": False, "message": "Access denied"}), 403
     
     try:
         data = request.get_json()
         registration_id = data.get("registration_id")
-        requirement_id = data.get("requirement_id")
         
-        if not registration_id or not requirement_id:
+        # One requirement_id, or requirement_ids to mark several at once
+        requirement_ids = data.get("requirement_ids") or ([data["requirement_id"]] if data.get("requirement_id") else [])
+        
+        if not registration_id or not requirement_ids:
             return jsonify({"success": False, "message": "Missing required fields"}), 400
         
-        student_id = user_response.data[0]["id"]
+        student_id = user["id"]
         
         # Verify registration belongs to this student
         registration = supabase.table("registrations").select("student_id").eq("id", registration_id).execute()
         if not registration.data or registration.data[0]["student_id"] != student_id:
             return jsonify({"success": False, "message": "Access denied"}), 403
         
-        # Mark as submitted
-        result = EventRequirements.mark_requirement_submitted(registration_id, requirement_id)
+        # Mark as submitted (one upsert)
+        result = EventRequirements.mark_requirements_submitted(registration_id, requirement_ids)
         
         if result:
             return jsonify({"success": True}), 200
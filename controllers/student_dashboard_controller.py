@@ -1,5 +1,5 @@
 from flask import render_template, redirect, url_for, flash, session
-from models.user import User
+from utils.identity import current_user
 from models.student_registrations import StudentRegistrations
 
 def view_dashboard():
@@ -10,13 +10,11 @@ def view_dashboard():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a student
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
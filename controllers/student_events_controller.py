@@ -1,11 +1,31 @@
-from flask import render_template, redirect, url_for, flash, session
-from models.user import User
+from flask import render_template, redirect, request, url_for, flash, session, jsonify
+from utils.identity import current_user
+from utils.admission_queue import admission_queue
+from utils.event_status import reference_now
 from models.student_events import StudentEvents
 from models.student_registrations import StudentRegistrations
 from models.event_requirements import EventRequirements
 from models.event_management import EventManagement
-from models.event_feedback import EventFeedback
-from config import supabase
+from models.records import Event
+
+# Flash message and category for each registration outcome
+REGISTRATION_MESSAGES = {
+    "not_found": ("Event not found.", "danger"),
+    "closed": ("This event is no longer accepting registrations.", "danger"),
+    "duplicate": ("You have already registered for this event.", "warning"),
+    "full": ("This event is full. No more seats available.", "danger"),
+    "approved": ("Registration successful! You're all set for this event.", "success"),
+    "pending": ("Registration submitted! Awaiting department approval.", "success"),
+    "error": ("Error creating registration. Please try again.", "danger")
+}
+
+
+def registration_message(outcome, registration_status=None):
+    """Map a reserve_seat outcome to its (message, category)"""
+    if outcome == "registered":
+        outcome = "approved" if registration_status == "Approved" else "pending"
+    return REGISTRATION_MESSAGES.get(outcome, REGISTRATION_MESSAGES["error"])
+
 
 def view_events():
     """Display all active events for students"""
@@ -15,13 +35,11 @@ def view_events():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a student
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
@@ -30,25 +48,32 @@ def view_events():
     try:
         student_id = user["id"]
         
-        # Auto-update completed events in database
-        from models.event_management import EventManagement
-        EventManagement.auto_update_completed_events()
-        
         # Fetch all active events
         events_response = StudentEvents.get_active_events()
-        events = events_response.data if events_response and events_response.data else []
+        events = Event.from_rows(events_response.data if events_response else None)
         
-        # Enhance each event with additional information
-        enhanced_events = []
-        for event in events:
-            # Calculate display status to filter out completed events
-            display_status = EventManagement.get_event_display_status(event)
-            
+        # Drop completed events before doing any further lookups
+        visible_events = []
+        for event, display_status in zip(events, EventManagement.get_display_statuses(events)):
             # Only show Active and Ongoing events (exclude Completed)
             if display_status == "Completed":
                 continue
+            
+            event["display_status"] = display_status  # Add display status for template
+            visible_events.append(event)
+        
+        # Load registration, seat and requirement data for all listed events
+        # in a fixed number of queries instead of several per event
+        limited_event_ids = [e["id"] for e in visible_events if e.get("participant_limit") is not None]
+        registered_event_ids = StudentRegistrations.get_registered_event_ids(student_id)
+        approved_counts = StudentEvents.get_approved_counts(limited_event_ids)
+        requirements_map = EventRequirements.get_requirements_for_events(limited_event_ids)
+        
+        # Enhance each event with additional information
+        enhanced_events = []
+        for event in visible_events:
             # Check if student has already registered
-            has_registered = StudentRegistrations.has_registered(student_id, event["id"])
+            has_registered = event["id"] in registered_event_ids
             
             # Determine event type
             is_free_for_all = event.get("participant_limit") is None
@@ -58,14 +83,11 @@ def view_events():
             available_seats = 0
             is_full = False
             if is_limited:
-                available_seats = StudentEvents.get_available_seats(event["id"])
+                available_seats = max(0, event["participant_limit"] - approved_counts.get(event["id"], 0))
                 is_full = available_seats <= 0
             
             # Get requirements for this event (ONLY if limited, not free-for-all)
-            requirements = []
-            if is_limited and not is_free_for_all:
-                req_response = EventRequirements.get_event_requirements(event["id"])
-                requirements = req_response.data if req_response and req_response.data else []
+            requirements = requirements_map.get(event["id"], []) if is_limited else []
             
             # Add enhanced data
             event["has_registered"] = has_registered
@@ -74,7 +96,6 @@ def view_events():
             event["available_seats"] = available_seats
             event["is_full"] = is_full
             event["requirements"] = requirements
-            event["display_status"] = display_status  # Add display status for template
             
             enhanced_events.append(event)
         
@@ -115,13 +136,11 @@ def register_for_event(event_id):
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a student
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
@@ -130,54 +149,21 @@ def register_for_event(event_id):
     try:
         student_id = user["id"]
         
-        # Check if event exists and is active
-        event_response = StudentEvents.get_event_by_id(event_id)
-        if not event_response or not event_response.data:
-            flash("Event not found.", "danger")
-            return redirect(url_for("student.view_events"))
-        
-        event = event_response.data[0]
-        
-        # Check if event is active
-        if event.get("status") != "Active":
-            flash("This event is no longer accepting registrations.", "danger")
-            return redirect(url_for("student.view_events"))
-        
-        # Check for duplicate registration
-        if StudentRegistrations.has_registered(student_id, event_id):
-            flash("You have already registered for this event.", "warning")
-            return redirect(url_for("student.view_events"))
+        # Popular events: take a place in the admission queue instead of registering inline
+        if admission_queue.is_rush_event(event_id):
+            ticket = admission_queue.enqueue(event_id, student_id)
+            return redirect(url_for("student.view_registration_queue", ticket_id=ticket["id"], event_id=event_id))
         
-        # Determine event type
-        is_free_for_all = event.get("participant_limit") is None
+        # Check the event, duplicates and seats and create the registration in one
+        # atomic database call (free-for-all events are auto-approved)
+        reservation = StudentRegistrations.reserve_seat(student_id, event_id)
         
-        # For limited-seat events, check if full
-        if not is_free_for_all:
-            if StudentEvents.is_event_full(event_id):
-                flash("This event is full. No more seats available.", "danger")
-                return redirect(url_for("student.view_events"))
+        # Initialize requirements for this registration (ONLY for limited events)
+        if reservation["outcome"] == "registered" and reservation["registration_status"] == "Pending":
+            EventRequirements.initialize_requirements_for_registration(reservation["registration_id"], event_id)
         
-        # Create registration
-        # auto_approve=True for free-for-all, False for limited-seat
-        result = StudentRegistrations.create_registration(
-            student_id=student_id,
-            event_id=event_id,
-            auto_approve=is_free_for_all
-        )
-        
-        if result and result.data:
-            registration_id = result.data[0]["id"]
-            
-            # Initialize requirements for this registration (ONLY for limited events)
-            if not is_free_for_all:
-                EventRequirements.initialize_requirements_for_registration(registration_id, event_id)
-            
-            if is_free_for_all:
-                flash("Registration successful! You're all set for this event.", "success")
-            else:
-                flash("Registration submitted! Awaiting department approval.", "success")
-        else:
-            flash("Error creating registration. Please try again.", "danger")
+        message, category = registration_message(reservation["outcome"], reservation["registration_status"])
+        flash(message, category)
         
         return redirect(url_for("student.view_events"))
         
@@ -186,6 +172,55 @@ def register_for_event(event_id):
         return redirect(url_for("student.view_events"))
 
 
+def view_registration_queue(ticket_id):
+    """Waiting page for a rush-mode registration ticket (polls the status endpoint)"""
+    if "user_email" not in session:
+        flash("Please login first.", "warning")
+        return redirect(url_for("user.login"))
+    
+    user = current_user()
+    if not user or user["role"] != "student":
+        flash("Access denied. Student accounts only.", "danger")
+        return redirect(url_for("user.login"))
+    
+    ticket = admission_queue.get_ticket(ticket_id, user["id"], request.args.get("event_id"))
+    if not ticket:
+        flash("Registration ticket not found or expired.", "warning")
+        return redirect(url_for("student.view_events"))
+    
+    event_response = StudentEvents.get_event_by_id(ticket["event_id"])
+    event = event_response.data[0] if event_response and event_response.data else {}
+    
+    return render_template("student_registration_queue.html", user=user, ticket=ticket, event=event)
+
+
+def registration_queue_status(ticket_id):
+    """Status of a rush-mode registration ticket (API endpoint)"""
+    if "user_email" not in session:
+        return jsonify({"success": False, "message": "Not authenticated"}), 401
+    
+    user = current_user()
+    if not user or user["role"] != "student":
+        return jsonify({"success": False, "message": "Access denied"}), 403
+    
+    ticket = admission_queue.get_ticket(ticket_id, user["id"], request.args.get("event_id"))
+    if not ticket:
+        return jsonify({"success": False, "message": "Ticket not found or expired"}), 404
+    
+    done = ticket["status"] != "queued"
+    message, category = registration_message(ticket["status"], ticket["registration_status"]) if done else ("You are in the queue.", "info")
+    
+    return jsonify({
+        "success": True,
+        "done": done,
+        "status": ticket["status"],
+        "ticket_number": ticket["number"],
+        "position": ticket["position"],
+        "message": message,
+        "category": category
+    }), 200
+
+
 def view_event_history():
     """Display all completed events that the student attended"""
     # Check if user is logged in
@@ -194,13 +229,11 @@ def view_event_history():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a student
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
@@ -209,15 +242,12 @@ def view_event_history():
     try:
         student_id = user["id"]
         
-        # Auto-update completed events in database
-        EventManagement.auto_update_completed_events()
-        
-        # Get all registrations for this student with completed events
-        registrations_response = supabase.table("registrations").select(
-            "*, events!registrations_event_id_fkey(*, users!events_department_id_fkey(department_name))"
-        ).eq("student_id", student_id).execute()
+        # Registrations whose events can be completed by now, with their feedback embedded
+        registrations_response = StudentRegistrations.get_event_history_registrations(
+            student_id, reference_now().date().isoformat()
+        )
         
-        if not registrations_response.data:
+        if not registrations_response or not registrations_response.data:
             return render_template(
                 "student_event_history.html",
                 user=user,
@@ -226,13 +256,13 @@ def view_event_history():
         
         # Filter for completed events and enhance with feedback info
         completed_events = []
-        for reg in registrations_response.data:
-            event = reg.get("events", {})
-            if not event:
-                continue
-            
-            # Calculate display status
-            display_status = EventManagement.get_event_display_status(event)
+        registrations = [reg for reg in registrations_response.data if reg.get("events")]
+        
+        # Calculate display statuses for all events at once
+        display_statuses = EventManagement.get_display_statuses([reg["events"] for reg in registrations])
+        
+        for reg, display_status in zip(registrations, display_statuses):
+            event = reg["events"]
             
             # Only include completed events
             if display_status != "Completed":
@@ -251,10 +281,11 @@ def view_event_history():
                 # Limited: can give feedback only if attended
                 can_give_feedback = reg.get("attended", False)
             
-            # Check if feedback already submitted
-            feedback_response = EventFeedback.get_feedback_by_registration(reg["id"])
-            has_feedback = feedback_response and feedback_response.data
-            existing_feedback = feedback_response.data[0] if has_feedback else None
+            # Check if feedback already submitted (embedded; one row per registration at most)
+            existing_feedback = reg.get("event_feedback")
+            if isinstance(existing_feedback, list):
+                existing_feedback = existing_feedback[0] if existing_feedback else None
+            has_feedback = existing_feedback is not None
             
             # Determine organizer name (OSAS or Department)
             event_user = event.get("users", {})
@@ -1,9 +1,7 @@
-from flask import render_template, request, redirect, url_for, flash, session
-from models.user import User
+from flask import render_template, request, redirect, url_for, flash, session, make_response, abort
+from utils.identity import current_user
+from utils.ticket_images import ticket_images, ticket_etag
 from models.student_registrations import StudentRegistrations
-import qrcode
-from io import BytesIO
-import base64
 
 def view_registrations():
     """Display all student registrations with filtering"""
@@ -13,13 +11,11 @@ def view_registrations():
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a student
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
@@ -42,15 +38,13 @@ def view_registrations():
         # Enhance registrations with event status information and filter out completed events
         from models.event_management import EventManagement
         enhanced_registrations = []
-        for reg in registrations:
+        display_statuses = EventManagement.get_display_statuses([reg.get("events") or {} for reg in registrations])
+        for reg, display_status in zip(registrations, display_statuses):
             # Check if event is cancelled
-            event = reg.get("events", {})
+            event = reg.get("events") or {}
             event_status = event.get("status", "Active")
             reg["event_cancelled"] = event_status == "Cancelled"
             
-            # Calculate display status
-            display_status = EventManagement.get_event_display_status(event)
-            
             # Filter out completed events - they should only appear in History
             if display_status != "Completed":
                 enhanced_registrations.append(reg)
@@ -82,13 +76,11 @@ def cancel_registration(registration_id):
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a student
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
@@ -119,13 +111,11 @@ def view_ticket(registration_id):
         return redirect(url_for("user.login"))
     
     # Get user details
-    user_response = User.get_user_by_email(session["user_email"])
-    if not user_response.data:
+    user = current_user()
+    if not user:
         flash("User not found.", "danger")
         return redirect(url_for("user.login"))
     
-    user = user_response.data[0]
-    
     # Check if user is a student
     if user["role"] != "student":
         flash("Access denied. Student accounts only.", "danger")
@@ -161,26 +151,48 @@ def view_ticket(registration_id):
             flash("QR code not available for this registration.", "danger")
             return redirect(url_for("student.view_registrations"))
         
-        # Generate QR code image
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(unique_code)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to base64 for display
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        qr_code_base64 = base64.b64encode(buffered.getvalue()).decode()
+        # The QR image is served (and cached) by its own endpoint
+        qr_url = url_for("student.view_ticket_qr", registration_id=registration_id)
         
         return render_template(
             "student_ticket.html",
             user=user,
             registration=registration,
             event=event,
-            qr_code=qr_code_base64
+            qr_url=qr_url
         )
         
     except Exception as e:
         flash(f"Error loading ticket: {str(e)}", "danger")
         return redirect(url_for("student.view_registrations"))
+
+
+def view_ticket_qr(registration_id):
+    """Serve the QR code image for an approved registration's ticket"""
+    if "user_email" not in session:
+        abort(401)
+    
+    user = current_user()
+    if not user or user["role"] != "student":
+        abort(403)
+    
+    # Only the code and the fields needed to authorize the ticket
+    registration = StudentRegistrations.get_ticket_code(registration_id, user["id"])
+    
+    if not registration or registration.get("registration_status") != "Approved" or not registration.get("unique_code"):
+        abort(404)
+    
+    unique_code = registration["unique_code"]
+    
+    # Answer revalidations with 304 before touching the image cache
+    etag = ticket_etag(unique_code)
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(ticket_images.get_png(unique_code))
+        response.mimetype = "image/png"
+    
+    response.set_etag(etag)
+    # Tickets are per student, so only the browser may cache them
+    response.headers["Cache-Control"] = "private, max-age=86400"
+    return response
@@ -2,6 +2,7 @@ from flask import render_template, request, redirect, url_for, flash, session
 from models.user import User
 from config import supabase
 from utils.email_service import EmailService
+from utils.identity import invalidate_user
 import re
 
 
@@ -26,6 +27,7 @@ def login():
                         u = user.data[0]
                         
                         # Store user information in session
+                        invalidate_user(email)
                         session["user_email"] = email
                         session["user_name"] = u.get("full_name", "User")
                         session["user_role"] = u.get("role", "student")
@@ -58,6 +60,7 @@ def login():
                     # Verify password from database (for old users)
                     if u.get("password") == password:
                         # Store user information in session
+                        invalidate_user(email)
                         session["user_email"] = email
                         session["user_name"] = u.get("full_name", "User")
                         session["user_role"] = u.get("role", "student")
@@ -395,9 +398,9 @@ def reset_password():
             # Update password in Supabase Auth
             # Note: This requires the user to be signed in or use admin API
             # For now, we'll update the users table
-            supabase.table("users").update({
+            User.update_user(email, {
                 "password": password
-            }).eq("email", email).execute()
+            })
             
             # Also update in Supabase Auth if possible
             try:
@@ -425,7 +428,9 @@ def logout():
         # Sign out from Supabase
         supabase.auth.sign_out()
         
-        # Clear session
+        # Clear session and cached identity
+        if "user_email" in session:
+            invalidate_user(session["user_email"])
         session.clear()
         
         flash("Logged out successfully.", "success")
@@ -0,0 +1,67 @@
+-- Transactional Event Request Approval
+-- Run this SQL in your Supabase SQL Editor
+--
+-- Approving a request used to take one round trip for the status update, one
+-- for the event insert and one more per requirement. approve_event_request
+-- does all of it in one call and one transaction: the request row is locked
+-- (SELECT ... FOR UPDATE) so two OSAS users cannot approve it twice, and the
+-- event and its requirements are written together or not at all.
+-- The schedule conflict check stays in the app (utils/schedule_index.py).
+
+-- ============================================
+-- approve_event_request: approve a pending request and create its event
+-- ============================================
+-- outcome: 'approved' | 'not_pending' | 'not_found'
+-- request / event: the updated request row and the new event row, as JSON
+CREATE OR REPLACE FUNCTION public.approve_event_request(p_request_id UUID)
+RETURNS TABLE(outcome TEXT, request_status TEXT, request JSONB, event JSONB) AS $$
+#variable_conflict use_variable
+DECLARE
+    v_request public.event_requests%ROWTYPE;
+    v_event public.events%ROWTYPE;
+BEGIN
+    SELECT * INTO v_request
+    FROM public.event_requests q
+    WHERE q.id = p_request_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'not_found'::TEXT, NULL::TEXT, NULL::JSONB, NULL::JSONB;
+        RETURN;
+    END IF;
+
+    IF v_request.status <> 'Pending' THEN
+        RETURN QUERY SELECT 'not_pending'::TEXT, v_request.status::TEXT, NULL::JSONB, NULL::JSONB;
+        RETURN;
+    END IF;
+
+    UPDATE public.event_requests q
+    SET status = 'Approved'
+    WHERE q.id = p_request_id
+    RETURNING * INTO v_request;
+
+    INSERT INTO public.events (
+        event_request_id, event_name, description, location, date,
+        start_time, end_time, participant_limit, department_id, status
+    )
+    VALUES (
+        v_request.id, v_request.event_name, v_request.description, v_request.location, v_request.date,
+        v_request.start_time, v_request.end_time, v_request.participant_limit, v_request.department_id, 'Active'
+    )
+    RETURNING * INTO v_event;
+
+    -- Requirement names from the request's JSON array, in one insert
+    IF jsonb_typeof(v_request.requirements) = 'array' THEN
+        INSERT INTO public.event_requirements (event_id, requirement_name, description)
+        SELECT v_event.id, req.name, NULL
+        FROM jsonb_array_elements_text(v_request.requirements) AS req(name);
+    END IF;
+
+    RETURN QUERY SELECT 'approved'::TEXT, v_request.status::TEXT, to_jsonb(v_request), to_jsonb(v_event);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+GRANT EXECUTE ON FUNCTION public.approve_event_request(UUID) TO anon, authenticated;
+
+-- Success message
+SELECT 'approve_event_request function created successfully!' AS status;
@@ -0,0 +1,42 @@
+-- OSAS Dashboard KPI View
+-- Run this SQL in your Supabase SQL Editor
+--
+-- Computes every OSAS dashboard number in the database so the app reads a
+-- single small row instead of downloading registrations and feedback.
+-- The SELECT only uses portable SQL (scalar subqueries, CASE, COUNT DISTINCT,
+-- AVG) so it also runs unchanged on a local Postgres or SQLite copy.
+
+CREATE OR REPLACE VIEW public.osas_dashboard_kpis AS
+SELECT
+    -- Events by status
+    (SELECT COUNT(*) FROM events) AS total_events,
+    (SELECT COUNT(*) FROM events WHERE status = 'Active') AS active_events,
+    (SELECT COUNT(*) FROM events WHERE status = 'Completed') AS completed_events,
+    (SELECT COUNT(*) FROM events WHERE status = 'Cancelled') AS cancelled_events,
+
+    -- Event requests by status
+    (SELECT COUNT(*) FROM event_requests WHERE status = 'Pending') AS pending_requests,
+    (SELECT COUNT(*) FROM event_requests WHERE status = 'Approved') AS approved_requests,
+    (SELECT COUNT(*) FROM event_requests WHERE status = 'Rejected') AS rejected_requests,
+
+    -- Registrations
+    (SELECT COUNT(*) FROM registrations) AS total_registrations,
+    (SELECT COUNT(*) FROM registrations WHERE registration_status = 'Pending') AS pending_registrations,
+    (SELECT COUNT(*) FROM registrations WHERE registration_status = 'Approved') AS approved_registrations,
+    (SELECT COUNT(*) FROM registrations WHERE registration_status = 'Approved' AND attended = TRUE) AS total_attended,
+    (SELECT COUNT(DISTINCT student_id) FROM registrations WHERE attended = TRUE) AS unique_participants,
+
+    -- Feedback
+    (SELECT COUNT(*) FROM event_feedback) AS total_feedback,
+    (SELECT AVG(rating) FROM event_feedback) AS average_rating;
+
+-- Indexes backing the counts above
+CREATE INDEX IF NOT EXISTS idx_events_status ON public.events(status);
+CREATE INDEX IF NOT EXISTS idx_event_requests_status ON public.event_requests(status);
+CREATE INDEX IF NOT EXISTS idx_registrations_status_attended ON public.registrations(registration_status, attended);
+CREATE INDEX IF NOT EXISTS idx_registrations_attended_student ON public.registrations(attended, student_id);
+
+GRANT SELECT ON public.osas_dashboard_kpis TO anon, authenticated;
+
+-- Success message
+SELECT 'OSAS dashboard KPI view created successfully!' AS status;
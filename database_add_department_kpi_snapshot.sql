@@ -0,0 +1,477 @@
+-- Department KPI Snapshot (rollup table)
+-- Run this SQL in your Supabase SQL Editor
+--
+-- Keeps one row of dashboard numbers per department. Statement-level
+-- triggers read the changed rows from the transition tables and add their
+-- deltas (+1 for the new version of a row, -1 for the old one) whenever an
+-- event changes status, an event request is created/decided, a registration
+-- is approved/rejected/attended, or feedback is submitted. No trigger scans a
+-- department's events or registrations, so the per-row loops in
+-- reserve_seats/approve_registrations_with_seats stay cheap.
+-- Only moving or deleting an event (rare) recomputes the whole row.
+-- The numbers match what app.department_dashboard used to compute in Python.
+-- database_verify_department_kpi_snapshot.sql checks every row against a full recount.
+
+-- ============================================
+-- PART 1: Snapshot table
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS public.department_kpi_snapshot (
+    department_id UUID PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+    total_events INTEGER NOT NULL DEFAULT 0,
+    active_events INTEGER NOT NULL DEFAULT 0,
+    ongoing_events INTEGER NOT NULL DEFAULT 0,
+    completed_events INTEGER NOT NULL DEFAULT 0,
+    cancelled_events INTEGER NOT NULL DEFAULT 0,
+    pending_requests INTEGER NOT NULL DEFAULT 0,
+    approved_requests INTEGER NOT NULL DEFAULT 0,
+    rejected_requests INTEGER NOT NULL DEFAULT 0,
+    total_registrations INTEGER NOT NULL DEFAULT 0,
+    pending_registrations INTEGER NOT NULL DEFAULT 0,
+    approved_registrations INTEGER NOT NULL DEFAULT 0,
+    total_attended INTEGER NOT NULL DEFAULT 0,
+    unique_participants INTEGER NOT NULL DEFAULT 0,
+    total_feedback INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Attended registrations per (department, student): a student is one unique
+-- participant while their count is above zero
+CREATE TABLE IF NOT EXISTS public.department_kpi_participants (
+    department_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+    student_id UUID NOT NULL,
+    attended_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (department_id, student_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_events_department_id ON public.events(department_id);
+CREATE INDEX IF NOT EXISTS idx_event_requests_department_id ON public.event_requests(department_id);
+CREATE INDEX IF NOT EXISTS idx_registrations_event_id ON public.registrations(event_id);
+
+-- ============================================
+-- PART 2: Recompute one department's row (backfill, moved/deleted events)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.refresh_department_kpi_snapshot(p_department_id UUID)
+RETURNS VOID AS $$
+BEGIN
+    IF p_department_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM public.department_kpi_participants WHERE department_id = p_department_id;
+    INSERT INTO public.department_kpi_participants (department_id, student_id, attended_count)
+    SELECT p_department_id, r.student_id, COUNT(*)
+    FROM public.registrations r
+    JOIN public.events e ON e.id = r.event_id
+    WHERE e.department_id = p_department_id AND r.attended AND r.student_id IS NOT NULL
+    GROUP BY r.student_id;
+
+    INSERT INTO public.department_kpi_snapshot (
+        department_id, total_events, active_events, ongoing_events, completed_events, cancelled_events,
+        pending_requests, approved_requests, rejected_requests,
+        total_registrations, pending_registrations, approved_registrations, total_attended, unique_participants,
+        total_feedback, rating_sum, updated_at
+    )
+    SELECT
+        p_department_id,
+        ev.total_events, ev.active_events, ev.ongoing_events, ev.completed_events, ev.cancelled_events,
+        rq.pending_requests, rq.approved_requests, rq.rejected_requests,
+        rg.total_registrations, rg.pending_registrations, rg.approved_registrations, rg.total_attended, rg.unique_participants,
+        fb.total_feedback, fb.rating_sum,
+        NOW()
+    FROM
+        (SELECT
+            COUNT(*) AS total_events,
+            COUNT(*) FILTER (WHERE status = 'Active') AS active_events,
+            COUNT(*) FILTER (WHERE status = 'Ongoing') AS ongoing_events,
+            COUNT(*) FILTER (WHERE status = 'Completed') AS completed_events,
+            COUNT(*) FILTER (WHERE status = 'Cancelled') AS cancelled_events
+         FROM public.events WHERE department_id = p_department_id) ev,
+        (SELECT
+            COUNT(*) FILTER (WHERE status = 'Pending') AS pending_requests,
+            COUNT(*) FILTER (WHERE status = 'Approved') AS approved_requests,
+            COUNT(*) FILTER (WHERE status = 'Rejected') AS rejected_requests
+         FROM public.event_requests WHERE department_id = p_department_id) rq,
+        (SELECT
+            COUNT(*) AS total_registrations,
+            COUNT(*) FILTER (WHERE r.registration_status = 'Pending') AS pending_registrations,
+            COUNT(*) FILTER (WHERE r.registration_status = 'Approved') AS approved_registrations,
+            COUNT(*) FILTER (WHERE r.registration_status = 'Approved' AND r.attended) AS total_attended,
+            COUNT(DISTINCT r.student_id) FILTER (WHERE r.attended) AS unique_participants
+         FROM public.registrations r
+         JOIN public.events e ON e.id = r.event_id
+         WHERE e.department_id = p_department_id) rg,
+        (SELECT
+            COUNT(*) AS total_feedback,
+            COALESCE(SUM(f.rating), 0) AS rating_sum
+         FROM public.event_feedback f
+         JOIN public.events e ON e.id = f.event_id
+         WHERE e.department_id = p_department_id) fb
+    ON CONFLICT (department_id) DO UPDATE SET
+        total_events = EXCLUDED.total_events,
+        active_events = EXCLUDED.active_events,
+        ongoing_events = EXCLUDED.ongoing_events,
+        completed_events = EXCLUDED.completed_events,
+        cancelled_events = EXCLUDED.cancelled_events,
+        pending_requests = EXCLUDED.pending_requests,
+        approved_requests = EXCLUDED.approved_requests,
+        rejected_requests = EXCLUDED.rejected_requests,
+        total_registrations = EXCLUDED.total_registrations,
+        pending_registrations = EXCLUDED.pending_registrations,
+        approved_registrations = EXCLUDED.approved_registrations,
+        total_attended = EXCLUDED.total_attended,
+        unique_participants = EXCLUDED.unique_participants,
+        total_feedback = EXCLUDED.total_feedback,
+        rating_sum = EXCLUDED.rating_sum,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- ============================================
+-- PART 3: Trigger functions (apply deltas from the transition tables)
+-- ============================================
+
+-- events: created, status changed, moved or removed
+CREATE OR REPLACE FUNCTION public.kpi_snapshot_on_events()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes JSONB;
+    recount UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(c) INTO changes
+        FROM (SELECT department_id, status, 1 AS sign FROM new_rows) c;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT jsonb_agg(c) INTO changes
+        FROM (
+            SELECT n.department_id, n.status, 1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.status IS DISTINCT FROM o.status AND n.department_id IS NOT DISTINCT FROM o.department_id
+            UNION ALL
+            SELECT o.department_id, o.status, -1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.status IS DISTINCT FROM o.status AND n.department_id IS NOT DISTINCT FROM o.department_id
+        ) c;
+
+        -- A moved event takes its registrations and feedback along: recount both departments
+        SELECT array_agg(DISTINCT d.department_id) INTO recount
+        FROM (
+            SELECT n.department_id FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.department_id IS DISTINCT FROM o.department_id
+            UNION
+            SELECT o.department_id FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.department_id IS DISTINCT FROM o.department_id
+        ) d;
+    ELSE
+        -- Registrations and feedback are deleted by ON DELETE CASCADE after the
+        -- event row is gone, so their triggers cannot attribute them: recount
+        SELECT array_agg(DISTINCT department_id) INTO recount FROM old_rows;
+    END IF;
+
+    INSERT INTO public.department_kpi_snapshot AS s (
+        department_id, total_events, active_events, ongoing_events, completed_events, cancelled_events
+    )
+    SELECT
+        c.department_id,
+        SUM(c.sign),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Active'), 0),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Ongoing'), 0),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Completed'), 0),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Cancelled'), 0)
+    FROM jsonb_to_recordset(COALESCE(changes, '[]'::JSONB)) AS c(department_id UUID, status TEXT, sign INTEGER)
+    WHERE c.department_id IS NOT NULL
+    GROUP BY c.department_id
+    ON CONFLICT (department_id) DO UPDATE SET
+        total_events = s.total_events + EXCLUDED.total_events,
+        active_events = s.active_events + EXCLUDED.active_events,
+        ongoing_events = s.ongoing_events + EXCLUDED.ongoing_events,
+        completed_events = s.completed_events + EXCLUDED.completed_events,
+        cancelled_events = s.cancelled_events + EXCLUDED.cancelled_events,
+        updated_at = NOW();
+
+    -- After the deltas, so a recounted row is not adjusted twice
+    PERFORM public.refresh_department_kpi_snapshot(d.department_id)
+    FROM unnest(COALESCE(recount, '{}'::UUID[])) AS d(department_id);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- event_requests: created, decided or removed
+CREATE OR REPLACE FUNCTION public.kpi_snapshot_on_event_requests()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes JSONB;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(c) INTO changes
+        FROM (SELECT department_id, status, 1 AS sign FROM new_rows) c;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT jsonb_agg(c) INTO changes
+        FROM (
+            SELECT n.department_id, n.status, 1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.status IS DISTINCT FROM o.status OR n.department_id IS DISTINCT FROM o.department_id
+            UNION ALL
+            SELECT o.department_id, o.status, -1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE n.status IS DISTINCT FROM o.status OR n.department_id IS DISTINCT FROM o.department_id
+        ) c;
+    ELSE
+        SELECT jsonb_agg(c) INTO changes
+        FROM (SELECT department_id, status, -1 AS sign FROM old_rows) c;
+    END IF;
+
+    INSERT INTO public.department_kpi_snapshot AS s (
+        department_id, pending_requests, approved_requests, rejected_requests
+    )
+    SELECT
+        c.department_id,
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Pending'), 0),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Approved'), 0),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Rejected'), 0)
+    FROM jsonb_to_recordset(COALESCE(changes, '[]'::JSONB)) AS c(department_id UUID, status TEXT, sign INTEGER)
+    WHERE c.department_id IS NOT NULL
+    GROUP BY c.department_id
+    ON CONFLICT (department_id) DO UPDATE SET
+        pending_requests = s.pending_requests + EXCLUDED.pending_requests,
+        approved_requests = s.approved_requests + EXCLUDED.approved_requests,
+        rejected_requests = s.rejected_requests + EXCLUDED.rejected_requests,
+        updated_at = NOW();
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- registrations: created, approved/rejected, attended or removed
+CREATE OR REPLACE FUNCTION public.kpi_snapshot_on_registrations()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes JSONB;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(c) INTO changes
+        FROM (
+            SELECT e.department_id, n.student_id, n.registration_status AS status, n.attended, 1 AS sign
+            FROM new_rows n JOIN public.events e ON e.id = n.event_id
+        ) c;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT jsonb_agg(c) INTO changes
+        FROM (
+            SELECT e.department_id, n.student_id, n.registration_status AS status, n.attended, 1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            JOIN public.events e ON e.id = n.event_id
+            WHERE n.registration_status IS DISTINCT FROM o.registration_status
+               OR n.attended IS DISTINCT FROM o.attended
+               OR n.student_id IS DISTINCT FROM o.student_id
+               OR n.event_id IS DISTINCT FROM o.event_id
+            UNION ALL
+            SELECT e.department_id, o.student_id, o.registration_status AS status, o.attended, -1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            JOIN public.events e ON e.id = o.event_id
+            WHERE n.registration_status IS DISTINCT FROM o.registration_status
+               OR n.attended IS DISTINCT FROM o.attended
+               OR n.student_id IS DISTINCT FROM o.student_id
+               OR n.event_id IS DISTINCT FROM o.event_id
+        ) c;
+    ELSE
+        SELECT jsonb_agg(c) INTO changes
+        FROM (
+            SELECT e.department_id, o.student_id, o.registration_status AS status, o.attended, -1 AS sign
+            FROM old_rows o JOIN public.events e ON e.id = o.event_id
+        ) c;
+    END IF;
+
+    IF changes IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO public.department_kpi_snapshot AS s (
+        department_id, total_registrations, pending_registrations, approved_registrations, total_attended
+    )
+    SELECT
+        c.department_id,
+        SUM(c.sign),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Pending'), 0),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Approved'), 0),
+        COALESCE(SUM(c.sign) FILTER (WHERE c.status = 'Approved' AND c.attended), 0)
+    FROM jsonb_to_recordset(changes) AS c(department_id UUID, status TEXT, attended BOOLEAN, sign INTEGER)
+    WHERE c.department_id IS NOT NULL
+    GROUP BY c.department_id
+    ON CONFLICT (department_id) DO UPDATE SET
+        total_registrations = s.total_registrations + EXCLUDED.total_registrations,
+        pending_registrations = s.pending_registrations + EXCLUDED.pending_registrations,
+        approved_registrations = s.approved_registrations + EXCLUDED.approved_registrations,
+        total_attended = s.total_attended + EXCLUDED.total_attended,
+        updated_at = NOW();
+
+    -- unique_participants moves only when a student's attended count crosses zero
+    WITH delta AS (
+        SELECT c.department_id, c.student_id, SUM(c.sign)::INTEGER AS change
+        FROM jsonb_to_recordset(changes) AS c(department_id UUID, student_id UUID, attended BOOLEAN, sign INTEGER)
+        WHERE c.attended AND c.department_id IS NOT NULL AND c.student_id IS NOT NULL
+        GROUP BY c.department_id, c.student_id
+        HAVING SUM(c.sign) <> 0
+    ),
+    counted AS (
+        INSERT INTO public.department_kpi_participants AS p (department_id, student_id, attended_count)
+        SELECT department_id, student_id, change FROM delta
+        ON CONFLICT (department_id, student_id) DO UPDATE SET
+            attended_count = p.attended_count + EXCLUDED.attended_count
+        RETURNING p.department_id, p.student_id, p.attended_count
+    )
+    INSERT INTO public.department_kpi_snapshot AS s (department_id, unique_participants)
+    SELECT
+        k.department_id,
+        SUM(CASE
+            WHEN k.attended_count > 0 AND k.attended_count - d.change <= 0 THEN 1
+            WHEN k.attended_count <= 0 AND k.attended_count - d.change > 0 THEN -1
+            ELSE 0
+        END)
+    FROM counted k
+    JOIN delta d ON d.department_id = k.department_id AND d.student_id = k.student_id
+    GROUP BY k.department_id
+    ON CONFLICT (department_id) DO UPDATE SET
+        unique_participants = s.unique_participants + EXCLUDED.unique_participants,
+        updated_at = NOW();
+
+    DELETE FROM public.department_kpi_participants p
+    USING jsonb_to_recordset(changes) AS c(department_id UUID, student_id UUID)
+    WHERE p.department_id = c.department_id AND p.student_id = c.student_id AND p.attended_count <= 0;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- event_feedback: submitted, re-rated or removed
+CREATE OR REPLACE FUNCTION public.kpi_snapshot_on_event_feedback()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes JSONB;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(c) INTO changes
+        FROM (
+            SELECT e.department_id, n.rating, 1 AS sign
+            FROM new_rows n JOIN public.events e ON e.id = n.event_id
+        ) c;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT jsonb_agg(c) INTO changes
+        FROM (
+            SELECT e.department_id, n.rating, 1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            JOIN public.events e ON e.id = n.event_id
+            WHERE n.rating IS DISTINCT FROM o.rating OR n.event_id IS DISTINCT FROM o.event_id
+            UNION ALL
+            SELECT e.department_id, o.rating, -1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            JOIN public.events e ON e.id = o.event_id
+            WHERE n.rating IS DISTINCT FROM o.rating OR n.event_id IS DISTINCT FROM o.event_id
+        ) c;
+    ELSE
+        SELECT jsonb_agg(c) INTO changes
+        FROM (
+            SELECT e.department_id, o.rating, -1 AS sign
+            FROM old_rows o JOIN public.events e ON e.id = o.event_id
+        ) c;
+    END IF;
+
+    INSERT INTO public.department_kpi_snapshot AS s (department_id, total_feedback, rating_sum)
+    SELECT
+        c.department_id,
+        SUM(c.sign),
+        COALESCE(SUM(c.sign * c.rating), 0)
+    FROM jsonb_to_recordset(COALESCE(changes, '[]'::JSONB)) AS c(department_id UUID, rating INTEGER, sign INTEGER)
+    WHERE c.department_id IS NOT NULL
+    GROUP BY c.department_id
+    ON CONFLICT (department_id) DO UPDATE SET
+        total_feedback = s.total_feedback + EXCLUDED.total_feedback,
+        rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+        updated_at = NOW();
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- ============================================
+-- PART 4: Statement-level triggers
+-- (transition tables need one trigger per operation)
+-- ============================================
+
+DROP TRIGGER IF EXISTS kpi_snapshot_events_insert ON public.events;
+DROP TRIGGER IF EXISTS kpi_snapshot_events_update ON public.events;
+DROP TRIGGER IF EXISTS kpi_snapshot_events_delete ON public.events;
+CREATE TRIGGER kpi_snapshot_events_insert AFTER INSERT ON public.events
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_events();
+CREATE TRIGGER kpi_snapshot_events_update AFTER UPDATE ON public.events
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_events();
+CREATE TRIGGER kpi_snapshot_events_delete AFTER DELETE ON public.events
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_events();
+
+DROP TRIGGER IF EXISTS kpi_snapshot_event_requests_insert ON public.event_requests;
+DROP TRIGGER IF EXISTS kpi_snapshot_event_requests_update ON public.event_requests;
+DROP TRIGGER IF EXISTS kpi_snapshot_event_requests_delete ON public.event_requests;
+CREATE TRIGGER kpi_snapshot_event_requests_insert AFTER INSERT ON public.event_requests
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_event_requests();
+CREATE TRIGGER kpi_snapshot_event_requests_update AFTER UPDATE ON public.event_requests
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_event_requests();
+CREATE TRIGGER kpi_snapshot_event_requests_delete AFTER DELETE ON public.event_requests
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_event_requests();
+
+DROP TRIGGER IF EXISTS kpi_snapshot_registrations_insert ON public.registrations;
+DROP TRIGGER IF EXISTS kpi_snapshot_registrations_update ON public.registrations;
+DROP TRIGGER IF EXISTS kpi_snapshot_registrations_delete ON public.registrations;
+CREATE TRIGGER kpi_snapshot_registrations_insert AFTER INSERT ON public.registrations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_registrations();
+CREATE TRIGGER kpi_snapshot_registrations_update AFTER UPDATE ON public.registrations
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_registrations();
+CREATE TRIGGER kpi_snapshot_registrations_delete AFTER DELETE ON public.registrations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_registrations();
+
+DROP TRIGGER IF EXISTS kpi_snapshot_event_feedback_insert ON public.event_feedback;
+DROP TRIGGER IF EXISTS kpi_snapshot_event_feedback_update ON public.event_feedback;
+DROP TRIGGER IF EXISTS kpi_snapshot_event_feedback_delete ON public.event_feedback;
+CREATE TRIGGER kpi_snapshot_event_feedback_insert AFTER INSERT ON public.event_feedback
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_event_feedback();
+CREATE TRIGGER kpi_snapshot_event_feedback_update AFTER UPDATE ON public.event_feedback
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_event_feedback();
+CREATE TRIGGER kpi_snapshot_event_feedback_delete AFTER DELETE ON public.event_feedback
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.kpi_snapshot_on_event_feedback();
+
+-- ============================================
+-- PART 5: Backfill existing departments
+-- ============================================
+
+-- Every account that owns events or requests, not only role = 'department',
+-- so the first delta never lands on a missing row
+SELECT public.refresh_department_kpi_snapshot(d.id)
+FROM (
+    SELECT id FROM public.users WHERE role = 'department'
+    UNION
+    SELECT department_id FROM public.events WHERE department_id IS NOT NULL
+    UNION
+    SELECT department_id FROM public.event_requests WHERE department_id IS NOT NULL
+) d;
+
+GRANT SELECT ON public.department_kpi_snapshot TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.refresh_department_kpi_snapshot(UUID) TO anon, authenticated;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE 'department_kpi_snapshot created, triggers installed and existing departments backfilled.';
+END $$;
@@ -0,0 +1,75 @@
+-- Registration Rush Mode
+-- Run this SQL in your Supabase SQL Editor (after database_add_seat_reservation.sql)
+--
+-- Events with rush_mode = TRUE do not register students inside the request.
+-- Each request gets a FIFO ticket from the app's admission queue, and a worker
+-- registers queued students in batches with reserve_seats below (one locked
+-- call per batch instead of several round trips per student).
+
+-- Flag popular events, e.g.: UPDATE events SET rush_mode = TRUE WHERE id = '...';
+ALTER TABLE public.events ADD COLUMN IF NOT EXISTS rush_mode BOOLEAN DEFAULT FALSE;
+
+-- ============================================
+-- reserve_seats: reserve_seat for many students, in ticket order
+-- ============================================
+-- outcome per student: 'registered' | 'duplicate' | 'full' | 'closed' | 'not_found'
+CREATE OR REPLACE FUNCTION public.reserve_seats(p_event_id UUID, p_student_ids UUID[])
+RETURNS TABLE(student_id UUID, outcome TEXT, new_registration_id UUID, new_status TEXT, remaining_seats INTEGER) AS $$
+#variable_conflict use_variable
+DECLARE
+    v_limit INTEGER;
+    v_event_status TEXT;
+    v_remaining INTEGER;
+    v_student UUID;
+    v_status TEXT;
+    v_registration_id UUID;
+BEGIN
+    SELECT e.participant_limit, e.status INTO v_limit, v_event_status
+    FROM public.events e
+    WHERE e.id = p_event_id
+    FOR UPDATE;
+
+    IF NOT FOUND OR v_event_status <> 'Active' THEN
+        RETURN QUERY
+        SELECT s, CASE WHEN v_event_status IS NULL THEN 'not_found' ELSE 'closed' END::TEXT, NULL::UUID, NULL::TEXT, NULL::INTEGER
+        FROM unnest(p_student_ids) AS s;
+        RETURN;
+    END IF;
+
+    IF v_limit IS NULL THEN
+        v_status := 'Approved';
+    ELSE
+        v_status := 'Pending';
+        SELECT v_limit - COUNT(*) INTO v_remaining
+        FROM public.registrations r
+        WHERE r.event_id = p_event_id AND r.registration_status = 'Approved';
+    END IF;
+
+    FOREACH v_student IN ARRAY p_student_ids LOOP
+        IF EXISTS (
+            SELECT 1 FROM public.registrations r
+            WHERE r.event_id = p_event_id AND r.student_id = v_student
+        ) THEN
+            RETURN QUERY SELECT v_student, 'duplicate'::TEXT, NULL::UUID, NULL::TEXT, v_remaining;
+            CONTINUE;
+        END IF;
+
+        -- Same rule as reserve_seat: only approved registrations hold seats
+        IF v_limit IS NOT NULL AND v_remaining <= 0 THEN
+            RETURN QUERY SELECT v_student, 'full'::TEXT, NULL::UUID, NULL::TEXT, 0;
+            CONTINUE;
+        END IF;
+
+        INSERT INTO public.registrations (student_id, event_id, registration_status, unique_code)
+        VALUES (v_student, p_event_id, v_status, NULL)
+        RETURNING id INTO v_registration_id;
+
+        RETURN QUERY SELECT v_student, 'registered'::TEXT, v_registration_id, v_status, v_remaining;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+GRANT EXECUTE ON FUNCTION public.reserve_seats(UUID, UUID[]) TO anon, authenticated;
+
+-- Success message
+SELECT 'Rush mode column and reserve_seats function created successfully!' AS status;
@@ -0,0 +1,149 @@
+-- Atomic Seat Reservation
+-- Run this SQL in your Supabase SQL Editor (plain PostgreSQL 13+, so it also
+-- runs against a local Postgres for testing)
+--
+-- Registering and approving used to count approved rows in the app and then
+-- write separately, so two requests could both see the last free seat.
+-- These functions lock the event row (SELECT ... FOR UPDATE) for the duration
+-- of the check and the write, so decisions for the same event are serialized.
+--
+-- A seat is taken by an Approved registration, as before:
+--   * free-for-all events (participant_limit IS NULL) auto-approve
+--   * limited events create a Pending registration while seats remain,
+--     and approval is refused once the approved count reaches the limit
+
+-- ============================================
+-- reserve_seat: register a student for an event
+-- ============================================
+-- outcome: 'registered' | 'duplicate' | 'full' | 'closed' | 'not_found'
+CREATE OR REPLACE FUNCTION public.reserve_seat(p_event_id UUID, p_student_id UUID)
+RETURNS TABLE(outcome TEXT, new_registration_id UUID, new_status TEXT, remaining_seats INTEGER) AS $$
+DECLARE
+    v_limit INTEGER;
+    v_event_status TEXT;
+    v_approved INTEGER;
+    v_registration_id UUID;
+    v_status TEXT;
+BEGIN
+    SELECT e.participant_limit, e.status INTO v_limit, v_event_status
+    FROM public.events e
+    WHERE e.id = p_event_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'not_found'::TEXT, NULL::UUID, NULL::TEXT, NULL::INTEGER;
+        RETURN;
+    END IF;
+
+    IF v_event_status <> 'Active' THEN
+        RETURN QUERY SELECT 'closed'::TEXT, NULL::UUID, NULL::TEXT, NULL::INTEGER;
+        RETURN;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM public.registrations r
+        WHERE r.event_id = p_event_id AND r.student_id = p_student_id
+    ) THEN
+        RETURN QUERY SELECT 'duplicate'::TEXT, NULL::UUID, NULL::TEXT, NULL::INTEGER;
+        RETURN;
+    END IF;
+
+    IF v_limit IS NULL THEN
+        -- Free-for-all: approved immediately, no seat accounting
+        v_status := 'Approved';
+    ELSE
+        SELECT COUNT(*) INTO v_approved
+        FROM public.registrations r
+        WHERE r.event_id = p_event_id AND r.registration_status = 'Approved';
+
+        IF v_approved >= v_limit THEN
+            RETURN QUERY SELECT 'full'::TEXT, NULL::UUID, NULL::TEXT, 0;
+            RETURN;
+        END IF;
+
+        v_status := 'Pending';
+    END IF;
+
+    INSERT INTO public.registrations (student_id, event_id, registration_status, unique_code)
+    VALUES (p_student_id, p_event_id, v_status, NULL)
+    RETURNING id INTO v_registration_id;
+
+    RETURN QUERY SELECT
+        'registered'::TEXT,
+        v_registration_id,
+        v_status,
+        CASE WHEN v_limit IS NULL THEN NULL ELSE v_limit - v_approved END;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- ============================================
+-- approve_registrations_with_seats: approve pending registrations of one event
+-- ============================================
+-- Processes ids in the given order and stops granting seats at the limit.
+-- outcome per id: 'approved' | 'full' | 'not_pending' | 'not_found'
+CREATE OR REPLACE FUNCTION public.approve_registrations_with_seats(p_event_id UUID, p_registration_ids UUID[])
+RETURNS TABLE(registration_id UUID, outcome TEXT, unique_code TEXT, remaining_seats INTEGER) AS $$
+#variable_conflict use_variable
+DECLARE
+    v_limit INTEGER;
+    v_remaining INTEGER;
+    v_id UUID;
+    v_current TEXT;
+    v_code TEXT;
+BEGIN
+    SELECT e.participant_limit INTO v_limit
+    FROM public.events e
+    WHERE e.id = p_event_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    IF v_limit IS NOT NULL THEN
+        SELECT v_limit - COUNT(*) INTO v_remaining
+        FROM public.registrations r
+        WHERE r.event_id = p_event_id AND r.registration_status = 'Approved';
+    END IF;
+
+    FOREACH v_id IN ARRAY p_registration_ids LOOP
+        SELECT r.registration_status INTO v_current
+        FROM public.registrations r
+        WHERE r.id = v_id AND r.event_id = p_event_id
+        FOR UPDATE;
+
+        IF NOT FOUND THEN
+            RETURN QUERY SELECT v_id, 'not_found'::TEXT, NULL::TEXT, v_remaining;
+            CONTINUE;
+        END IF;
+
+        IF v_current <> 'Pending' THEN
+            RETURN QUERY SELECT v_id, 'not_pending'::TEXT, NULL::TEXT, v_remaining;
+            CONTINUE;
+        END IF;
+
+        IF v_limit IS NOT NULL AND v_remaining <= 0 THEN
+            RETURN QUERY SELECT v_id, 'full'::TEXT, NULL::TEXT, 0;
+            CONTINUE;
+        END IF;
+
+        v_code := gen_random_uuid()::TEXT;
+
+        UPDATE public.registrations r
+        SET registration_status = 'Approved', unique_code = v_code, approved_at = NOW()
+        WHERE r.id = v_id;
+
+        IF v_limit IS NOT NULL THEN
+            v_remaining := v_remaining - 1;
+        END IF;
+
+        RETURN QUERY SELECT v_id, 'approved'::TEXT, v_code, v_remaining;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+GRANT EXECUTE ON FUNCTION public.reserve_seat(UUID, UUID) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.approve_registrations_with_seats(UUID, UUID[]) TO anon, authenticated;
+
+-- Success message
+SELECT 'Seat reservation functions created successfully!' AS status;
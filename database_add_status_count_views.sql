@@ -0,0 +1,39 @@
+-- Grouped Status Count Views
+-- Run this SQL in your Supabase SQL Editor
+--
+-- Status counts used to be computed by downloading every registration (or
+-- request) row and counting in Python, once per event. These views group in
+-- the database, so the app reads at most one row per (key, status) and can
+-- batch many events into a single `event_id=in.(...)` request.
+-- Filters on the grouping column are pushed below the GROUP BY by Postgres,
+-- so each request only scans the matching rows.
+
+-- Registrations per event and status
+CREATE OR REPLACE VIEW public.event_registration_counts AS
+SELECT event_id, registration_status, COUNT(*) AS total
+FROM public.registrations
+GROUP BY event_id, registration_status;
+
+-- Registrations per student and status
+CREATE OR REPLACE VIEW public.student_registration_counts AS
+SELECT student_id, registration_status, COUNT(*) AS total
+FROM public.registrations
+GROUP BY student_id, registration_status;
+
+-- Event requests per department and status
+CREATE OR REPLACE VIEW public.department_request_counts AS
+SELECT department_id, status, COUNT(*) AS total
+FROM public.event_requests
+GROUP BY department_id, status;
+
+-- Indexes backing the filtered group-bys above
+CREATE INDEX IF NOT EXISTS idx_registrations_event_status ON public.registrations(event_id, registration_status);
+CREATE INDEX IF NOT EXISTS idx_registrations_student_status ON public.registrations(student_id, registration_status);
+CREATE INDEX IF NOT EXISTS idx_event_requests_department_status ON public.event_requests(department_id, status);
+
+GRANT SELECT ON public.event_registration_counts TO anon, authenticated;
+GRANT SELECT ON public.student_registration_counts TO anon, authenticated;
+GRANT SELECT ON public.department_request_counts TO anon, authenticated;
+
+-- Success message
+SELECT 'Status count views created successfully!' AS status;
@@ -0,0 +1,101 @@
+-- Registration Requirements Unique Key
+-- Run this SQL in your Supabase SQL Editor
+--
+-- Requirement clicks are now a single upsert on (registration_id, requirement_id)
+-- (EventRequirements._upsert_tracking), which needs a unique key on those two
+-- columns. Databases created before the key was added to the setup scripts
+-- can hold duplicates from the old select-then-insert code, so they are
+-- merged first, a chunk of keys at a time, and then the key is added.
+
+-- ============================================
+-- dedupe_registration_requirements: merge one chunk of duplicates
+-- ============================================
+-- Keeps one row per (registration_id, requirement_id), preferring verified and
+-- then submitted rows, and carries over the flags/timestamps of the rows it
+-- deletes. Returns the number of rows deleted (0 when nothing is left to do).
+CREATE OR REPLACE FUNCTION public.dedupe_registration_requirements(p_batch_size INTEGER DEFAULT 5000)
+RETURNS INTEGER AS $$
+DECLARE
+    v_deleted INTEGER;
+BEGIN
+    CREATE TEMP TABLE IF NOT EXISTS tmp_requirement_duplicates (
+        id UUID,
+        keep BOOLEAN,
+        any_submitted BOOLEAN,
+        any_verified BOOLEAN,
+        last_submitted_at TIMESTAMP WITH TIME ZONE,
+        last_verified_at TIMESTAMP WITH TIME ZONE
+    ) ON COMMIT DROP;
+    TRUNCATE tmp_requirement_duplicates;
+
+    INSERT INTO tmp_requirement_duplicates
+    SELECT
+        rr.id,
+        ROW_NUMBER() OVER (
+            PARTITION BY rr.registration_id, rr.requirement_id
+            ORDER BY COALESCE(rr.department_verified, FALSE) DESC,
+                     COALESCE(rr.student_submitted, FALSE) DESC,
+                     rr.created_at ASC, rr.id ASC
+        ) = 1,
+        BOOL_OR(COALESCE(rr.student_submitted, FALSE)) OVER w,
+        BOOL_OR(COALESCE(rr.department_verified, FALSE)) OVER w,
+        MAX(rr.submitted_at) OVER w,
+        MAX(rr.verified_at) OVER w
+    FROM public.registration_requirements rr
+    JOIN (
+        SELECT registration_id, requirement_id
+        FROM public.registration_requirements
+        GROUP BY registration_id, requirement_id
+        HAVING COUNT(*) > 1
+        LIMIT p_batch_size
+    ) dup USING (registration_id, requirement_id)
+    WINDOW w AS (PARTITION BY rr.registration_id, rr.requirement_id);
+
+    UPDATE public.registration_requirements rr
+    SET student_submitted = d.any_submitted,
+        department_verified = d.any_verified,
+        submitted_at = d.last_submitted_at,
+        verified_at = d.last_verified_at
+    FROM tmp_requirement_duplicates d
+    WHERE rr.id = d.id AND d.keep;
+
+    DELETE FROM public.registration_requirements rr
+    USING tmp_requirement_duplicates d
+    WHERE rr.id = d.id AND NOT d.keep;
+
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+    TRUNCATE tmp_requirement_duplicates;
+    RETURN v_deleted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Merge every duplicate, chunk by chunk
+-- (on very large tables run SELECT public.dedupe_registration_requirements(5000);
+-- in separate executions until it returns 0, then run the rest of this file)
+DO $$
+BEGIN
+    LOOP
+        EXIT WHEN public.dedupe_registration_requirements(5000) = 0;
+    END LOOP;
+END $$;
+
+-- The unique key the upserts use (skipped if the table already has it)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = 'public.registration_requirements'::regclass
+          AND contype = 'u'
+          AND conkey = ARRAY[
+              (SELECT attnum FROM pg_attribute WHERE attrelid = 'public.registration_requirements'::regclass AND attname = 'registration_id'),
+              (SELECT attnum FROM pg_attribute WHERE attrelid = 'public.registration_requirements'::regclass AND attname = 'requirement_id')
+          ]::SMALLINT[]
+    ) THEN
+        ALTER TABLE public.registration_requirements
+        ADD CONSTRAINT registration_requirements_registration_id_requirement_id_key
+        UNIQUE (registration_id, requirement_id);
+    END IF;
+END $$;
+
+-- Success message
+SELECT 'Registration requirements deduplicated and unique key added!' AS status;
@@ -0,0 +1,27 @@
+-- Email Outbox Setup
+-- Run this SQL in your Supabase SQL Editor
+
+-- Table: email_outbox
+-- Outgoing messages waiting for the mail workers. Rows survive restarts, so a
+-- queued OTP is still delivered after a deploy or crash.
+CREATE TABLE IF NOT EXISTS public.email_outbox (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    to_email VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    html_content TEXT,
+    text_content TEXT,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    locked_at TIMESTAMP WITHOUT TIME ZONE,
+    sent_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Workers look up unsent messages in creation order
+CREATE INDEX IF NOT EXISTS idx_email_outbox_status_created ON public.email_outbox(status, created_at);
+
+COMMENT ON TABLE public.email_outbox IS 'Persistent queue of outgoing emails (OTP codes, notifications)';
+
+-- Success message
+SELECT 'Email outbox table created successfully!' AS status;
@@ -0,0 +1,25 @@
+-- Scheduler Watermarks Setup
+-- Run this SQL in your Supabase SQL Editor
+
+-- Table: scheduler_watermarks
+-- Persists when each background job next needs to run, so restarts and
+-- multiple app workers share the same schedule
+CREATE TABLE IF NOT EXISTS public.scheduler_watermarks (
+    name VARCHAR(100) PRIMARY KEY,
+    next_run_at TIMESTAMP WITHOUT TIME ZONE,
+    last_run_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Seed the event status job so the first tick runs immediately
+INSERT INTO public.scheduler_watermarks (name, next_run_at)
+VALUES ('event_status', NULL)
+ON CONFLICT (name) DO NOTHING;
+
+-- Index used by the status worker to find the next Active event to finish
+CREATE INDEX IF NOT EXISTS idx_events_status_date_end_time ON public.events(status, date, end_time);
+
+COMMENT ON TABLE public.scheduler_watermarks IS 'Next/last run times for background jobs (e.g. event status transitions)';
+
+-- Success message
+SELECT 'Scheduler watermarks table created successfully!' AS status;
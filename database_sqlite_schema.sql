@@ -0,0 +1,218 @@
+-- Local SQLite Schema (load testing / benchmarking)
+-- Used by the local backend (DATA_BACKEND=sqlite, see utils/sqlite_backend.py)
+-- and created automatically on first connect. Mirrors the Supabase tables the
+-- app uses; UUIDs and timestamps are stored as ISO text, booleans as 0/1 and
+-- JSONB columns as JSON text (declared BOOLEAN / JSON so the backend converts
+-- them on the way in and out).
+
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    full_name TEXT,
+    student_id TEXT,
+    email TEXT UNIQUE,
+    password TEXT,
+    role TEXT,
+    department_name TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS event_requests (
+    id TEXT PRIMARY KEY,
+    department_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    event_name TEXT,
+    description TEXT,
+    location TEXT,
+    date TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    participant_limit INTEGER,
+    requirements JSON,
+    status TEXT DEFAULT 'Pending',
+    rejection_reason TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    event_request_id TEXT REFERENCES event_requests(id) ON DELETE SET NULL,
+    department_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    event_name TEXT,
+    description TEXT,
+    location TEXT,
+    date TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    participant_limit INTEGER,
+    status TEXT DEFAULT 'Active',
+    rush_mode BOOLEAN DEFAULT 0,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS registrations (
+    id TEXT PRIMARY KEY,
+    student_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    event_id TEXT REFERENCES events(id) ON DELETE CASCADE,
+    registration_status TEXT DEFAULT 'Pending',
+    unique_code TEXT,
+    attended BOOLEAN DEFAULT 0,
+    attended_at TEXT,
+    approved_at TEXT,
+    rejected_at TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    UNIQUE(student_id, event_id)
+);
+
+CREATE TABLE IF NOT EXISTS event_requirements (
+    id TEXT PRIMARY KEY,
+    event_id TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    requirement_name TEXT NOT NULL,
+    description TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS registration_requirements (
+    id TEXT PRIMARY KEY,
+    registration_id TEXT NOT NULL REFERENCES registrations(id) ON DELETE CASCADE,
+    requirement_id TEXT NOT NULL REFERENCES event_requirements(id) ON DELETE CASCADE,
+    student_submitted BOOLEAN DEFAULT 0,
+    department_verified BOOLEAN DEFAULT 0,
+    submitted_at TEXT,
+    verified_at TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    UNIQUE(registration_id, requirement_id)
+);
+
+CREATE TABLE IF NOT EXISTS event_feedback (
+    id TEXT PRIMARY KEY,
+    registration_id TEXT NOT NULL UNIQUE REFERENCES registrations(id) ON DELETE CASCADE,
+    event_id TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    student_id TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
+    comment TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS email_verifications (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    otp TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    verified BOOLEAN DEFAULT 0,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS password_resets (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    otp TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    used BOOLEAN DEFAULT 0,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id TEXT PRIMARY KEY,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    html_content TEXT,
+    text_content TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    locked_at TEXT,
+    sent_at TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS scheduler_watermarks (
+    name TEXT PRIMARY KEY,
+    next_run_at TEXT,
+    last_run_at TEXT,
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+-- Indexes matching the Supabase migrations
+CREATE INDEX IF NOT EXISTS idx_events_department_date ON events(department_id, date);
+CREATE INDEX IF NOT EXISTS idx_events_status_date_end_time ON events(status, date, end_time);
+CREATE INDEX IF NOT EXISTS idx_events_location_date ON events(location, date);
+CREATE INDEX IF NOT EXISTS idx_event_requests_department_status ON event_requests(department_id, status);
+CREATE INDEX IF NOT EXISTS idx_event_requests_status_date ON event_requests(status, date);
+CREATE INDEX IF NOT EXISTS idx_registrations_event_status ON registrations(event_id, registration_status);
+CREATE INDEX IF NOT EXISTS idx_registrations_student_status ON registrations(student_id, registration_status);
+CREATE INDEX IF NOT EXISTS idx_registrations_unique_code ON registrations(unique_code);
+CREATE INDEX IF NOT EXISTS idx_event_requirements_event_id ON event_requirements(event_id);
+CREATE INDEX IF NOT EXISTS idx_event_feedback_event_id ON event_feedback(event_id);
+CREATE INDEX IF NOT EXISTS idx_event_feedback_student_id ON event_feedback(student_id);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_status_created ON email_outbox(status, created_at);
+
+-- Grouped status counts (database_add_status_count_views.sql)
+CREATE VIEW IF NOT EXISTS event_registration_counts AS
+SELECT event_id, registration_status, COUNT(*) AS total
+FROM registrations
+GROUP BY event_id, registration_status;
+
+CREATE VIEW IF NOT EXISTS student_registration_counts AS
+SELECT student_id, registration_status, COUNT(*) AS total
+FROM registrations
+GROUP BY student_id, registration_status;
+
+CREATE VIEW IF NOT EXISTS department_request_counts AS
+SELECT department_id, status, COUNT(*) AS total
+FROM event_requests
+GROUP BY department_id, status;
+
+-- OSAS dashboard KPIs (database_add_dashboard_kpis.sql)
+CREATE VIEW IF NOT EXISTS osas_dashboard_kpis AS
+SELECT
+    (SELECT COUNT(*) FROM events) AS total_events,
+    (SELECT COUNT(*) FROM events WHERE status = 'Active') AS active_events,
+    (SELECT COUNT(*) FROM events WHERE status = 'Completed') AS completed_events,
+    (SELECT COUNT(*) FROM events WHERE status = 'Cancelled') AS cancelled_events,
+    (SELECT COUNT(*) FROM event_requests WHERE status = 'Pending') AS pending_requests,
+    (SELECT COUNT(*) FROM event_requests WHERE status = 'Approved') AS approved_requests,
+    (SELECT COUNT(*) FROM event_requests WHERE status = 'Rejected') AS rejected_requests,
+    (SELECT COUNT(*) FROM registrations) AS total_registrations,
+    (SELECT COUNT(*) FROM registrations WHERE registration_status = 'Pending') AS pending_registrations,
+    (SELECT COUNT(*) FROM registrations WHERE registration_status = 'Approved') AS approved_registrations,
+    (SELECT COUNT(*) FROM registrations WHERE registration_status = 'Approved' AND attended = 1) AS total_attended,
+    (SELECT COUNT(DISTINCT student_id) FROM registrations WHERE attended = 1) AS unique_participants,
+    (SELECT COUNT(*) FROM event_feedback) AS total_feedback,
+    (SELECT AVG(rating) FROM event_feedback) AS average_rating;
+
+-- Department KPIs: a trigger-maintained table on Supabase
+-- (database_add_department_kpi_snapshot.sql), computed on read here
+CREATE VIEW IF NOT EXISTS department_kpi_snapshot AS
+SELECT
+    u.id AS department_id,
+    (SELECT COUNT(*) FROM events e WHERE e.department_id = u.id) AS total_events,
+    (SELECT COUNT(*) FROM events e WHERE e.department_id = u.id AND e.status = 'Active') AS active_events,
+    (SELECT COUNT(*) FROM events e WHERE e.department_id = u.id AND e.status = 'Ongoing') AS ongoing_events,
+    (SELECT COUNT(*) FROM events e WHERE e.department_id = u.id AND e.status = 'Completed') AS completed_events,
+    (SELECT COUNT(*) FROM events e WHERE e.department_id = u.id AND e.status = 'Cancelled') AS cancelled_events,
+    (SELECT COUNT(*) FROM event_requests q WHERE q.department_id = u.id AND q.status = 'Pending') AS pending_requests,
+    (SELECT COUNT(*) FROM event_requests q WHERE q.department_id = u.id AND q.status = 'Approved') AS approved_requests,
+    (SELECT COUNT(*) FROM event_requests q WHERE q.department_id = u.id AND q.status = 'Rejected') AS rejected_requests,
+    (SELECT COUNT(*) FROM registrations r JOIN events e ON e.id = r.event_id
+        WHERE e.department_id = u.id) AS total_registrations,
+    (SELECT COUNT(*) FROM registrations r JOIN events e ON e.id = r.event_id
+        WHERE e.department_id = u.id AND r.registration_status = 'Pending') AS pending_registrations,
+    (SELECT COUNT(*) FROM registrations r JOIN events e ON e.id = r.event_id
+        WHERE e.department_id = u.id AND r.registration_status = 'Approved') AS approved_registrations,
+    (SELECT COUNT(*) FROM registrations r JOIN events e ON e.id = r.event_id
+        WHERE e.department_id = u.id AND r.registration_status = 'Approved' AND r.attended = 1) AS total_attended,
+    (SELECT COUNT(DISTINCT r.student_id) FROM registrations r JOIN events e ON e.id = r.event_id
+        WHERE e.department_id = u.id AND r.attended = 1) AS unique_participants,
+    (SELECT COUNT(*) FROM event_feedback f JOIN events e ON e.id = f.event_id
+        WHERE e.department_id = u.id) AS total_feedback,
+    (SELECT COALESCE(SUM(f.rating), 0) FROM event_feedback f JOIN events e ON e.id = f.event_id
+        WHERE e.department_id = u.id) AS rating_sum,
+    strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now') AS updated_at
+FROM users u
+WHERE u.role IN ('department', 'osas');
+
+INSERT OR IGNORE INTO scheduler_watermarks (name, next_run_at) VALUES ('event_status', NULL);
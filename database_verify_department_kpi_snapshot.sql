@@ -0,0 +1,151 @@
+-- Verify department_kpi_snapshot against a full recount
+-- Run this SQL in your Supabase SQL Editor (after database_add_department_kpi_snapshot.sql)
+--
+-- The snapshot is kept up to date by delta triggers, so a missed or doubled
+-- delta would leave a row quietly wrong. department_kpi_snapshot_mismatches()
+-- recounts every department with the same aggregates as
+-- refresh_department_kpi_snapshot and returns each number that differs:
+-- no rows means the snapshot is right. A department with no snapshot row
+-- counts as all zeros, which is what the dashboard shows for it.
+-- Participant rows are checked too, as metric 'participant:<student_id>'.
+
+-- ============================================
+-- PART 1: Mismatch report
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.department_kpi_snapshot_mismatches()
+RETURNS TABLE(department_id UUID, metric TEXT, expected BIGINT, snapshot BIGINT) AS $$
+    WITH departments AS (
+        SELECT id AS department_id FROM public.users WHERE role = 'department'
+        UNION
+        SELECT department_id FROM public.events WHERE department_id IS NOT NULL
+        UNION
+        SELECT department_id FROM public.event_requests WHERE department_id IS NOT NULL
+        UNION
+        SELECT department_id FROM public.department_kpi_snapshot
+    ),
+    recount AS (
+        SELECT d.department_id, ev.*, rq.*, rg.*, fb.*
+        FROM departments d
+        CROSS JOIN LATERAL (
+            SELECT
+                COUNT(*) AS total_events,
+                COUNT(*) FILTER (WHERE status = 'Active') AS active_events,
+                COUNT(*) FILTER (WHERE status = 'Ongoing') AS ongoing_events,
+                COUNT(*) FILTER (WHERE status = 'Completed') AS completed_events,
+                COUNT(*) FILTER (WHERE status = 'Cancelled') AS cancelled_events
+            FROM public.events WHERE department_id = d.department_id
+        ) ev
+        CROSS JOIN LATERAL (
+            SELECT
+                COUNT(*) FILTER (WHERE status = 'Pending') AS pending_requests,
+                COUNT(*) FILTER (WHERE status = 'Approved') AS approved_requests,
+                COUNT(*) FILTER (WHERE status = 'Rejected') AS rejected_requests
+            FROM public.event_requests WHERE department_id = d.department_id
+        ) rq
+        CROSS JOIN LATERAL (
+            SELECT
+                COUNT(*) AS total_registrations,
+                COUNT(*) FILTER (WHERE r.registration_status = 'Pending') AS pending_registrations,
+                COUNT(*) FILTER (WHERE r.registration_status = 'Approved') AS approved_registrations,
+                COUNT(*) FILTER (WHERE r.registration_status = 'Approved' AND r.attended) AS total_attended,
+                COUNT(DISTINCT r.student_id) FILTER (WHERE r.attended) AS unique_participants
+            FROM public.registrations r
+            JOIN public.events e ON e.id = r.event_id
+            WHERE e.department_id = d.department_id
+        ) rg
+        CROSS JOIN LATERAL (
+            SELECT
+                COUNT(*) AS total_feedback,
+                COALESCE(SUM(f.rating), 0) AS rating_sum
+            FROM public.event_feedback f
+            JOIN public.events e ON e.id = f.event_id
+            WHERE e.department_id = d.department_id
+        ) fb
+    ),
+    expected_values AS (
+        SELECT x.department_id, kv.key AS metric, kv.value::BIGINT AS value
+        FROM recount x, jsonb_each_text(to_jsonb(x) - 'department_id') kv
+        UNION ALL
+        SELECT e.department_id, 'participant:' || r.student_id, COUNT(*)
+        FROM public.registrations r
+        JOIN public.events e ON e.id = r.event_id
+        WHERE r.attended AND r.student_id IS NOT NULL AND e.department_id IS NOT NULL
+        GROUP BY e.department_id, r.student_id
+    ),
+    snapshot_values AS (
+        SELECT s.department_id, kv.key AS metric, kv.value::BIGINT AS value
+        FROM public.department_kpi_snapshot s, jsonb_each_text(to_jsonb(s) - 'department_id' - 'updated_at') kv
+        UNION ALL
+        SELECT p.department_id, 'participant:' || p.student_id, p.attended_count
+        FROM public.department_kpi_participants p
+    )
+    SELECT
+        COALESCE(x.department_id, s.department_id),
+        COALESCE(x.metric, s.metric),
+        COALESCE(x.value, 0),
+        COALESCE(s.value, 0)
+    FROM expected_values x
+    FULL JOIN snapshot_values s ON s.department_id = x.department_id AND s.metric = x.metric
+    WHERE COALESCE(x.value, 0) <> COALESCE(s.value, 0)
+    ORDER BY 1, 2;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- ============================================
+-- PART 2: Check the live snapshot
+-- ============================================
+
+SELECT * FROM public.department_kpi_snapshot_mismatches();
+
+-- ============================================
+-- PART 3: Exercise the triggers, then check again (rolled back)
+-- ============================================
+-- Multi-row statements through the same RPCs and updates the app issues:
+-- the case the statement-level triggers and transition tables are for.
+-- Run this block on its own; nothing is kept.
+
+BEGIN;
+
+-- Registrations inserted by the rush-mode RPC, then approved up to the limit
+SELECT r.*
+FROM (SELECT id FROM public.events WHERE status = 'Active' ORDER BY date, id LIMIT 1) ev,
+LATERAL public.reserve_seats(ev.id, ARRAY(
+    SELECT u.id FROM public.users u
+    WHERE u.role = 'student'
+      AND NOT EXISTS (SELECT 1 FROM public.registrations x WHERE x.event_id = ev.id AND x.student_id = u.id)
+    ORDER BY u.id LIMIT 20
+)) r;
+
+SELECT a.*
+FROM (SELECT id FROM public.events WHERE status = 'Active' ORDER BY date, id LIMIT 1) ev,
+LATERAL public.approve_registrations_with_seats(ev.id, ARRAY(
+    SELECT x.id FROM public.registrations x
+    WHERE x.event_id = ev.id AND x.registration_status = 'Pending'
+    ORDER BY x.created_at
+)) a;
+
+-- Attendance flips both ways (unique_participants crossing zero)
+UPDATE public.registrations SET attended = NOT COALESCE(attended, FALSE)
+WHERE id IN (
+    SELECT id FROM public.registrations WHERE registration_status = 'Approved' ORDER BY created_at LIMIT 50
+);
+
+-- Rejections, event status changes and re-ratings
+UPDATE public.registrations SET registration_status = 'Rejected'
+WHERE id IN (SELECT id FROM public.registrations WHERE registration_status = 'Pending' ORDER BY created_at LIMIT 20);
+
+UPDATE public.events SET status = 'Completed'
+WHERE id IN (SELECT id FROM public.events WHERE status = 'Active' ORDER BY date DESC, id LIMIT 5);
+
+UPDATE public.event_feedback SET rating = 6 - rating
+WHERE id IN (SELECT id FROM public.event_feedback ORDER BY id LIMIT 20);
+
+-- An event moved to another department (recounts both rows)
+UPDATE public.events ev SET department_id = other.id
+FROM (SELECT id FROM public.users WHERE role = 'department' ORDER BY id LIMIT 1) other
+WHERE ev.id = (SELECT id FROM public.events WHERE department_id <> other.id ORDER BY id LIMIT 1);
+
+-- Expect no rows
+SELECT * FROM public.department_kpi_snapshot_mismatches();
+
+ROLLBACK;
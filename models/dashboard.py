@@ -0,0 +1,144 @@
+from config import supabase
+
+class Dashboard:
+    @staticmethod
+    def get_osas_kpi_row():
+        """Get the single aggregate row from the osas_dashboard_kpis view"""
+        result = supabase.table("osas_dashboard_kpis").select("*").execute()
+        return result.data[0] if result.data else {}
+
+    @staticmethod
+    def get_osas_stats_and_kpis():
+        """
+        Build the OSAS dashboard stats and KPI dictionaries
+        All counting happens in the database; this only derives the rates.
+        Returns (stats: dict, kpi: dict)
+        """
+        row = Dashboard.get_osas_kpi_row()
+
+        def count(column):
+            return int(row.get(column) or 0)
+
+        active_events = count("active_events")
+        completed_events = count("completed_events")
+        total_registrations = count("total_registrations")
+        approved_registrations = count("approved_registrations")
+        total_attended = count("total_attended")
+        total_feedback = count("total_feedback")
+
+        stats = {
+            "total_events": count("total_events"),
+            "active_events": active_events,
+            "completed_events": completed_events,
+            "pending_requests": count("pending_requests"),
+            "total_registrations": total_registrations,
+            "pending_registrations": count("pending_registrations")
+        }
+
+        # 1. Event Success Rate
+        total_events_for_success = active_events + completed_events
+        event_success_rate = round((completed_events / total_events_for_success * 100) if total_events_for_success > 0 else 0, 1)
+
+        # 2. Attendance Rate
+        attendance_rate = round((total_attended / approved_registrations * 100) if approved_registrations > 0 else 0, 1)
+
+        # 3. Request Approval Time (simplified)
+        processed_requests = count("approved_requests") + count("rejected_requests")
+
+        # 4. Event Feedback Score
+        average_rating = row.get("average_rating")
+        avg_rating = round(float(average_rating), 1) if total_feedback > 0 and average_rating is not None else 0
+
+        # 5. Registration Completion Rate
+        registration_completion_rate = round((approved_registrations / total_registrations * 100) if total_registrations > 0 else 0, 1)
+
+        kpi = {
+            "event_success_rate": event_success_rate,
+            "completed_events": completed_events,
+            "total_events_for_success": total_events_for_success,
+            "attendance_rate": attendance_rate,
+            "total_attended": total_attended,
+            "total_approved": approved_registrations,
+            "avg_approval_time": "< 24h",  # Simplified for now
+            "processed_requests": processed_requests,
+            "unique_participants": count("unique_participants"),
+            "feedback_score": avg_rating,
+            "total_feedback": total_feedback,
+            "registration_completion_rate": registration_completion_rate,
+            "approved_registrations": approved_registrations,
+            "total_registrations": total_registrations
+        }
+
+        return stats, kpi
+
+    @staticmethod
+    def get_department_kpi_row(department_id):
+        """
+        Get a department's row from the trigger-maintained department_kpi_snapshot table
+        The row is created on first use if the department has none yet.
+        """
+        result = supabase.table("department_kpi_snapshot").select("*").eq("department_id", department_id).execute()
+
+        if not result.data:
+            supabase.rpc("refresh_department_kpi_snapshot", {"p_department_id": department_id}).execute()
+            result = supabase.table("department_kpi_snapshot").select("*").eq("department_id", department_id).execute()
+
+        return result.data[0] if result.data else {}
+
+    @staticmethod
+    def get_department_stats_and_kpis(department_id):
+        """
+        Build the department dashboard stats and KPI dictionaries from the snapshot row
+        Returns (stats: dict, kpi: dict)
+        """
+        row = Dashboard.get_department_kpi_row(department_id)
+
+        def count(column):
+            return int(row.get(column) or 0)
+
+        active_events = count("active_events")
+        completed_events = count("completed_events")
+        cancelled_events = count("cancelled_events")
+        total_registrations = count("total_registrations")
+        approved_registrations = count("approved_registrations")
+        total_attended = count("total_attended")
+        total_feedback = count("total_feedback")
+
+        stats = {
+            "total_events": count("total_events"),
+            "active_events": active_events,
+            "completed_events": completed_events,
+            "pending_requests": count("pending_requests"),
+            "total_registrations": total_registrations,
+            "pending_registrations": count("pending_registrations")
+        }
+
+        # 1. Event Success Rate
+        total_events_for_success = active_events + completed_events + cancelled_events
+        event_success_rate = round((completed_events / total_events_for_success * 100) if total_events_for_success > 0 else 0, 1)
+
+        # 2. Attendance Rate
+        attendance_rate = round((total_attended / approved_registrations * 100) if approved_registrations > 0 else 0, 1)
+
+        # 3. Event Feedback Score
+        avg_rating = round(count("rating_sum") / total_feedback, 1) if total_feedback > 0 else 0
+
+        # 4. Registration Approval Rate
+        registration_approval_rate = round((approved_registrations / total_registrations * 100) if total_registrations > 0 else 0, 1)
+
+        kpi = {
+            "event_success_rate": event_success_rate,
+            "completed_events": completed_events,
+            "total_events_for_success": total_events_for_success,
+            "attendance_rate": attendance_rate,
+            "total_attended": total_attended,
+            "total_approved": approved_registrations,
+            "unique_participants": count("unique_participants"),
+            "feedback_score": avg_rating,
+            "total_feedback": total_feedback,
+            "registration_approval_rate": registration_approval_rate,
+            "approved_registrations": approved_registrations,
+            "total_registrations": total_registrations
+        }
+
+        return stats, kpi
@@ -1,14 +1,160 @@
+import time as clock
 from config import supabase
 from datetime import datetime
+from models.records import Event
+from utils.checkin_sessions import checkin_sessions
+from utils.event_status import classify_events, reference_now
+from utils.page_cursor import parse_page_cursor
+from utils.schedule_index import schedule_index
+from utils.status_scheduler import request_status_recheck
+
+# Events per page on the OSAS event management list
+EVENTS_PAGE_SIZE = 25
+
+# The department filter options are rebuilt at most this often
+DEPARTMENT_NAMES_TTL_SECONDS = 300
+_department_names_cache = {"names": None, "loaded_at": 0}
 
 class EventManagement:
     @staticmethod
-    def get_all_events():
-        """Get all events with department information"""
-        events = supabase.table("events").select(
+    def get_all_events(limit=None):
+        """Get all events with department information (optionally only the first `limit`)"""
+        query = supabase.table("events").select(
             "*, users!events_department_id_fkey(full_name, department_name, email, role)"
-        ).order("date", desc=False).execute()
-        return events
+        ).order("date", desc=False)
+        
+        if limit:
+            query = query.limit(limit)
+        
+        return query.execute()
+
+    @staticmethod
+    def get_events_page(status="all", event_type="all", creator="all", department="all", after=None, page_size=EVENTS_PAGE_SIZE):
+        """
+        Get one page of events for OSAS management with the filters applied in the query
+        Pages are ordered by (date, id); `after` is the cursor of the previous page.
+        Returns (events, next_cursor) where next_cursor is None on the last page
+        (and an empty page for an unknown status or a malformed cursor).
+        """
+        status = (status or "all").lower()
+        if status not in ("all", "active", "ongoing", "completed", "cancelled"):
+            return [], None
+        
+        cursor = None
+        if after:
+            cursor = parse_page_cursor(after)
+            if cursor is None:
+                return [], None
+        
+        now = reference_now()
+        today = now.date().isoformat()
+        
+        # An inner join lets the creator filters drop events instead of nulling the join
+        if creator != "all" or department != "all":
+            columns = "*, users!events_department_id_fkey!inner(full_name, department_name, email, role)"
+        else:
+            columns = "*, users!events_department_id_fkey(full_name, department_name, email, role)"
+        
+        events = []
+        
+        while True:
+            query = supabase.table("events").select(columns)
+            
+            # Narrow by stored status and date; today's Active events are settled by display status below
+            if status == "active":
+                query = query.eq("status", "Active").gte("date", today)
+            elif status == "ongoing":
+                query = query.eq("status", "Active").eq("date", today)
+            elif status == "completed":
+                query = query.or_(f"status.eq.Completed,and(status.eq.Active,date.lte.{today})")
+            elif status == "cancelled":
+                query = query.eq("status", "Cancelled")
+            
+            if event_type == "limited":
+                query = query.not_.is_("participant_limit", "null")
+            elif event_type == "free":
+                query = query.is_("participant_limit", "null")
+            
+            if creator == "osas":
+                query = query.eq("users.role", "osas")
+            elif creator == "departments":
+                query = query.eq("users.role", "department")
+            
+            if department != "all":
+                query = query.eq("users.department_name", department)
+            
+            if cursor:
+                cursor_date, cursor_id = cursor
+                query = query.or_(f"date.gt.{cursor_date},and(date.eq.{cursor_date},id.gt.{cursor_id})")
+            
+            rows = Event.from_rows(query.order("date", desc=False).order("id", desc=False).limit(page_size + 1).execute().data)
+            
+            consumed = 0
+            for event, display_status in zip(rows[:page_size], classify_events(rows[:page_size], now)):
+                consumed += 1
+                event["display_status"] = display_status
+                if status == "all" or event["display_status"].lower() == status:
+                    events.append(event)
+                if len(events) == page_size:
+                    break
+            
+            if consumed == 0:
+                return events, None
+            
+            last = rows[consumed - 1]
+            cursor = (last["date"], last["id"])
+            has_more = len(rows) > consumed
+            
+            if len(events) == page_size:
+                return events, f"{last['date']}_{last['id']}" if has_more else None
+            if not has_more:
+                return events, None
+
+    @staticmethod
+    def get_event_display_counts():
+        """
+        Count all events by display status without loading them
+        Only today's Active events need their times checked; everything else is counted in the database.
+        """
+        now = reference_now()
+        today = now.date().isoformat()
+        
+        def status_query(status):
+            return supabase.table("events").select("id", count="exact").eq("status", status)
+        
+        counts = {
+            "Active": status_query("Active").gt("date", today).limit(1).execute().count or 0,
+            "Ongoing": 0,
+            "Completed": (status_query("Completed").limit(1).execute().count or 0)
+                + (status_query("Active").lt("date", today).limit(1).execute().count or 0),
+            "Cancelled": status_query("Cancelled").limit(1).execute().count or 0
+        }
+        
+        todays_events = supabase.table("events").select(
+            "status, date, start_time, end_time"
+        ).eq("status", "Active").eq("date", today).execute()
+        for display_status in classify_events(todays_events.data or [], now):
+            counts[display_status] = counts.get(display_status, 0) + 1
+        
+        return counts
+
+    @staticmethod
+    def get_department_names():
+        """Get the sorted department names of event creators (cached for a few minutes)"""
+        now = clock.monotonic()
+        if _department_names_cache["names"] is not None and now - _department_names_cache["loaded_at"] < DEPARTMENT_NAMES_TTL_SECONDS:
+            return _department_names_cache["names"]
+        
+        try:
+            creators = supabase.table("users").select("department_name").in_("role", ["department", "osas"]).execute()
+            names = sorted({row["department_name"] for row in (creators.data or []) if row.get("department_name")})
+        except Exception as e:
+            print(f"Error loading department names: {e}")
+            return _department_names_cache["names"] or []
+        
+        _department_names_cache["names"] = names
+        _department_names_cache["loaded_at"] = now
+        return names
 
     @staticmethod
     def get_active_events():
@@ -44,9 +190,11 @@ class EventManagement:
                 return False, "Cannot cancel a completed event."
             
             # Update status to Cancelled
-            supabase.table("events").update({
+            cancelled = supabase.table("events").update({
                 "status": "Cancelled"
             }).eq("id", event_id).execute()
+            schedule_index.sync_events(cancelled.data)
+            checkin_sessions.close(event_id)
             
             return True, "Event cancelled successfully."
         except Exception as e:
@@ -57,49 +205,17 @@ class EventManagement:
         """
         Check if there's a schedule conflict for the given location, date, and time
         Returns True if conflict exists, False otherwise
+        Used before moving an event, so the slot is re-read from the database.
         """
         try:
-            # Get all active events for the same date and location
-            query = supabase.table("events").select("*").eq("location", location).eq("date", date).eq("status", "Active")
-            
-            existing_events = query.execute()
-            
-            if not existing_events.data:
-                return False
-            
-            # Convert start_time and end_time to time objects for comparison
-            if isinstance(start_time, str):
-                new_start = datetime.strptime(start_time, "%H:%M:%S").time()
-            else:
-                new_start = start_time
-                
-            if isinstance(end_time, str):
-                new_end = datetime.strptime(end_time, "%H:%M:%S").time()
-            else:
-                new_end = end_time
-            
-            # Check for time overlap with existing events
-            for event in existing_events.data:
-                # Skip if this is the same event being updated
-                if exclude_event_id and event.get("id") == exclude_event_id:
-                    continue
-                
-                # Convert existing event times
-                if isinstance(event["start_time"], str):
-                    existing_start = datetime.strptime(event["start_time"], "%H:%M:%S").time()
-                else:
-                    existing_start = event["start_time"]
-                    
-                if isinstance(event["end_time"], str):
-                    existing_end = datetime.strptime(event["end_time"], "%H:%M:%S").time()
-                else:
-                    existing_end = event["end_time"]
-                
-                # Check for overlap: (StartA < EndB) and (EndA > StartB)
-                if (new_start < existing_end) and (new_end > existing_start):
-                    return True
-            
-            return False
+            # Only Active events block a slot here (pending requests are ignored)
+            conflicts = schedule_index.find_conflicts(
+                location, date, start_time, end_time,
+                exclude_event_id=exclude_event_id,
+                include_requests=False,
+                fresh=True
+            )
+            return len(conflicts) > 0
             
         except Exception as e:
             print(f"Error checking schedule conflict: {e}")
@@ -140,11 +256,15 @@ class EventManagement:
                 return False, "Schedule conflict detected with the new date/time. Please choose a different time."
             
             # Update event with new date/time
-            supabase.table("events").update({
+            postponed = supabase.table("events").update({
                 "date": new_date,
                 "start_time": new_start_time,
                 "end_time": new_end_time
             }).eq("id", event_id).execute()
+            schedule_index.sync_events(postponed.data)
+            
+            # The new end time may be earlier than the status worker's watermark
+            request_status_recheck()
             
             return True, "Event postponed/rescheduled successfully!"
             
@@ -187,53 +307,23 @@ class EventManagement:
         
         counts = {"Active": 0, "Ongoing": 0, "Completed": 0, "Cancelled": 0}
         
-        if department_events.data:
-            for event in department_events.data:
-                display_status = EventManagement.get_event_display_status(event)
-                counts[display_status] = counts.get(display_status, 0) + 1
+        for display_status in classify_events(department_events.data or []):
+            counts[display_status] = counts.get(display_status, 0) + 1
         
         return counts
     
     @staticmethod
-    def get_event_display_status(event):
+    def get_event_display_status(event, now=None):
         """Determine the display status of an event based on its date and time"""
-        status = event.get("status", "Active")
-        event_date_str = event.get("date")
-        start_time_str = event.get("start_time")
-        end_time_str = event.get("end_time")
-        
-        if status == "Active" and event_date_str and start_time_str and end_time_str:
-            now = datetime.now()
-            today = now.date()
-            current_time = now.time()
-            
-            # Parse event date
-            event_date = datetime.strptime(event_date_str, "%Y-%m-%d").date()
-            
-            # Parse event times
-            if isinstance(start_time_str, str):
-                start_time = datetime.strptime(start_time_str, "%H:%M:%S").time()
-            else:
-                start_time = start_time_str
-                
-            if isinstance(end_time_str, str):
-                end_time = datetime.strptime(end_time_str, "%H:%M:%S").time()
-            else:
-                end_time = end_time_str
-            
-            # Check if event is today
-            if event_date == today:
-                # Check if current time is within event time range
-                if start_time <= current_time <= end_time:
-                    return "Ongoing"
-                elif current_time > end_time:
-                    return "Completed"
-                else:
-                    return "Active"  # Event is today but hasn't started yet
-            elif event_date < today:
-                return "Completed"
-        
-        return status
+        return classify_events([event], now)[0]
+    
+    @staticmethod
+    def get_display_statuses(events, now=None):
+        """
+        Determine the display status of many events against one reference time
+        Returns the statuses in the same order as `events`.
+        """
+        return classify_events(events, now)
     
     @staticmethod
     def update_event_status_if_needed(event_id, current_display_status):
@@ -246,9 +336,10 @@ class EventManagement:
                 
                 if event.data and event.data[0]["status"] == "Active":
                     # Update to Completed
-                    supabase.table("events").update({
+                    completed = supabase.table("events").update({
                         "status": "Completed"
                     }).eq("id", event_id).execute()
+                    schedule_index.sync_events(completed.data)
                     return True
             return False
         except Exception as e:
@@ -256,27 +347,66 @@ class EventManagement:
             return False
     
     @staticmethod
-    def auto_update_completed_events():
-        """Automatically update all Active events that should be Completed"""
+    def complete_due_events():
+        """
+        Mark every Active event whose end time has passed as Completed
+        Uses one select and one bulk update. Returns the number of events updated.
+        """
         try:
-            # Get all Active events
-            active_events = supabase.table("events").select("*").eq("status", "Active").execute()
+            now = datetime.now()
+            today = now.date().isoformat()
+            
+            # Only events dated today or earlier can have finished
+            candidates = supabase.table("events").select(
+                "id, status, date, start_time, end_time"
+            ).eq("status", "Active").lte("date", today).execute()
             
-            if not active_events.data:
+            if not candidates.data:
                 return 0
             
-            updated_count = 0
-            for event in active_events.data:
-                display_status = EventManagement.get_event_display_status(event)
-                if display_status == "Completed":
-                    if EventManagement.update_event_status_if_needed(event["id"], display_status):
-                        updated_count += 1
+            statuses = classify_events(candidates.data, now)
+            due_ids = [
+                event["id"] for event, display_status in zip(candidates.data, statuses)
+                if display_status == "Completed"
+            ]
+            
+            if not due_ids:
+                return 0
             
-            return updated_count
+            completed = supabase.table("events").update({
+                "status": "Completed"
+            }).in_("id", due_ids).eq("status", "Active").execute()
+            schedule_index.sync_events(completed.data)
+            
+            return len(due_ids)
         except Exception as e:
-            print(f"Error auto-updating events: {e}")
+            print(f"Error completing due events: {e}")
             return 0
 
+    @staticmethod
+    def get_next_status_transition():
+        """Get the datetime when the next Active event ends, or None if there is none"""
+        try:
+            today = datetime.now().date().isoformat()
+            
+            next_event = supabase.table("events").select("date, end_time").eq(
+                "status", "Active"
+            ).gte("date", today).order("date", desc=False).order("end_time", desc=False).limit(1).execute()
+            
+            if not next_event.data:
+                return None
+            
+            event = next_event.data[0]
+            return datetime.strptime(f"{event['date']} {event['end_time']}", "%Y-%m-%d %H:%M:%S")
+        except Exception as e:
+            print(f"Error finding next status transition: {e}")
+            return None
+
+    @staticmethod
+    def auto_update_completed_events():
+        """Automatically update all Active events that should be Completed"""
+        return EventManagement.complete_due_events()
+
     @staticmethod
     def cancel_department_event(event_id, department_id):
         """Cancel an event (only if it belongs to the department)"""
@@ -302,9 +432,11 @@ class EventManagement:
                 return False, "Cannot cancel a completed event."
             
             # Update status to Cancelled
-            supabase.table("events").update({
+            cancelled = supabase.table("events").update({
                 "status": "Cancelled"
             }).eq("id", event_id).execute()
+            schedule_index.sync_events(cancelled.data)
+            checkin_sessions.close(event_id)
             
             return True, "Event cancelled successfully."
         except Exception as e:
@@ -349,11 +481,15 @@ class EventManagement:
                 return False, "Schedule conflict detected with the new date/time. Please choose a different time."
             
             # Update event with new date/time
-            supabase.table("events").update({
+            postponed = supabase.table("events").update({
                 "date": new_date,
                 "start_time": new_start_time,
                 "end_time": new_end_time
             }).eq("id", event_id).execute()
+            schedule_index.sync_events(postponed.data)
+            
+            # The new end time may be earlier than the status worker's watermark
+            request_status_recheck()
             
             return True, "Event postponed/rescheduled successfully!"
             
@@ -1,8 +1,15 @@
 from config import supabase
-import uuid
-import qrcode
-from io import BytesIO
-import base64
+from models.records import Registration
+from utils.checkin_sessions import checkin_sessions
+from utils.schedule_index import schedule_index
+
+# Registrations returned per page by the registration list API
+REGISTRATIONS_PAGE_SIZE = 50
+
+REGISTRATION_LIST_COLUMNS = "id, registration_status, created_at, approved_at, rejected_at"
+
+# Events per request when reading the grouped registration counts
+COUNTS_CHUNK_SIZE = 200
 
 class EventRegistrations:
     @staticmethod
@@ -27,59 +34,193 @@ class EventRegistrations:
         ).eq("event_id", event_id).order("created_at", desc=True).execute()
         return registrations
 
+    @staticmethod
+    def get_registrations_page(event_id, status="all", search=None, after=None, limit=REGISTRATIONS_PAGE_SIZE):
+        """
+        Get one page of an event's registrations, newest first, with student details
+        Status and search (student name or ID) are applied in the query; pages are
+        ordered by (created_at, id) and `after` is the previous page's cursor as
+        (created_at, id), see utils.page_cursor.parse_page_cursor.
+        Returns (registrations, next_cursor) where next_cursor is None on the last page.
+        """
+        # Searching filters on the student, so the join must drop non-matching rows
+        search = "".join(c for c in (search or "") if c not in ',()*"\\').strip()
+        student_join = "users!registrations_student_id_fkey!inner" if search else "users!registrations_student_id_fkey"
+        
+        query = supabase.table("registrations").select(
+            f"{REGISTRATION_LIST_COLUMNS}, {student_join}(full_name, student_id, email)"
+        ).eq("event_id", event_id)
+        
+        if status and status != "all":
+            query = query.eq("registration_status", status.capitalize())
+        
+        if search:
+            query = query.or_(f"full_name.ilike.*{search}*,student_id.ilike.*{search}*", reference_table="users")
+        
+        if after:
+            cursor_created_at, cursor_id = after
+            query = query.or_(
+                f'created_at.lt."{cursor_created_at}",and(created_at.eq."{cursor_created_at}",id.lt.{cursor_id})'
+            )
+        
+        rows = Registration.from_rows(query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1).execute().data)
+        
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, f"{last['created_at']}_{last['id']}"
+
     @staticmethod
     def get_registration_counts_by_event(event_id):
         """Get count of registrations by status for an event"""
-        registrations = supabase.table("registrations").select("registration_status").eq("event_id", event_id).execute()
+        return EventRegistrations.get_registration_counts_for_events([event_id])[event_id]
+
+    @staticmethod
+    def get_registration_counts_for_events(event_ids):
+        """
+        Count registrations by status for many events using the grouped view
+        Returns a dictionary mapping event_id to {"Pending", "Approved", "Rejected"} counts
+        """
+        counts = {event_id: {"Pending": 0, "Approved": 0, "Rejected": 0} for event_id in event_ids}
+        event_ids = list(counts)
         
-        counts = {"Pending": 0, "Approved": 0, "Rejected": 0}
-        if registrations.data:
-            for reg in registrations.data:
-                status = reg.get("registration_status", "Pending")
-                counts[status] = counts.get(status, 0) + 1
+        # At most three rows per event; chunk so the id list and row cap stay small
+        for start in range(0, len(event_ids), COUNTS_CHUNK_SIZE):
+            rows = supabase.table("event_registration_counts").select(
+                "event_id, registration_status, total"
+            ).in_("event_id", event_ids[start:start + COUNTS_CHUNK_SIZE]).execute()
+            
+            for row in rows.data or []:
+                event_counts = counts[row["event_id"]]
+                event_counts[row["registration_status"]] = event_counts.get(row["registration_status"], 0) + row["total"]
         
         return counts
 
     @staticmethod
-    def approve_registration(registration_id):
-        """Approve a registration and generate QR code"""
+    def approve_registration(registration_id, event_id):
+        """
+        Approve a registration and assign its ticket code (the QR image is rendered on first view)
+        Uses the approve_registrations_with_seats database function so approval
+        never goes past the event's participant limit.
+        Returns (success: bool, message: str)
+        """
+        try:
+            results = EventRegistrations.approve_with_seats(event_id, [registration_id])
+            outcome = results[0]["outcome"] if results else "not_found"
+            
+            if outcome == "approved":
+                return True, "Registration approved successfully! QR code has been generated."
+            if outcome == "full":
+                return False, "Cannot approve: the event has no seats remaining."
+            if outcome == "not_pending":
+                return False, "Registration has already been processed."
+            return False, "Registration not found."
+        except Exception as e:
+            print(f"Error approving registration: {e}")
+            return False, f"Error approving registration: {str(e)}"
+
+    @staticmethod
+    def approve_with_seats(event_id, registration_ids):
+        """
+        Approve pending registrations in order while seats remain (one locked database call)
+        Returns a list of {"registration_id", "outcome", "unique_code", "remaining_seats"}
+        with outcome 'approved', 'full', 'not_pending' or 'not_found'
+        """
+        result = supabase.rpc("approve_registrations_with_seats", {
+            "p_event_id": event_id,
+            "p_registration_ids": list(registration_ids)
+        }).execute()
+        return result.data or []
+
+    @staticmethod
+    def bulk_decide_registrations(event_id, action, registration_ids=None, first_n=None):
+        """
+        Approve or reject many registrations of one event at once
+        Targets either the given registration_ids or the first_n pending
+        registrations by created_at. Approvals go through one seat-locked
+        database call; rejections are one update guarded on the row still being Pending.
+        Returns (success: bool, message: str, outcomes: list of dicts)
+        """
         try:
-            # Generate unique code
-            unique_code = str(uuid.uuid4())
+            if action not in ("approve", "reject"):
+                return False, "Action must be 'approve' or 'reject'.", []
+            
+            # Load the targeted registrations (one query)
+            query = supabase.table("registrations").select("*").eq("event_id", event_id)
+            if registration_ids:
+                query = query.in_("id", list(registration_ids))
+            else:
+                query = query.eq("registration_status", "Pending").order("created_at", desc=False).limit(first_n)
+            rows = query.execute().data or []
             
-            # Generate QR code image
-            qr = qrcode.QRCode(version=1, box_size=10, border=5)
-            qr.add_data(unique_code)
-            qr.make(fit=True)
+            by_id = {row["id"]: row for row in rows}
+            ordered_ids = list(registration_ids) if registration_ids else [row["id"] for row in rows]
             
-            # Create QR code image
-            img = qr.make_image(fill_color="black", back_color="white")
+            outcomes = []
+            to_approve = []
+            to_reject = []
+            for registration_id in ordered_ids:
+                row = by_id.get(registration_id)
+                
+                if not row:
+                    outcomes.append({"registration_id": registration_id, "status": "skipped", "reason": "Registration not found for this event"})
+                    continue
+                
+                if row["registration_status"] != "Pending":
+                    outcomes.append({"registration_id": registration_id, "status": "skipped", "reason": f"Already {row['registration_status'].lower()}"})
+                    continue
+                
+                if action == "approve":
+                    to_approve.append(registration_id)
+                else:
+                    to_reject.append(registration_id)
             
-            # Convert image to base64 string (for storage or display)
-            buffered = BytesIO()
-            img.save(buffered, format="PNG")
-            qr_code_base64 = base64.b64encode(buffered.getvalue()).decode()
+            # Approvals: one locked database call checks seats and assigns codes for the batch
+            if to_approve:
+                reasons = {"full": "No seats remaining", "not_pending": "Already processed", "not_found": "Registration not found for this event"}
+                for result in EventRegistrations.approve_with_seats(event_id, to_approve):
+                    if result["outcome"] == "approved":
+                        outcomes.append({"registration_id": result["registration_id"], "status": "approved"})
+                    else:
+                        outcomes.append({"registration_id": result["registration_id"], "status": "skipped", "reason": reasons.get(result["outcome"], result["outcome"])})
             
-            # Update registration with approved status, unique code, and approval timestamp
-            result = supabase.table("registrations").update({
-                "registration_status": "Approved",
-                "unique_code": unique_code,
-                "approved_at": "now()"
-            }).eq("id", registration_id).execute()
+            # Rejections: one update that only touches rows still Pending, so a
+            # registration approved or cancelled since the read above is left alone
+            if to_reject:
+                rejected = supabase.table("registrations").update({
+                    "registration_status": "Rejected",
+                    "unique_code": None,
+                    "rejected_at": "now()"
+                }).in_("id", to_reject).eq("event_id", event_id).eq("registration_status", "Pending").execute()
+                
+                rejected_ids = {row["id"] for row in rejected.data or []}
+                checkin_sessions.evict(rejected_ids)
+                for registration_id in to_reject:
+                    if registration_id in rejected_ids:
+                        outcomes.append({"registration_id": registration_id, "status": "rejected"})
+                    else:
+                        outcomes.append({"registration_id": registration_id, "status": "skipped", "reason": "Already processed"})
+            
+            done = sum(1 for outcome in outcomes if outcome["status"] != "skipped")
+            verb = "approved" if action == "approve" else "rejected"
+            return True, f"{done} registration(s) {verb}, {len(outcomes) - done} skipped.", outcomes
             
-            return result
         except Exception as e:
-            print(f"Error approving registration: {e}")
-            return None
+            print(f"Error in bulk registration update: {e}")
+            return False, f"Error updating registrations: {str(e)}", []
 
     @staticmethod
     def reject_registration(registration_id):
         """Reject a registration"""
-        return supabase.table("registrations").update({
+        result = supabase.table("registrations").update({
             "registration_status": "Rejected",
             "unique_code": None,
             "rejected_at": "now()"
         }).eq("id", registration_id).execute()
+        checkin_sessions.evict([registration_id])
+        return result
 
     @staticmethod
     def get_registration_by_id(registration_id):
@@ -126,6 +267,8 @@ class EventRegistrations:
             result = supabase.table("events").update({
                 "status": "Cancelled"
             }).eq("id", event_id).execute()
+            schedule_index.sync_events(result.data)
+            checkin_sessions.close(event_id)
             
             return True, "Event cancelled successfully."
         except Exception as e:
@@ -1,14 +1,19 @@
 from config import supabase
-from datetime import datetime, time
+from utils.schedule_index import schedule_index, conflicts_for_requests, EVENT_COLUMNS, REQUEST_COLUMNS
+from utils.status_scheduler import request_status_recheck
 
 class EventRequestManagement:
     @staticmethod
-    def get_all_pending_requests():
-        """Get all pending event requests with department information"""
-        requests = supabase.table("event_requests").select(
+    def get_all_pending_requests(limit=None):
+        """Get all pending event requests with department information (optionally only the newest `limit`)"""
+        query = supabase.table("event_requests").select(
             "*, users!event_requests_department_id_fkey(full_name, department_name, email)"
-        ).eq("status", "Pending").order("created_at", desc=True).execute()
-        return requests
+        ).eq("status", "Pending").order("created_at", desc=True)
+        
+        if limit:
+            query = query.limit(limit)
+        
+        return query.execute()
 
     @staticmethod
     def get_all_requests():
@@ -34,103 +39,22 @@ class EventRequestManagement:
         ).eq("id", request_id).execute()
 
     @staticmethod
-    def check_schedule_conflict(location, date, start_time, end_time, exclude_request_id=None):
+    def check_schedule_conflict(location, date, start_time, end_time, exclude_request_id=None, fresh=False):
         """
         Check if there's a schedule conflict for the given location, date, and time
         Checks against:
         1. Active/Ongoing approved events
         2. Other pending requests
+        fresh=True re-checks the slot against the database (use before booking it)
         Returns (has_conflict: bool, conflict_details: dict)
         """
         try:
-            # Convert start_time and end_time to time objects for comparison
-            if isinstance(start_time, str):
-                # Try both formats: HH:MM:SS and HH:MM
-                try:
-                    new_start = datetime.strptime(start_time, "%H:%M:%S").time()
-                except ValueError:
-                    new_start = datetime.strptime(start_time, "%H:%M").time()
-            else:
-                new_start = start_time
-                
-            if isinstance(end_time, str):
-                # Try both formats: HH:MM:SS and HH:MM
-                try:
-                    new_end = datetime.strptime(end_time, "%H:%M:%S").time()
-                except ValueError:
-                    new_end = datetime.strptime(end_time, "%H:%M").time()
-            else:
-                new_end = end_time
-            
-            conflicts = []
-            
-            # Check 1: Check against approved events (Active/Ongoing only, exclude Completed/Cancelled)
-            approved_events = supabase.table("events").select("*").eq("location", location).eq("date", date).in_("status", ["Active"]).execute()
-            
-            if approved_events.data:
-                for event in approved_events.data:
-                    # Skip if this is the same request being updated
-                    if exclude_request_id and event.get("event_request_id") == exclude_request_id:
-                        continue
-                    
-                    # Convert existing event times
-                    if isinstance(event["start_time"], str):
-                        try:
-                            existing_start = datetime.strptime(event["start_time"], "%H:%M:%S").time()
-                        except ValueError:
-                            existing_start = datetime.strptime(event["start_time"], "%H:%M").time()
-                    else:
-                        existing_start = event["start_time"]
-                        
-                    if isinstance(event["end_time"], str):
-                        try:
-                            existing_end = datetime.strptime(event["end_time"], "%H:%M:%S").time()
-                        except ValueError:
-                            existing_end = datetime.strptime(event["end_time"], "%H:%M").time()
-                    else:
-                        existing_end = event["end_time"]
-                    
-                    # Check for overlap: (StartA < EndB) and (EndA > StartB)
-                    if (new_start < existing_end) and (new_end > existing_start):
-                        conflicts.append({
-                            "type": "approved_event",
-                            "name": event["event_name"],
-                            "time": f"{existing_start.strftime('%I:%M %p')} - {existing_end.strftime('%I:%M %p')}"
-                        })
-            
-            # Check 2: Check against other pending requests
-            pending_requests = supabase.table("event_requests").select("*").eq("location", location).eq("date", date).eq("status", "Pending").execute()
-            
-            if pending_requests.data:
-                for req in pending_requests.data:
-                    # Skip the current request
-                    if exclude_request_id and req["id"] == exclude_request_id:
-                        continue
-                    
-                    # Convert request times
-                    if isinstance(req["start_time"], str):
-                        try:
-                            req_start = datetime.strptime(req["start_time"], "%H:%M:%S").time()
-                        except ValueError:
-                            req_start = datetime.strptime(req["start_time"], "%H:%M").time()
-                    else:
-                        req_start = req["start_time"]
-                        
-                    if isinstance(req["end_time"], str):
-                        try:
-                            req_end = datetime.strptime(req["end_time"], "%H:%M:%S").time()
-                        except ValueError:
-                            req_end = datetime.strptime(req["end_time"], "%H:%M").time()
-                    else:
-                        req_end = req["end_time"]
-                    
-                    # Check for overlap
-                    if (new_start < req_end) and (new_end > req_start):
-                        conflicts.append({
-                            "type": "pending_request",
-                            "name": req["event_name"],
-                            "time": f"{req_start.strftime('%I:%M %p')} - {req_end.strftime('%I:%M %p')}"
-                        })
+            # Approved events come first, then other pending requests
+            conflicts = schedule_index.find_conflicts(
+                location, date, start_time, end_time,
+                exclude_request_id=exclude_request_id,
+                fresh=fresh
+            )
             
             has_conflict = len(conflicts) > 0
             return has_conflict, conflicts
@@ -164,7 +88,8 @@ class EventRequestManagement:
                 date=request_data["date"],
                 start_time=request_data["start_time"],
                 end_time=request_data["end_time"],
-                exclude_request_id=request_id
+                exclude_request_id=request_id,
+                fresh=True
             )
             
             if has_conflict:
@@ -175,39 +100,24 @@ class EventRequestManagement:
                 
                 return False, conflict_msg
             
-            # No conflict - approve and create event
-            # Update request status
-            supabase.table("event_requests").update({
-                "status": "Approved"
-            }).eq("id", request_id).execute()
+            # No conflict - approve the request, create the event and copy its
+            # requirements in one transaction (database_add_approve_event_request.sql)
+            result = supabase.rpc("approve_event_request", {"p_request_id": request_id}).execute()
             
-            # Create event
-            event_response = supabase.table("events").insert({
-                "event_request_id": request_id,
-                "event_name": request_data["event_name"],
-                "description": request_data["description"],
-                "location": request_data["location"],
-                "date": request_data["date"],
-                "start_time": request_data["start_time"],
-                "end_time": request_data["end_time"],
-                "participant_limit": request_data["participant_limit"],
-                "department_id": request_data["department_id"],
-                "status": "Active"
-            }).execute()
+            if not result.data:
+                return False, "Request not found"
             
-            # Copy requirements from event_requests to event_requirements
-            if event_response.data and request_data.get("requirements"):
-                event_id = event_response.data[0]["id"]
-                requirements = request_data["requirements"]
-                
-                # If requirements is a list, add each one
-                if isinstance(requirements, list):
-                    for req_name in requirements:
-                        supabase.table("event_requirements").insert({
-                            "event_id": event_id,
-                            "requirement_name": req_name,
-                            "description": None
-                        }).execute()
+            outcome = result.data[0]
+            if outcome["outcome"] == "not_found":
+                return False, "Request not found"
+            if outcome["outcome"] == "not_pending":
+                return False, f"Request already {outcome['request_status'].lower()}"
+            
+            schedule_index.sync_requests([outcome["request"]])
+            schedule_index.sync_events([outcome["event"]])
+            
+            # Let the status worker know about the new event's end time
+            request_status_recheck()
             
             return True, "Event request approved successfully!"
             
@@ -235,9 +145,10 @@ class EventRequestManagement:
                 return False, f"Request already {request_data['status'].lower()}"
             
             # Update request status to rejected
-            supabase.table("event_requests").update({
+            rejected = supabase.table("event_requests").update({
                 "status": "Rejected"
             }).eq("id", request_id).execute()
+            schedule_index.sync_requests(rejected.data)
             
             return True, "Event request rejected."
             
@@ -262,21 +173,23 @@ class EventRequestManagement:
     def get_conflicts_for_requests(requests):
         """
         Check conflicts for a list of requests
+        Loads the Active events and Pending requests for the dates involved in
+        two queries and sweeps each (location, date) group once.
         Returns a dictionary mapping request_id to conflict info
         """
-        conflicts_map = {}
+        pending = [req for req in requests if req["status"] == "Pending"]
         
-        for req in requests:
-            if req["status"] == "Pending":
-                has_conflict, conflicts = EventRequestManagement.check_schedule_conflict(
-                    location=req["location"],
-                    date=req["date"],
-                    start_time=req["start_time"],
-                    end_time=req["end_time"],
-                    exclude_request_id=req["id"]
-                )
-                
-                if has_conflict:
-                    conflicts_map[req["id"]] = conflicts
+        if not pending:
+            return {}
         
-        return conflicts_map
\ No newline at end of file
+        try:
+            dates = sorted({str(req["date"]) for req in pending})
+            
+            events = supabase.table("events").select(EVENT_COLUMNS).eq("status", "Active").in_("date", dates).execute()
+            pending_requests = supabase.table("event_requests").select(REQUEST_COLUMNS).eq("status", "Pending").in_("date", dates).execute()
+            
+            return conflicts_for_requests(pending, events.data or [], pending_requests.data or [])
+            
+        except Exception as e:
+            print(f"Error checking schedule conflicts: {e}")
+            return {}
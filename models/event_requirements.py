@@ -1,4 +1,15 @@
 from config import supabase
+from models.records import Requirement
+
+# Registrations read per request when building the requirement matrix
+MATRIX_PAGE_SIZE = 1000
+
+# Registration ids per request when loading only the ones a bulk verify touches
+# (keeps the in.(...) filter well inside URL length limits)
+MATRIX_ID_CHUNK = 200
+
+# Tracking rows embedded under each registration for the matrix
+MATRIX_CELL_COLUMNS = "requirement_id, student_submitted, department_verified, submitted_at, verified_at"
 
 class EventRequirements:
     @staticmethod
@@ -15,6 +26,32 @@ class EventRequirements:
             print(f"Error adding requirement: {e}")
             return None
 
+    @staticmethod
+    def add_requirements_to_event(event_id, requirements):
+        """
+        Add many requirements to an event with a single insert
+        requirements: list of {"name": ..., "description": ...} dicts
+        """
+        rows = [
+            {
+                "event_id": event_id,
+                "requirement_name": req.get("name"),
+                "description": req.get("description")
+            }
+            for req in requirements or []
+            if req.get("name")
+        ]
+        
+        if not rows:
+            return None
+        
+        try:
+            result = supabase.table("event_requirements").insert(rows).execute()
+            return result
+        except Exception as e:
+            print(f"Error adding requirements: {e}")
+            return None
+
     @staticmethod
     def get_event_requirements(event_id):
         """Get all requirements for an event"""
@@ -25,6 +62,28 @@ class EventRequirements:
             print(f"Error fetching requirements: {e}")
             return None
 
+    @staticmethod
+    def get_requirements_for_events(event_ids):
+        """
+        Get requirements for many events in a single query
+        Returns a dictionary mapping event_id to its list of requirements
+        """
+        requirements_map = {event_id: [] for event_id in event_ids}
+        
+        if not event_ids:
+            return requirements_map
+        
+        try:
+            result = supabase.table("event_requirements").select("*").in_("event_id", list(event_ids)).order("created_at", desc=False).execute()
+            
+            for req in Requirement.from_rows(result.data):
+                requirements_map.setdefault(req.event_id, []).append(req)
+            
+            return requirements_map
+        except Exception as e:
+            print(f"Error fetching requirements: {e}")
+            return requirements_map
+
     @staticmethod
     def delete_requirement(requirement_id):
         """Delete a requirement"""
@@ -47,29 +106,39 @@ class EventRequirements:
             print(f"Error fetching requirement status: {e}")
             return None
 
+    @staticmethod
+    def _upsert_tracking(registration_id, requirement_ids, values):
+        """
+        Write `values` onto the tracking rows of one registration in a single statement
+        Relies on the (registration_id, requirement_id) unique key
+        (database_dedupe_registration_requirements.sql): missing rows are created,
+        existing ones updated, and concurrent clicks cannot create duplicates.
+        """
+        rows = [
+            {"registration_id": registration_id, "requirement_id": requirement_id, **values}
+            for requirement_id in dict.fromkeys(requirement_ids)
+        ]
+        
+        if not rows:
+            return None
+        
+        return supabase.table("registration_requirements").upsert(
+            rows, on_conflict="registration_id,requirement_id"
+        ).execute()
+
     @staticmethod
     def mark_requirement_submitted(registration_id, requirement_id):
         """Student marks a requirement as submitted"""
+        return EventRequirements.mark_requirements_submitted(registration_id, [requirement_id])
+
+    @staticmethod
+    def mark_requirements_submitted(registration_id, requirement_ids):
+        """Student marks many requirements of one registration as submitted"""
         try:
-            # Check if already exists
-            existing = supabase.table("registration_requirements").select("*").eq("registration_id", registration_id).eq("requirement_id", requirement_id).execute()
-            
-            if existing.data:
-                # Update existing
-                result = supabase.table("registration_requirements").update({
-                    "student_submitted": True,
-                    "submitted_at": "now()"
-                }).eq("registration_id", registration_id).eq("requirement_id", requirement_id).execute()
-            else:
-                # Create new
-                result = supabase.table("registration_requirements").insert({
-                    "registration_id": registration_id,
-                    "requirement_id": requirement_id,
-                    "student_submitted": True,
-                    "department_verified": False
-                }).execute()
-            
-            return result
+            return EventRequirements._upsert_tracking(registration_id, requirement_ids, {
+                "student_submitted": True,
+                "submitted_at": "now()"
+            })
         except Exception as e:
             print(f"Error marking requirement submitted: {e}")
             return None
@@ -77,28 +146,16 @@ class EventRequirements:
     @staticmethod
     def verify_requirement(registration_id, requirement_id, verified=True):
         """Department verifies a submitted requirement"""
+        return EventRequirements.verify_requirements(registration_id, [requirement_id], verified)
+
+    @staticmethod
+    def verify_requirements(registration_id, requirement_ids, verified=True):
+        """Department verifies (or unverifies) many requirements of one registration"""
         try:
-            # Check if record exists
-            existing = supabase.table("registration_requirements").select("*").eq(
-                "registration_id", registration_id
-            ).eq("requirement_id", requirement_id).execute()
-            
-            if existing.data:
-                # Update existing record
-                result = supabase.table("registration_requirements").update({
-                    "department_verified": verified,
-                    "verified_at": "now()" if verified else None
-                }).eq("registration_id", registration_id).eq("requirement_id", requirement_id).execute()
-            else:
-                # Create new record (in case it wasn't initialized)
-                result = supabase.table("registration_requirements").insert({
-                    "registration_id": registration_id,
-                    "requirement_id": requirement_id,
-                    "student_submitted": False,
-                    "department_verified": verified
-                }).execute()
-            
-            return result
+            return EventRequirements._upsert_tracking(registration_id, requirement_ids, {
+                "department_verified": verified,
+                "verified_at": "now()" if verified else None
+            })
         except Exception as e:
             print(f"Error verifying requirement: {e}")
             return None
@@ -107,30 +164,168 @@ class EventRequirements:
     def check_all_requirements_verified(registration_id):
         """Check if all requirements for a registration are verified"""
         try:
-            # Get the event_id from registration
-            registration = supabase.table("registrations").select("event_id").eq("id", registration_id).execute()
+            # The event's requirements and this registration's tracking rows in one request
+            registration = supabase.table("registrations").select(
+                "event_id, "
+                "events!registrations_event_id_fkey(event_requirements!event_requirements_event_id_fkey(id)), "
+                "registration_requirements!registration_requirements_registration_id_fkey(requirement_id, department_verified)"
+            ).eq("id", registration_id).execute()
+            
             if not registration.data:
                 return False
             
-            event_id = registration.data[0]["event_id"]
+            row = registration.data[0]
+            event = row.get("events") or {}
+            requirement_ids = [req["id"] for req in event.get("event_requirements") or []]
             
-            # Get all requirements for the event
-            event_reqs = supabase.table("event_requirements").select("id").eq("event_id", event_id).execute()
-            if not event_reqs.data:
-                return True  # No requirements means all verified
+            return EventRequirements._all_verified(requirement_ids, row.get("registration_requirements"))
             
-            total_requirements = len(event_reqs.data)
+        except Exception as e:
+            print(f"Error checking requirements: {e}")
+            return False
+
+    @staticmethod
+    def _all_verified(requirement_ids, tracking_rows):
+        """True when every requirement has a department-verified tracking row (no requirements counts as verified)"""
+        verified = {row["requirement_id"] for row in tracking_rows or [] if row.get("department_verified")}
+        return all(requirement_id in verified for requirement_id in requirement_ids)
+
+    @staticmethod
+    def _get_registrations_with_tracking(event_id, columns, statuses=None, registration_ids=None):
+        """
+        Registrations of an event (all, or only registration_ids) with their
+        tracking rows embedded, MATRIX_PAGE_SIZE per request
+        """
+        rows = []
+        start = 0
+        
+        while True:
+            query = supabase.table("registrations").select(
+                f"{columns}, registration_requirements!registration_requirements_registration_id_fkey({MATRIX_CELL_COLUMNS})"
+            ).eq("event_id", event_id)
             
-            # Get verified requirements for this registration
-            verified_reqs = supabase.table("registration_requirements").select("id").eq("registration_id", registration_id).eq("department_verified", True).execute()
+            if statuses:
+                query = query.in_("registration_status", list(statuses))
+            if registration_ids is not None:
+                query = query.in_("id", list(registration_ids))
             
-            verified_count = len(verified_reqs.data) if verified_reqs.data else 0
+            page = query.order("created_at", desc=False).order("id", desc=False).range(
+                start, start + MATRIX_PAGE_SIZE - 1
+            ).execute().data or []
+            rows.extend(page)
             
-            return verified_count >= total_requirements
+            if len(page) < MATRIX_PAGE_SIZE:
+                return rows
+            start += MATRIX_PAGE_SIZE
+
+    @staticmethod
+    def get_requirement_matrix(event_id, statuses=("Pending", "Approved")):
+        """
+        Students x requirements for an event, for verifying requirements in bulk
+        Two requests (requirements, then registrations with their tracking rows
+        embedded) regardless of the number of students or requirements.
+        Returns (requirements, students) where each student has a `cells` dict
+        keyed by requirement id and an `all_verified` flag.
+        """
+        requirements_response = EventRequirements.get_event_requirements(event_id)
+        requirements = requirements_response.data if requirements_response and requirements_response.data else []
+        requirement_ids = [req["id"] for req in requirements]
+        
+        registrations = EventRequirements._get_registrations_with_tracking(
+            event_id,
+            "id, registration_status, created_at, users!registrations_student_id_fkey(full_name, student_id, email)",
+            statuses
+        )
+        
+        students = []
+        for registration in registrations:
+            tracking = {row["requirement_id"]: row for row in registration.get("registration_requirements") or []}
+            student = registration.get("users") or {}
             
-        except Exception as e:
-            print(f"Error checking requirements: {e}")
-            return False
+            cells = {}
+            for requirement_id in requirement_ids:
+                row = tracking.get(requirement_id, {})
+                cells[requirement_id] = {
+                    "submitted": bool(row.get("student_submitted")),
+                    "verified": bool(row.get("department_verified")),
+                    "submitted_at": row.get("submitted_at"),
+                    "verified_at": row.get("verified_at")
+                }
+            
+            students.append({
+                "registration_id": registration["id"],
+                "registration_status": registration["registration_status"],
+                "full_name": student.get("full_name"),
+                "student_id": student.get("student_id"),
+                "email": student.get("email"),
+                "cells": cells,
+                "all_verified": all(cell["verified"] for cell in cells.values())
+            })
+        
+        return requirements, students
+
+    @staticmethod
+    def set_requirement_verifications(event_id, cells):
+        """
+        Verify/unverify many (registration, requirement) cells of one event in a single write
+        cells: list of {"registration_id", "requirement_id", "verified"} dicts; cells that
+        do not belong to the event are skipped.
+        Returns (updated_count, all_verified) where all_verified maps each touched
+        registration id to whether all of its requirements are now verified.
+        """
+        requirements_response = EventRequirements.get_event_requirements(event_id)
+        requirement_ids = {req["id"] for req in (requirements_response.data if requirements_response else None) or []}
+        
+        # Only the registrations named in cells (and belonging to the event) are read
+        named_ids = list(dict.fromkeys(cell.get("registration_id") for cell in cells if cell.get("registration_id")))
+        registrations = []
+        for start in range(0, len(named_ids), MATRIX_ID_CHUNK):
+            registrations.extend(EventRequirements._get_registrations_with_tracking(
+                event_id, "id", registration_ids=named_ids[start:start + MATRIX_ID_CHUNK]
+            ))
+        
+        tracking = {
+            registration["id"]: {
+                row["requirement_id"]: bool(row.get("department_verified"))
+                for row in registration.get("registration_requirements") or []
+            }
+            for registration in registrations
+        }
+        
+        # Last value wins if a cell is sent twice
+        changes = {}
+        for cell in cells:
+            registration_id = cell.get("registration_id")
+            requirement_id = cell.get("requirement_id")
+            if registration_id in tracking and requirement_id in requirement_ids:
+                changes[(registration_id, requirement_id)] = bool(cell.get("verified"))
+        
+        if not changes:
+            return 0, {}
+        
+        rows = [
+            {
+                "registration_id": registration_id,
+                "requirement_id": requirement_id,
+                "department_verified": verified,
+                "verified_at": "now()" if verified else None
+            }
+            for (registration_id, requirement_id), verified in changes.items()
+        ]
+        supabase.table("registration_requirements").upsert(
+            rows, on_conflict="registration_id,requirement_id"
+        ).execute()
+        
+        # Apply the write to what was read instead of reading it back
+        for (registration_id, requirement_id), verified in changes.items():
+            tracking[registration_id][requirement_id] = verified
+        
+        all_verified = {
+            registration_id: all(tracking[registration_id].get(requirement_id) for requirement_id in requirement_ids)
+            for registration_id in {registration_id for registration_id, _ in changes}
+        }
+        
+        return len(changes), all_verified
 
     @staticmethod
     def initialize_requirements_for_registration(registration_id, event_id):
@@ -142,24 +337,51 @@ class EventRequirements:
             if not requirements or not requirements.data:
                 return True  # No requirements to initialize
             
-            # Get existing requirement records for this registration
-            existing = supabase.table("registration_requirements").select("requirement_id").eq(
-                "registration_id", registration_id
+            # One upsert for every requirement; rows that already exist are left alone
+            rows = [
+                {
+                    "registration_id": registration_id,
+                    "requirement_id": req["id"],
+                    "student_submitted": False,
+                    "department_verified": False
+                }
+                for req in requirements.data
+            ]
+            supabase.table("registration_requirements").upsert(
+                rows, on_conflict="registration_id,requirement_id", ignore_duplicates=True
             ).execute()
             
-            existing_req_ids = set()
-            if existing.data:
-                existing_req_ids = {item["requirement_id"] for item in existing.data}
-            
-            # Create entries for each requirement that doesn't exist yet
-            for req in requirements.data:
-                if req["id"] not in existing_req_ids:
-                    supabase.table("registration_requirements").insert({
-                        "registration_id": registration_id,
-                        "requirement_id": req["id"],
-                        "student_submitted": False,
-                        "department_verified": False
-                    }).execute()
+            return True
+        except Exception as e:
+            print(f"Error initializing requirements: {e}")
+            return False
+
+    @staticmethod
+    def initialize_requirements_for_new_registrations(registration_ids, event_id):
+        """
+        Initialize requirement tracking for many freshly created registrations of one event
+        New registrations have no tracking rows yet, so this is one select and one insert.
+        """
+        try:
+            if not registration_ids:
+                return True
+            
+            requirements = EventRequirements.get_event_requirements(event_id)
+            
+            if not requirements or not requirements.data:
+                return True  # No requirements to initialize
+            
+            rows = [
+                {
+                    "registration_id": registration_id,
+                    "requirement_id": req["id"],
+                    "student_submitted": False,
+                    "department_verified": False
+                }
+                for registration_id in registration_ids
+                for req in requirements.data
+            ]
+            supabase.table("registration_requirements").insert(rows).execute()
             
             return True
         except Exception as e:
@@ -0,0 +1,273 @@
+from dataclasses import dataclass, field, fields, replace
+from datetime import date, datetime
+from functools import lru_cache
+from utils.schedule_index import parse_time
+
+
+class Record:
+    """
+    Mapping-style access for the slotted records below
+    Code and templates written against PostgREST dicts keep working:
+    record["x"], record.get("x"), "x" in record and record["x"] = value.
+    Keys that are not columns of the record (display_status, has_registered,
+    ...) are kept in a small per-record `extras` dict. `loaded` is the set of
+    columns the row actually had, so a column the query did not select is
+    missing (KeyError, not in, left out of to_dict) just like in the dict.
+    """
+
+    __slots__ = ()
+    _columns = {}
+
+    def __getitem__(self, key):
+        if key in self._columns and (self.loaded is None or key in self.loaded):
+            return getattr(self, key)
+        if self.extras and key in self.extras:
+            return self.extras[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._columns:
+            setattr(self, key, value)
+            if self.loaded is not None and key not in self.loaded:
+                self.loaded = self.loaded | {key}
+        else:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[key] = value
+
+    def __contains__(self, key):
+        if key in self._columns:
+            return self.loaded is None or key in self.loaded
+        return bool(self.extras and key in self.extras)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self):
+        """Shallow copy (extras are copied so the two can be changed independently)"""
+        return replace(self, extras=dict(self.extras) if self.extras else None)
+
+    def to_dict(self):
+        """The row as a plain dict (for JSON and tojson)"""
+        data = {
+            name: _plain(getattr(self, name))
+            for name in self._columns if self.loaded is None or name in self.loaded
+        }
+        if self.extras:
+            data.update({key: _plain(value) for key, value in self.extras.items()})
+        return data
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from a PostgREST row (None and records pass through)"""
+        if row is None or isinstance(row, Record):
+            return row
+        return cls._build(row)
+
+    @classmethod
+    def _build(cls, row):
+        values = {}
+        extras = None
+        for key, value in row.items():
+            if key in cls._columns:
+                values[key] = value
+            else:
+                if extras is None:
+                    extras = {}
+                extras[key] = value
+
+        return cls(**values, extras=extras, loaded=_loaded_keys(tuple(values)))
+
+    @classmethod
+    def from_rows(cls, rows):
+        return [cls.from_row(row) for row in rows or []]
+
+
+@lru_cache(maxsize=256)
+def _loaded_keys(columns):
+    # Rows from the same query share one set
+    return frozenset(columns)
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _record(frozen=False):
+    """Turn a class into a slotted dataclass record with its column set"""
+    def wrap(cls):
+        cls = dataclass(slots=True, frozen=frozen)(cls)
+        # Ordered like the fields, with O(1) membership checks
+        cls._columns = dict.fromkeys(f.name for f in fields(cls) if f.init and f.name not in ("extras", "loaded"))
+        return cls
+    return wrap
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _parse_optional_time(value):
+    return parse_time(value) if value else None
+
+
+# ---------- people ----------
+
+@_record(frozen=True)
+class Organizer(Record):
+    """The user who created an event or request (one shared object per user)"""
+
+    full_name: str = None
+    department_name: str = None
+    email: str = None
+    role: str = None
+    extras: dict = field(default=None, repr=False, compare=False)
+    loaded: frozenset = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_row(cls, row):
+        if row is None or isinstance(row, Record):
+            return row
+
+        try:
+            key = tuple(sorted(row.items()))
+            # Every event of a department points at the same Organizer
+            return _interned_organizer(key)
+        except TypeError:
+            return cls._build(row)
+
+
+# Recently seen organizers; the least recently used fall out past this many
+ORGANIZER_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=ORGANIZER_CACHE_SIZE)
+def _interned_organizer(key):
+    return Organizer._build(dict(key))
+
+
+@_record()
+class Student(Record):
+    """The student on a registration"""
+
+    full_name: str = None
+    student_id: str = None
+    email: str = None
+    extras: dict = field(default=None, repr=False, compare=False)
+    loaded: frozenset = field(default=None, repr=False, compare=False)
+
+
+# ---------- events ----------
+
+@_record()
+class Event(Record):
+    """An events row; date and times are parsed once when the record is built"""
+
+    id: str = None
+    event_request_id: str = None
+    department_id: str = None
+    event_name: str = None
+    description: str = None
+    location: str = None
+    date: str = None
+    start_time: str = None
+    end_time: str = None
+    participant_limit: int = None
+    status: str = None
+    rush_mode: bool = None
+    created_at: str = None
+    updated_at: str = None
+    users: Organizer = None
+    extras: dict = field(default=None, repr=False, compare=False)
+    loaded: frozenset = field(default=None, repr=False, compare=False)
+    event_date: object = field(init=False, default=None, repr=False, compare=False)
+    start: object = field(init=False, default=None, repr=False, compare=False)
+    end: object = field(init=False, default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.users = Organizer.from_row(self.users)
+        self.event_date = _parse_date(self.date)
+        self.start = _parse_optional_time(self.start_time)
+        self.end = _parse_optional_time(self.end_time)
+
+
+@_record()
+class EventRequest(Record):
+    """An event_requests row; date and times are parsed once when the record is built"""
+
+    id: str = None
+    department_id: str = None
+    event_name: str = None
+    description: str = None
+    location: str = None
+    date: str = None
+    start_time: str = None
+    end_time: str = None
+    participant_limit: int = None
+    status: str = None
+    requirements: list = None
+    created_at: str = None
+    updated_at: str = None
+    users: Organizer = None
+    extras: dict = field(default=None, repr=False, compare=False)
+    loaded: frozenset = field(default=None, repr=False, compare=False)
+    event_date: object = field(init=False, default=None, repr=False, compare=False)
+    start: object = field(init=False, default=None, repr=False, compare=False)
+    end: object = field(init=False, default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.users = Organizer.from_row(self.users)
+        self.event_date = _parse_date(self.date)
+        self.start = _parse_optional_time(self.start_time)
+        self.end = _parse_optional_time(self.end_time)
+
+
+# ---------- registrations ----------
+
+@_record()
+class Registration(Record):
+    """A registrations row with its (optional) student and event"""
+
+    id: str = None
+    event_id: str = None
+    student_id: str = None
+    registration_status: str = None
+    unique_code: str = None
+    attended: bool = None
+    attended_at: str = None
+    created_at: str = None
+    approved_at: str = None
+    rejected_at: str = None
+    users: Student = None
+    events: Event = None
+    extras: dict = field(default=None, repr=False, compare=False)
+    loaded: frozenset = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.users = Student.from_row(self.users)
+        self.events = Event.from_row(self.events)
+
+
+@_record()
+class Requirement(Record):
+    """An event_requirements row"""
+
+    id: str = None
+    event_id: str = None
+    requirement_name: str = None
+    description: str = None
+    created_at: str = None
+    updated_at: str = None
+    extras: dict = field(default=None, repr=False, compare=False)
+    loaded: frozenset = field(default=None, repr=False, compare=False)
@@ -1,4 +1,5 @@
 from config import supabase
+from utils.schedule_index import schedule_index
 
 class RequestStatus:
     @staticmethod
@@ -18,7 +19,9 @@ class RequestStatus:
         request = supabase.table("event_requests").select("*").eq("id", request_id).eq("department_id", department_id).execute()
         
         if request.data and request.data[0]["status"] == "Pending":
-            return supabase.table("event_requests").delete().eq("id", request_id).execute()
+            result = supabase.table("event_requests").delete().eq("id", request_id).execute()
+            schedule_index.remove_request(request_id)
+            return result
         return None
 
     @staticmethod
@@ -29,13 +32,11 @@ class RequestStatus:
     @staticmethod
     def count_requests_by_status(department_id):
         """Get count of requests grouped by status"""
-        all_requests = supabase.table("event_requests").select("status").eq("department_id", department_id).execute()
+        grouped = supabase.table("department_request_counts").select("status, total").eq("department_id", department_id).execute()
         
         counts = {"Pending": 0, "Approved": 0, "Rejected": 0, "Cancelled": 0}
-        if all_requests.data:
-            for req in all_requests.data:
-                status = req.get("status", "Pending")
-                counts[status] = counts.get(status, 0) + 1
+        for row in grouped.data or []:
+            counts[row["status"]] = counts.get(row["status"], 0) + row["total"]
         
         return counts
 
@@ -46,7 +47,7 @@ class RequestStatus:
         request = supabase.table("event_requests").select("*").eq("id", request_id).eq("department_id", department_id).execute()
         
         if request.data and request.data[0]["status"] == "Pending":
-            return supabase.table("event_requests").update({
+            result = supabase.table("event_requests").update({
                 "event_name": event_name,
                 "description": description,
                 "location": location,
@@ -55,6 +56,8 @@ class RequestStatus:
                 "end_time": end_time,
                 "participant_limit": participant_limit
             }).eq("id", request_id).execute()
+            schedule_index.sync_requests(result.data)
+            return result
         return None
 
     @staticmethod
@@ -64,7 +67,9 @@ class RequestStatus:
         request = supabase.table("event_requests").select("*").eq("id", request_id).eq("department_id", department_id).execute()
         
         if request.data and request.data[0]["status"] == "Pending":
-            return supabase.table("event_requests").update({
+            result = supabase.table("event_requests").update({
                 "status": "Cancelled"
             }).eq("id", request_id).execute()
+            schedule_index.sync_requests(result.data)
+            return result
         return None
\ No newline at end of file
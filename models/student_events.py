@@ -55,6 +55,32 @@ class StudentEvents:
             print(f"Error calculating available seats: {e}")
             return 0
 
+    @staticmethod
+    def get_approved_counts(event_ids):
+        """
+        Count approved registrations for many events in a single query
+        Returns a dictionary mapping event_id to approved count
+        """
+        counts = {event_id: 0 for event_id in event_ids}
+        
+        if not event_ids:
+            return counts
+        
+        try:
+            # One grouped row per event instead of one row per registration
+            grouped = supabase.table("event_registration_counts").select("event_id, total").in_(
+                "event_id", list(event_ids)
+            ).eq("registration_status", "Approved").execute()
+            
+            for row in grouped.data or []:
+                counts[row["event_id"]] = row["total"]
+            
+            return counts
+            
+        except Exception as e:
+            print(f"Error counting approved registrations: {e}")
+            return counts
+
     @staticmethod
     def is_free_for_all(event_id):
         """Check if event is free-for-all (no participant limit)"""
@@ -1,4 +1,5 @@
 from config import supabase
+from utils.checkin_sessions import checkin_sessions
 import uuid
 
 class StudentRegistrations:
@@ -23,6 +24,34 @@ class StudentRegistrations:
             print(f"Error creating registration: {e}")
             return None
 
+    @staticmethod
+    def reserve_seat(student_id, event_id):
+        """
+        Atomically check the event and register the student (reserve_seat database function)
+        The event row is locked while seats are counted, so concurrent requests cannot oversell.
+        Returns a dict: {"outcome", "registration_id", "registration_status", "remaining_seats"}
+        outcome is 'registered', 'duplicate', 'full', 'closed', 'not_found' or 'error';
+        remaining_seats is None for free-for-all events.
+        """
+        try:
+            result = supabase.rpc("reserve_seat", {
+                "p_event_id": event_id,
+                "p_student_id": student_id
+            }).execute()
+            
+            row = result.data[0] if result.data else {}
+            
+            return {
+                "outcome": row.get("outcome", "error"),
+                "registration_id": row.get("new_registration_id"),
+                "registration_status": row.get("new_status"),
+                "remaining_seats": row.get("remaining_seats")
+            }
+            
+        except Exception as e:
+            print(f"Error reserving seat: {e}")
+            return {"outcome": "error", "registration_id": None, "registration_status": None, "remaining_seats": None}
+
     @staticmethod
     def get_student_registrations(student_id, status_filter=None):
         """
@@ -47,6 +76,30 @@ class StudentRegistrations:
             print(f"Error fetching student registrations: {e}")
             return None
 
+    @staticmethod
+    def get_event_history_registrations(student_id, today):
+        """
+        Fetch a student's registrations whose events can be completed by `today`
+        Events that are cancelled or still in the future are filtered out in the
+        query (inner join), and each row carries its feedback (event_feedback),
+        so the history page is a single request however long the history is.
+        Today's events still need their display status checked by the caller.
+        """
+        try:
+            result = supabase.table("registrations").select(
+                "*, events!registrations_event_id_fkey!inner(*, users!events_department_id_fkey(full_name, department_name, role)), "
+                "event_feedback!event_feedback_registration_id_fkey(*)"
+            ).eq("student_id", student_id).in_(
+                "events.status", ["Active", "Completed"]
+            ).or_(
+                f"date.lte.{today},status.eq.Completed", reference_table="events"
+            ).execute()
+            return result
+            
+        except Exception as e:
+            print(f"Error fetching event history: {e}")
+            return None
+
     @staticmethod
     def has_registered(student_id, event_id):
         """Check if student already registered for event"""
@@ -59,6 +112,18 @@ class StudentRegistrations:
             print(f"Error checking registration: {e}")
             return False
 
+    @staticmethod
+    def get_registered_event_ids(student_id):
+        """Get the set of event IDs a student has registered for (single query)"""
+        try:
+            result = supabase.table("registrations").select("event_id").eq("student_id", student_id).execute()
+            
+            return {reg["event_id"] for reg in result.data} if result.data else set()
+            
+        except Exception as e:
+            print(f"Error fetching registered events: {e}")
+            return set()
+
     @staticmethod
     def cancel_registration(registration_id, student_id):
         """Cancel a pending registration (delete from database)"""
@@ -81,12 +146,27 @@ class StudentRegistrations:
             
             # Delete the registration
             supabase.table("registrations").delete().eq("id", registration_id).execute()
+            checkin_sessions.evict([registration_id])
             return True
             
         except Exception as e:
             print(f"Error cancelling registration: {e}")
             return False
 
+    @staticmethod
+    def get_ticket_code(registration_id, student_id):
+        """Get the unique code and status of a student's registration (for the ticket image)"""
+        try:
+            result = supabase.table("registrations").select(
+                "id, registration_status, unique_code"
+            ).eq("id", registration_id).eq("student_id", student_id).execute()
+            
+            return result.data[0] if result.data else None
+            
+        except Exception as e:
+            print(f"Error fetching ticket code: {e}")
+            return None
+
     @staticmethod
     def get_registration_with_qr(registration_id, student_id):
         """Get registration details including QR code"""
@@ -105,14 +185,14 @@ class StudentRegistrations:
     def get_registration_counts(student_id):
         """Get count of registrations by status for a student"""
         try:
-            result = supabase.table("registrations").select("registration_status").eq("student_id", student_id).execute()
+            result = supabase.table("student_registration_counts").select(
+                "registration_status, total"
+            ).eq("student_id", student_id).execute()
             
             counts = {"Pending": 0, "Approved": 0, "Rejected": 0}
             
-            if result.data:
-                for reg in result.data:
-                    status = reg.get("registration_status", "Pending")
-                    counts[status] = counts.get(status, 0) + 1
+            for row in result.data or []:
+                counts[row["registration_status"]] = counts.get(row["registration_status"], 0) + row["total"]
             
             return counts
             
@@ -1,4 +1,8 @@
 from config import supabase
+from utils.identity import invalidate_user
+
+# Columns current_user() caches per process (never the password)
+IDENTITY_COLUMNS = "id, full_name, student_id, email, role, department_name, created_at"
 
 class User:
     @staticmethod
@@ -14,3 +18,15 @@ class User:
     @staticmethod
     def get_user_by_email(email):
         return supabase.table("users").select("*").eq("email", email).execute()
+
+    @staticmethod
+    def get_identity_by_email(email):
+        """The user's row without the password, for utils.identity.current_user"""
+        return supabase.table("users").select(IDENTITY_COLUMNS).eq("email", email).execute()
+
+    @staticmethod
+    def update_user(email, updates):
+        """Update a user's row and drop their cached identity (role, department, etc.)"""
+        result = supabase.table("users").update(updates).eq("email", email).execute()
+        invalidate_user(email)
+        return result
@@ -7,5 +7,7 @@ event_registrations_bp.route("/department/event-registrations", methods=["GET"])
 event_registrations_bp.route("/department/event-registration-details", methods=["GET"])(event_registrations_controller.view_event_registration_details)
 event_registrations_bp.route("/department/approve-registration", methods=["GET"])(event_registrations_controller.approve_registration)
 event_registrations_bp.route("/department/reject-registration", methods=["GET"])(event_registrations_controller.reject_registration)
+event_registrations_bp.route("/department/registrations", methods=["GET"])(event_registrations_controller.list_event_registrations)
+event_registrations_bp.route("/department/registrations/bulk", methods=["POST"])(event_registrations_controller.bulk_decide_registrations)
 event_registrations_bp.route("/department/cancel-event", methods=["GET"])(event_registrations_controller.cancel_department_event)
 event_registrations_bp.route("/department/postpone-event", methods=["GET", "POST"])(event_registrations_controller.postpone_department_event)
\ No newline at end of file
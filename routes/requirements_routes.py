@@ -9,3 +9,5 @@ requirements_bp.route("/add", methods=["POST"])(requirements_controller.add_requ
 requirements_bp.route("/delete", methods=["DELETE"])(requirements_controller.delete_requirement)
 requirements_bp.route("/verify", methods=["GET"])(requirements_controller.view_registration_requirements)
 requirements_bp.route("/toggle", methods=["POST"])(requirements_controller.toggle_requirement_verification)
+requirements_bp.route("/matrix", methods=["GET"])(requirements_controller.get_requirement_matrix)
+requirements_bp.route("/matrix/verify", methods=["POST"])(requirements_controller.bulk_verify_requirements)
@@ -11,12 +11,15 @@ def redirect_to_events():
 # Events routes
 student_bp.route("/events", methods=["GET"])(student_events_controller.view_events)
 student_bp.route("/events/register/<event_id>", methods=["POST"])(student_events_controller.register_for_event)
+student_bp.route("/events/queue/<ticket_id>", methods=["GET"])(student_events_controller.view_registration_queue)
+student_bp.route("/events/queue/<ticket_id>/status", methods=["GET"])(student_events_controller.registration_queue_status)
 student_bp.route("/event-history", methods=["GET"])(student_events_controller.view_event_history)
 
 # Registrations routes
 student_bp.route("/registrations", methods=["GET"])(student_registrations_controller.view_registrations)
 student_bp.route("/registrations/cancel/<registration_id>", methods=["POST"])(student_registrations_controller.cancel_registration)
 student_bp.route("/ticket/<registration_id>", methods=["GET"])(student_registrations_controller.view_ticket)
+student_bp.route("/ticket/<registration_id>/qr.png", methods=["GET"])(student_registrations_controller.view_ticket_qr)
 
 # Requirements routes
 student_bp.route("/requirements/view", methods=["GET"])(requirements_controller.view_my_requirements)
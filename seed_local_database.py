@@ -0,0 +1,263 @@
+"""
+Seed Local Database Script
+Fills the local SQLite database (DATA_BACKEND=sqlite) with campus-sized data
+for load testing: departments, students, event requests, events, registrations,
+requirements, attendance and feedback.
+
+Usage:
+    python seed_local_database.py --path cesms_local.db --departments 50 --students 20000 --events 3000
+
+Every seeded account logs in with the password given by --password.
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from utils.sqlite_backend import SCHEMA_PATH
+
+LOCATIONS = [
+    "Main Auditorium", "Gymnasium", "Covered Court", "Library Hall", "AVR 1", "AVR 2",
+    "Engineering Lobby", "Science Lab Complex", "Open Field", "Chapel", "Conference Room A",
+    "Conference Room B", "Student Center", "Function Hall", "Computer Lab 3",
+]
+
+EVENT_KINDS = [
+    "Seminar", "Workshop", "Summit", "Orientation", "Tournament", "Fair", "Forum",
+    "Hackathon", "Outreach", "Assembly", "Training", "Exhibit", "Concert", "Quiz Bee",
+]
+
+TOPICS = [
+    "Leadership", "Mental Health", "Career", "Research", "Innovation", "Sports", "Culture",
+    "Sustainability", "Entrepreneurship", "Cybersecurity", "Arts", "Community", "Wellness",
+]
+
+REQUIREMENTS = [
+    "Parent Consent Form", "Medical Certificate", "Registration Fee Receipt", "School ID Photocopy",
+    "Waiver Form", "Proof of Enrollment", "Signed Code of Conduct",
+]
+
+# Two-hour slots per location and day, so seeded events never overlap
+TIME_SLOTS = [("08:00:00", "10:00:00"), ("10:00:00", "12:00:00"), ("13:00:00", "15:00:00"), ("15:00:00", "17:00:00")]
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+def _timestamp(day, rng):
+    moment = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(86400))
+    return moment.isoformat()
+
+
+def seed(path, departments, students, events, password, seed_value):
+    rng = random.Random(seed_value)
+    today = date.today()
+
+    conn = sqlite3.connect(path)
+    with open(SCHEMA_PATH, encoding="utf-8") as schema:
+        conn.executescript(schema.read())
+
+    print("🌱 Seeding local database...")
+    print("=" * 50)
+
+    # Users: one OSAS account, the departments and the students
+    osas = (_id(), "Office of Student Affairs", None, "osas@cesms.local", password, "osas", "OSAS", _timestamp(today - timedelta(days=400), rng))
+    department_rows = [
+        (_id(), f"Department {n + 1}", None, f"dept{n + 1}@cesms.local", password, "department", f"Department {n + 1}", _timestamp(today - timedelta(days=400), rng))
+        for n in range(departments)
+    ]
+    student_rows = [
+        (_id(), f"Student {n + 1}", f"{2021 + n % 5}-{n + 1:05d}", f"student{n + 1}@cesms.local", password, "student", None, _timestamp(today - timedelta(days=rng.randrange(30, 400)), rng))
+        for n in range(students)
+    ]
+    conn.executemany(
+        "INSERT INTO users (id, full_name, student_id, email, password, role, department_name, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [osas] + department_rows + student_rows
+    )
+    student_ids = [row[0] for row in student_rows]
+    organizers = [row[0] for row in department_rows] + [osas[0]]
+
+    # Events spread over the last year and the next two months
+    used_slots = set()
+    request_rows, event_rows = [], []
+    requirement_rows = []
+    requirements_by_event = {}
+
+    while len(event_rows) < events:
+        day = today + timedelta(days=rng.randrange(-365, 60))
+        location = rng.choice(LOCATIONS)
+        slot = rng.randrange(len(TIME_SLOTS))
+        if (location, day, slot) in used_slots:
+            continue
+        used_slots.add((location, day, slot))
+
+        start_time, end_time = TIME_SLOTS[slot]
+        organizer = rng.choice(organizers)
+        limited = rng.random() < 0.4
+        participant_limit = rng.choice([30, 50, 80, 120, 200]) if limited else None
+        name = f"{rng.choice(TOPICS)} {rng.choice(EVENT_KINDS)} {day.year}"
+        description = f"{name} at {location}."
+        requirements = rng.sample(REQUIREMENTS, rng.randint(1, 4)) if limited else []
+        created_at = _timestamp(day - timedelta(days=rng.randrange(7, 45)), rng)
+
+        if day < today:
+            status = "Cancelled" if rng.random() < 0.05 else "Completed"
+        else:
+            status = "Cancelled" if rng.random() < 0.03 else "Active"
+
+        # Department events go through an approved request; OSAS creates events directly
+        request_id = None
+        if organizer != osas[0]:
+            request_id = _id()
+            request_rows.append((
+                request_id, organizer, name, description, location, day.isoformat(), start_time, end_time,
+                participant_limit, json.dumps(requirements), "Approved", None, created_at, created_at
+            ))
+
+        event_id = _id()
+        event_rows.append((
+            event_id, request_id, organizer, name, description, location, day.isoformat(), start_time, end_time,
+            participant_limit, status, 0, created_at, created_at
+        ))
+
+        requirements_by_event[event_id] = []
+        for requirement in requirements:
+            requirement_id = _id()
+            requirements_by_event[event_id].append(requirement_id)
+            requirement_rows.append((requirement_id, event_id, requirement, None, created_at, created_at))
+
+    # A backlog of pending and rejected requests for the OSAS queue
+    for _ in range(max(1, events // 10)):
+        day = today + timedelta(days=rng.randrange(1, 90))
+        start_time, end_time = rng.choice(TIME_SLOTS)
+        name = f"{rng.choice(TOPICS)} {rng.choice(EVENT_KINDS)} {day.year}"
+        status = "Pending" if rng.random() < 0.7 else "Rejected"
+        created_at = _timestamp(today - timedelta(days=rng.randrange(0, 20)), rng)
+        request_rows.append((
+            _id(), rng.choice(organizers[:-1] or organizers), name, f"{name} (requested).", rng.choice(LOCATIONS),
+            day.isoformat(), start_time, end_time, rng.choice([None, 50, 100]), "[]", status,
+            "Schedule conflict" if status == "Rejected" else None, created_at, created_at
+        ))
+
+    conn.executemany(
+        "INSERT INTO event_requests (id, department_id, event_name, description, location, date, start_time, end_time, "
+        "participant_limit, requirements, status, rejection_reason, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        request_rows
+    )
+    conn.executemany(
+        "INSERT INTO events (id, event_request_id, department_id, event_name, description, location, date, start_time, end_time, "
+        "participant_limit, status, rush_mode, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        event_rows
+    )
+    conn.executemany(
+        "INSERT INTO event_requirements (id, event_id, requirement_name, description, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        requirement_rows
+    )
+
+    # Registrations, requirement tracking, attendance and feedback
+    registration_rows, tracking_rows, feedback_rows = [], [], []
+
+    for event in event_rows:
+        event_id, organizer, day, participant_limit, status = event[0], event[2], date.fromisoformat(event[6]), event[9], event[10]
+        if status == "Cancelled":
+            continue
+
+        size = participant_limit or rng.choice([40, 80, 150, 300])
+        wanted = min(len(student_ids), int(size * rng.uniform(0.5, 1.4)))
+        approved = 0
+
+        for student_id in rng.sample(student_ids, wanted):
+            registration_id = _id()
+            created_at = _timestamp(day - timedelta(days=rng.randrange(1, 30)), rng)
+
+            # Free-for-all events auto-approve; limited ones hold seats for approved registrations only
+            if participant_limit is None:
+                registration_status = "Approved"
+            elif approved < participant_limit and rng.random() < 0.75:
+                registration_status = "Approved"
+            else:
+                registration_status = rng.choice(["Pending", "Rejected"])
+
+            approved_at = rejected_at = unique_code = None
+            if registration_status == "Approved":
+                approved += 1
+                approved_at = created_at
+                unique_code = _id()
+            elif registration_status == "Rejected":
+                rejected_at = created_at
+
+            attended = registration_status == "Approved" and day < today and rng.random() < 0.8
+            attended_at = _timestamp(day, rng) if attended else None
+
+            registration_rows.append((
+                registration_id, student_id, event_id, registration_status, unique_code,
+                int(attended), attended_at, approved_at, rejected_at, created_at
+            ))
+
+            if registration_status != "Rejected":
+                for requirement_id in requirements_by_event[event_id]:
+                    submitted = registration_status == "Approved" or rng.random() < 0.5
+                    verified = registration_status == "Approved"
+                    tracking_rows.append((
+                        _id(), registration_id, requirement_id, int(submitted), int(verified),
+                        created_at if submitted else None, created_at if verified else None, created_at, created_at
+                    ))
+
+            if attended and rng.random() < 0.4:
+                feedback_rows.append((
+                    _id(), registration_id, event_id, student_id, rng.choices([1, 2, 3, 4, 5], [1, 2, 5, 10, 12])[0],
+                    rng.choice([None, "Great event!", "Well organized.", "Could be shorter.", "Learned a lot."]),
+                    attended_at, attended_at
+                ))
+
+    conn.executemany(
+        "INSERT INTO registrations (id, student_id, event_id, registration_status, unique_code, attended, attended_at, "
+        "approved_at, rejected_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        registration_rows
+    )
+    conn.executemany(
+        "INSERT INTO registration_requirements (id, registration_id, requirement_id, student_submitted, department_verified, "
+        "submitted_at, verified_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        tracking_rows
+    )
+    conn.executemany(
+        "INSERT INTO event_feedback (id, registration_id, event_id, student_id, rating, comment, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        feedback_rows
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    print(f"   Users: {1 + len(department_rows) + len(student_rows)}")
+    print(f"   Event Requests: {len(request_rows)}")
+    print(f"   Events: {len(event_rows)}")
+    print(f"   Requirements: {len(requirement_rows)}")
+    print(f"   Registrations: {len(registration_rows)}")
+    print(f"   Requirement tracking: {len(tracking_rows)}")
+    print(f"   Feedback: {len(feedback_rows)}")
+    print("=" * 50)
+    print(f"✅ Local database ready at {path}")
+    print(f"   Log in as osas@cesms.local, dept1@cesms.local or student1@cesms.local (password: {password})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the local SQLite database with campus-sized data")
+    parser.add_argument("--path", default=os.getenv("SQLITE_PATH", "cesms_local.db"))
+    parser.add_argument("--departments", type=int, default=50)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--reset", action="store_true", help="Delete the database file first")
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(args.path):
+        os.remove(args.path)
+
+    seed(args.path, args.departments, args.students, args.events, args.password, args.seed)
@@ -0,0 +1,34 @@
+"""
+Tests run against the local SQLite backend (utils/sqlite_backend.py)
+config.py builds the client on import, so the environment is set here, before
+any test module imports config or a model.
+"""
+
+import os
+import tempfile
+
+os.environ["DATA_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "cesms_test.db")
+os.environ["QUERY_STATS"] = "0"
+
+import pytest
+
+from config import supabase
+
+
+@pytest.fixture
+def empty_database():
+    """Delete every row so a test starts from a known state"""
+    conn = supabase.connection()
+    tables = [
+        name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+    ]
+
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        for table in tables:
+            conn.execute(f'DELETE FROM "{table}"')
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+
+    return supabase
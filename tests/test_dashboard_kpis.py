@@ -0,0 +1,87 @@
+"""
+OSAS dashboard KPIs against the local SQLite schema (database_sqlite_schema.sql)
+A handful of hand-made rows, so every count and rate below can be checked by hand.
+"""
+
+import pytest
+
+from models.dashboard import Dashboard
+
+
+@pytest.fixture(autouse=True)
+def seeded(empty_database):
+    supabase = empty_database
+
+    supabase.table("users").insert([
+        {"id": "dept", "full_name": "Department 1", "email": "dept@test.local", "role": "department"},
+        {"id": "s1", "full_name": "Student 1", "email": "s1@test.local", "role": "student"},
+        {"id": "s2", "full_name": "Student 2", "email": "s2@test.local", "role": "student"},
+        {"id": "s3", "full_name": "Student 3", "email": "s3@test.local", "role": "student"},
+    ]).execute()
+
+    # 2 pending, 1 approved, 1 rejected request
+    supabase.table("event_requests").insert([
+        {"id": "q1", "department_id": "dept", "event_name": "Q1", "status": "Pending"},
+        {"id": "q2", "department_id": "dept", "event_name": "Q2", "status": "Pending"},
+        {"id": "q3", "department_id": "dept", "event_name": "Q3", "status": "Approved"},
+        {"id": "q4", "department_id": "dept", "event_name": "Q4", "status": "Rejected"},
+    ]).execute()
+
+    # 1 active, 2 completed, 1 cancelled event
+    supabase.table("events").insert([
+        {"id": "e1", "department_id": "dept", "event_name": "E1", "date": "2026-12-01", "status": "Active"},
+        {"id": "e2", "department_id": "dept", "event_name": "E2", "date": "2026-01-10", "status": "Completed"},
+        {"id": "e3", "department_id": "dept", "event_name": "E3", "date": "2026-02-10", "status": "Completed"},
+        {"id": "e4", "department_id": "dept", "event_name": "E4", "date": "2026-03-10", "status": "Cancelled"},
+    ]).execute()
+
+    # 6 registrations: 4 approved (3 attended, by s1 and s2), 1 pending, 1 rejected
+    supabase.table("registrations").insert([
+        {"id": "r1", "student_id": "s1", "event_id": "e2", "registration_status": "Approved", "attended": True},
+        {"id": "r2", "student_id": "s2", "event_id": "e2", "registration_status": "Approved", "attended": True},
+        {"id": "r3", "student_id": "s1", "event_id": "e3", "registration_status": "Approved", "attended": True},
+        {"id": "r4", "student_id": "s3", "event_id": "e3", "registration_status": "Approved", "attended": False},
+        {"id": "r5", "student_id": "s3", "event_id": "e1", "registration_status": "Pending"},
+        {"id": "r6", "student_id": "s2", "event_id": "e1", "registration_status": "Rejected"},
+    ]).execute()
+
+    # Ratings 5, 4, 4: average 4.33
+    supabase.table("event_feedback").insert([
+        {"id": "f1", "registration_id": "r1", "event_id": "e2", "student_id": "s1", "rating": 5},
+        {"id": "f2", "registration_id": "r2", "event_id": "e2", "student_id": "s2", "rating": 4},
+        {"id": "f3", "registration_id": "r3", "event_id": "e3", "student_id": "s1", "rating": 4},
+    ]).execute()
+
+
+def test_osas_stats():
+    stats, _ = Dashboard.get_osas_stats_and_kpis()
+
+    assert stats == {
+        "total_events": 4,
+        "active_events": 1,
+        "completed_events": 2,
+        "pending_requests": 2,
+        "total_registrations": 6,
+        "pending_registrations": 1
+    }
+
+
+def test_osas_kpis():
+    _, kpi = Dashboard.get_osas_stats_and_kpis()
+
+    assert kpi == {
+        "event_success_rate": 66.7,  # 2 completed / (1 active + 2 completed)
+        "completed_events": 2,
+        "total_events_for_success": 3,
+        "attendance_rate": 75.0,  # 3 attended / 4 approved
+        "total_attended": 3,
+        "total_approved": 4,
+        "avg_approval_time": "< 24h",
+        "processed_requests": 2,  # 1 approved + 1 rejected
+        "unique_participants": 2,  # s1 and s2
+        "feedback_score": 4.3,
+        "total_feedback": 3,
+        "registration_completion_rate": 66.7,  # 4 approved / 6 registrations
+        "approved_registrations": 4,
+        "total_registrations": 6
+    }
@@ -0,0 +1,220 @@
+"""
+Seat reservation (database_add_seat_reservation.sql, database_add_rush_mode.sql)
+through the models, against the local SQLite backend.
+Only Approved registrations hold a seat; Pending ones do not.
+"""
+
+import uuid
+
+import pytest
+
+from models.event_registrations import EventRegistrations
+from models.student_registrations import StudentRegistrations
+
+
+@pytest.fixture
+def db(empty_database):
+    empty_database.table("users").insert(
+        {"id": "dept", "full_name": "Department 1", "email": "dept@test.local", "role": "department"}
+    ).execute()
+    return empty_database
+
+
+def add_event(db, participant_limit=None, status="Active"):
+    event_id = str(uuid.uuid4())
+    db.table("events").insert({
+        "id": event_id, "department_id": "dept", "event_name": "Event", "date": "2026-12-01",
+        "start_time": "08:00:00", "end_time": "10:00:00", "participant_limit": participant_limit, "status": status
+    }).execute()
+    return event_id
+
+
+def add_students(db, count):
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    db.table("users").insert([
+        {"id": student_id, "full_name": f"Student {n}", "email": f"{student_id}@test.local", "role": "student"}
+        for n, student_id in enumerate(ids)
+    ]).execute()
+    return ids
+
+
+def add_registrations(db, event_id, student_ids, status="Pending"):
+    """Registrations created a minute apart, in the given order"""
+    ids = [str(uuid.uuid4()) for _ in student_ids]
+    db.table("registrations").insert([
+        {
+            "id": registration_id, "student_id": student_id, "event_id": event_id,
+            "registration_status": status, "created_at": f"2026-11-01T08:{n:02d}:00+00:00"
+        }
+        for n, (registration_id, student_id) in enumerate(zip(ids, student_ids))
+    ]).execute()
+    return ids
+
+
+def statuses(db, event_id):
+    rows = db.table("registrations").select("id, registration_status").eq("event_id", event_id).execute().data
+    return {row["id"]: row["registration_status"] for row in rows}
+
+
+# ---------- reserve_seat ----------
+
+def test_free_event_registers_approved(db):
+    event_id = add_event(db)
+    (student,) = add_students(db, 1)
+
+    reservation = StudentRegistrations.reserve_seat(student, event_id)
+
+    assert reservation["outcome"] == "registered"
+    assert reservation["registration_status"] == "Approved"
+    assert reservation["remaining_seats"] is None
+    assert statuses(db, event_id) == {reservation["registration_id"]: "Approved"}
+
+
+def test_duplicate(db):
+    event_id = add_event(db, participant_limit=5)
+    (student,) = add_students(db, 1)
+
+    assert StudentRegistrations.reserve_seat(student, event_id)["outcome"] == "registered"
+    assert StudentRegistrations.reserve_seat(student, event_id)["outcome"] == "duplicate"
+    assert len(statuses(db, event_id)) == 1
+
+
+def test_closed(db):
+    (student,) = add_students(db, 1)
+
+    for status in ("Cancelled", "Completed"):
+        event_id = add_event(db, participant_limit=5, status=status)
+        assert StudentRegistrations.reserve_seat(student, event_id)["outcome"] == "closed"
+        assert statuses(db, event_id) == {}
+
+
+def test_not_found(db):
+    (student,) = add_students(db, 1)
+
+    assert StudentRegistrations.reserve_seat(student, str(uuid.uuid4()))["outcome"] == "not_found"
+
+
+def test_pending_registrations_do_not_take_seats(db):
+    event_id = add_event(db, participant_limit=2)
+    students = add_students(db, 4)
+
+    reservations = [StudentRegistrations.reserve_seat(student, event_id) for student in students]
+
+    assert [r["outcome"] for r in reservations] == ["registered"] * 4
+    assert [r["registration_status"] for r in reservations] == ["Pending"] * 4
+    assert [r["remaining_seats"] for r in reservations] == [2] * 4
+
+
+def test_full_once_approved_reach_the_limit(db):
+    event_id = add_event(db, participant_limit=2)
+    students = add_students(db, 3)
+    add_registrations(db, event_id, students[:2], status="Approved")
+
+    reservation = StudentRegistrations.reserve_seat(students[2], event_id)
+
+    assert reservation["outcome"] == "full"
+    assert reservation["remaining_seats"] == 0
+    assert len(statuses(db, event_id)) == 2
+
+
+# ---------- reserve_seats (rush mode batches) ----------
+
+def test_reserve_seats_batch(db):
+    event_id = add_event(db, participant_limit=10)
+    students = add_students(db, 2)
+
+    result = db.rpc("reserve_seats", {"p_event_id": event_id, "p_student_ids": [students[0], students[0], students[1]]}).execute()
+
+    assert [(row["student_id"], row["outcome"]) for row in result.data] == [
+        (students[0], "registered"), (students[0], "duplicate"), (students[1], "registered")
+    ]
+    assert all(row["new_status"] == "Pending" for row in result.data if row["outcome"] == "registered")
+
+
+def test_reserve_seats_full_and_closed(db):
+    full_event = add_event(db, participant_limit=1)
+    closed_event = add_event(db, participant_limit=1, status="Cancelled")
+    students = add_students(db, 3)
+    add_registrations(db, full_event, students[:1], status="Approved")
+
+    full = db.rpc("reserve_seats", {"p_event_id": full_event, "p_student_ids": students[1:]}).execute()
+    closed = db.rpc("reserve_seats", {"p_event_id": closed_event, "p_student_ids": students[1:]}).execute()
+
+    assert [row["outcome"] for row in full.data] == ["full", "full"]
+    assert [row["outcome"] for row in closed.data] == ["closed", "closed"]
+
+
+# ---------- approve_registrations_with_seats ----------
+
+def test_approvals_stop_at_the_limit(db):
+    event_id = add_event(db, participant_limit=2)
+    registrations = add_registrations(db, event_id, add_students(db, 3))
+    missing = str(uuid.uuid4())
+
+    results = EventRegistrations.approve_with_seats(event_id, registrations + [registrations[0], missing])
+
+    assert [(row["registration_id"], row["outcome"]) for row in results] == [
+        (registrations[0], "approved"),
+        (registrations[1], "approved"),
+        (registrations[2], "full"),
+        (registrations[0], "not_pending"),
+        (missing, "not_found"),
+    ]
+    assert [row["remaining_seats"] for row in results[:3]] == [1, 0, 0]
+    assert all(row["unique_code"] for row in results[:2])
+    assert list(statuses(db, event_id).values()).count("Approved") == 2
+
+
+def test_approve_registration_messages(db):
+    event_id = add_event(db, participant_limit=1)
+    first, second = add_registrations(db, event_id, add_students(db, 2))
+
+    assert EventRegistrations.approve_registration(first, event_id)[0] is True
+    assert EventRegistrations.approve_registration(second, event_id) == (False, "Cannot approve: the event has no seats remaining.")
+    assert EventRegistrations.approve_registration(first, event_id) == (False, "Registration has already been processed.")
+
+
+# ---------- bulk_decide_registrations ----------
+
+def test_bulk_approve_first_n_in_created_order(db):
+    event_id = add_event(db, participant_limit=10)
+    registrations = add_registrations(db, event_id, add_students(db, 4))
+
+    success, message, outcomes = EventRegistrations.bulk_decide_registrations(event_id, "approve", first_n=2)
+
+    assert success, message
+    assert [(o["registration_id"], o["status"]) for o in outcomes] == [
+        (registrations[0], "approved"), (registrations[1], "approved")
+    ]
+    assert statuses(db, event_id) == {
+        registrations[0]: "Approved", registrations[1]: "Approved",
+        registrations[2]: "Pending", registrations[3]: "Pending"
+    }
+
+
+def test_bulk_approve_first_n_past_the_limit(db):
+    event_id = add_event(db, participant_limit=1)
+    registrations = add_registrations(db, event_id, add_students(db, 3))
+
+    success, message, outcomes = EventRegistrations.bulk_decide_registrations(event_id, "approve", first_n=3)
+
+    assert success
+    assert message == "1 registration(s) approved, 2 skipped."
+    assert [(o["registration_id"], o["status"], o.get("reason")) for o in outcomes] == [
+        (registrations[0], "approved", None),
+        (registrations[1], "skipped", "No seats remaining"),
+        (registrations[2], "skipped", "No seats remaining"),
+    ]
+
+
+def test_bulk_reject_first_n(db):
+    event_id = add_event(db, participant_limit=10)
+    registrations = add_registrations(db, event_id, add_students(db, 3))
+
+    success, _, outcomes = EventRegistrations.bulk_decide_registrations(event_id, "reject", first_n=2)
+
+    assert success
+    assert [o["status"] for o in outcomes] == ["rejected", "rejected"]
+    assert statuses(db, event_id) == {
+        registrations[0]: "Rejected", registrations[1]: "Rejected", registrations[2]: "Pending"
+    }
@@ -0,0 +1,138 @@
+"""
+The SQLite backend's RPC ports against the plpgsql they port
+Column names are read from each function's RETURNS TABLE in the .sql file;
+the outcome and remaining_seats values follow its RETURN QUERY lines.
+"""
+
+import os
+import re
+import uuid
+
+import pytest
+
+from utils.sqlite_backend import RPC_FUNCTIONS, SQLiteClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def returns_table(sql_file, function):
+    """Column names of `RETURNS TABLE(...)` for public.<function> in sql_file"""
+    with open(os.path.join(ROOT, sql_file), encoding="utf-8") as f:
+        sql = f.read()
+    match = re.search(rf"FUNCTION public\.{function}\(.*?\)\s*RETURNS TABLE\((.*?)\) AS", sql, re.S)
+    return [column.split()[0] for column in match.group(1).split(",")]
+
+
+@pytest.fixture
+def db(empty_database):
+    empty_database.table("users").insert(
+        {"id": "dept", "full_name": "Department 1", "email": "dept@test.local", "role": "department"}
+    ).execute()
+    return empty_database
+
+
+def add_event(db, participant_limit=None, status="Active"):
+    event_id = str(uuid.uuid4())
+    db.table("events").insert({
+        "id": event_id, "department_id": "dept", "event_name": "Event", "date": "2026-12-01",
+        "participant_limit": participant_limit, "status": status
+    }).execute()
+    return event_id
+
+
+def add_students(db, count):
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    db.table("users").insert([
+        {"id": student_id, "full_name": "Student", "email": f"{student_id}@test.local", "role": "student"}
+        for student_id in ids
+    ]).execute()
+    return ids
+
+
+def rpc(db, name, **params):
+    return db.rpc(name, params).execute().data
+
+
+@pytest.mark.parametrize("sql_file, function", [
+    ("database_add_seat_reservation.sql", "reserve_seat"),
+    ("database_add_rush_mode.sql", "reserve_seats"),
+    ("database_add_seat_reservation.sql", "approve_registrations_with_seats"),
+])
+def test_columns_match_returns_table(db, sql_file, function):
+    event_id = add_event(db, participant_limit=3)
+    (student,) = add_students(db, 1)
+    params = {
+        "reserve_seat": {"p_event_id": event_id, "p_student_id": student},
+        "reserve_seats": {"p_event_id": event_id, "p_student_ids": [student]},
+        "approve_registrations_with_seats": {"p_event_id": event_id, "p_registration_ids": [str(uuid.uuid4())]},
+    }[function]
+
+    assert function in RPC_FUNCTIONS
+    (row,) = rpc(db, function, **params)
+    assert list(row) == returns_table(sql_file, function)
+
+
+def test_reserve_seat_rows(db):
+    limited = add_event(db, participant_limit=1)
+    free = add_event(db)
+    closed = add_event(db, participant_limit=1, status="Completed")
+    first, second = add_students(db, 2)
+
+    def reserve(event_id, student):
+        (row,) = rpc(db, "reserve_seat", p_event_id=event_id, p_student_id=student)
+        return row["outcome"], row["new_status"], row["remaining_seats"]
+
+    assert reserve(str(uuid.uuid4()), first) == ("not_found", None, None)
+    assert reserve(closed, first) == ("closed", None, None)
+    assert reserve(free, first) == ("registered", "Approved", None)
+    assert reserve(limited, first) == ("registered", "Pending", 1)
+    # reserve_seat gives no seat count for a duplicate (reserve_seats does)
+    assert reserve(limited, first) == ("duplicate", None, None)
+
+    db.table("registrations").update({"registration_status": "Approved"}).eq("event_id", limited).execute()
+    assert reserve(limited, second) == ("full", None, 0)
+
+
+def test_reserve_seats_rows(db):
+    event_id = add_event(db, participant_limit=2)
+    students = add_students(db, 2)
+
+    rows = rpc(db, "reserve_seats", p_event_id=event_id, p_student_ids=[students[0], students[0], students[1]])
+
+    assert [(row["outcome"], row["new_status"], row["remaining_seats"]) for row in rows] == [
+        ("registered", "Pending", 2), ("duplicate", None, 2), ("registered", "Pending", 2)
+    ]
+    assert rpc(db, "reserve_seats", p_event_id=str(uuid.uuid4()), p_student_ids=students) == [
+        {"student_id": s, "outcome": "not_found", "new_registration_id": None, "new_status": None, "remaining_seats": None}
+        for s in students
+    ]
+
+
+def test_approve_registrations_with_seats_rows(db):
+    free = add_event(db)
+    students = add_students(db, 2)
+    registrations = [row["new_registration_id"] for row in rpc(db, "reserve_seats", p_event_id=free, p_student_ids=students)]
+    db.table("registrations").update({"registration_status": "Pending"}).eq("id", registrations[0]).execute()
+
+    rows = rpc(db, "approve_registrations_with_seats", p_event_id=free, p_registration_ids=registrations)
+
+    # No limit: no seat accounting, remaining_seats stays NULL
+    assert [(row["outcome"], row["remaining_seats"]) for row in rows] == [("approved", None), ("not_pending", None)]
+    assert rpc(db, "approve_registrations_with_seats", p_event_id=str(uuid.uuid4()), p_registration_ids=registrations) == []
+
+
+def test_max_rows_caps_selects_and_keeps_exact_count(tmp_path):
+    client = SQLiteClient(str(tmp_path / "capped.db"), max_rows=3)
+    client.table("users").insert([
+        {"id": f"u{n}", "full_name": "User", "email": f"u{n}@test.local", "role": "student"} for n in range(5)
+    ]).execute()
+
+    result = client.table("users").select("id", count="exact").order("id").execute()
+    assert [row["id"] for row in result.data] == ["u0", "u1", "u2"]
+    assert result.count == 5
+
+    assert len(client.table("users").select("id").limit(10).execute().data) == 3
+    assert len(client.table("users").select("id").range(3, 10).execute().data) == 2
+
+    client.max_rows = 0
+    assert len(client.table("users").select("id").execute().data) == 5
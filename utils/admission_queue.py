@@ -0,0 +1,277 @@
+import os
+import threading
+import time as clock
+import uuid
+from collections import deque
+from config import supabase
+
+# Students registered per reserve_seats call, and how often the worker drains
+BATCH_SIZE = int(os.getenv("ADMISSION_BATCH_SIZE", 100))
+DRAIN_INTERVAL_SECONDS = float(os.getenv("ADMISSION_DRAIN_INTERVAL", 0.5))
+
+# A batch whose reserve_seats call fails goes back to the front of its queue and
+# is retried with exponential backoff; tickets fail after MAX_ATTEMPTS tries
+MAX_ATTEMPTS = int(os.getenv("ADMISSION_MAX_ATTEMPTS", 5))
+BACKOFF_SECONDS = float(os.getenv("ADMISSION_BACKOFF_SECONDS", 1))
+
+# How long finished tickets stay answerable by the status endpoint
+TICKET_TTL_SECONDS = int(os.getenv("ADMISSION_TICKET_TTL", 1800))
+
+# How long an event's rush_mode flag is cached
+RUSH_FLAG_TTL_SECONDS = 30
+
+
+class AdmissionQueue:
+    """
+    In-process FIFO admission queue for events in rush mode
+    Requests only take a numbered ticket; a worker registers queued students in
+    batches through the reserve_seats database function, which still enforces
+    seats and duplicates under a row lock.
+    Tickets live in this process only, so the app runs as one gunicorn worker
+    (Procfile). A ticket this process does not know (another worker, or a
+    restart) is answered from the student's registration for the event.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._queues = {}
+        self._next_number = {}
+        self._served = {}
+        self._retry_at = {}
+        self._tickets = {}
+        self._by_student = {}
+        self._rush_flags = {}
+        self._thread = None
+
+    # ---------- rush mode flag ----------
+
+    def is_rush_event(self, event_id):
+        """True if the event has rush_mode enabled (cached for a few seconds)"""
+        now = clock.monotonic()
+
+        with self._lock:
+            cached = self._rush_flags.get(event_id)
+            if cached and now - cached[1] < RUSH_FLAG_TTL_SECONDS:
+                return cached[0]
+
+        try:
+            result = supabase.table("events").select("rush_mode").eq("id", event_id).execute()
+            rush_mode = bool(result.data and result.data[0].get("rush_mode"))
+        except Exception as e:
+            print(f"Error reading rush mode: {e}")
+            rush_mode = False
+
+        with self._lock:
+            self._rush_flags[event_id] = (rush_mode, now)
+
+        return rush_mode
+
+    # ---------- tickets ----------
+
+    def enqueue(self, event_id, student_id):
+        """Give the student a FIFO ticket for the event (the same ticket if they already hold one)"""
+        with self._lock:
+            existing = self._by_student.get((event_id, student_id))
+            if existing and self._tickets.get(existing, {}).get("status") == "queued":
+                return self._tickets[existing]
+
+            number = self._next_number.get(event_id, 0) + 1
+            self._next_number[event_id] = number
+
+            ticket = {
+                "id": uuid.uuid4().hex,
+                "event_id": event_id,
+                "student_id": student_id,
+                "number": number,
+                "status": "queued",
+                "registration_id": None,
+                "registration_status": None,
+                "attempts": 0,
+                "finished_at": None
+            }
+            self._tickets[ticket["id"]] = ticket
+            self._by_student[(event_id, student_id)] = ticket["id"]
+            self._queues.setdefault(event_id, deque()).append(ticket["id"])
+
+            self._start()
+
+        self._wake.set()
+        return ticket
+
+    def get_ticket(self, ticket_id, student_id, event_id=None):
+        """
+        Return a copy of the student's ticket plus its queue position
+        Unknown tickets fall back to the student's registration for event_id;
+        None if there is neither.
+        """
+        with self._lock:
+            ticket = self._tickets.get(ticket_id)
+            if ticket and ticket["student_id"] == student_id:
+                ticket = dict(ticket)
+                served = self._served.get(ticket["event_id"], 0)
+            else:
+                ticket = None
+
+        if ticket is None:
+            return self._registered_ticket(ticket_id, student_id, event_id) if event_id else None
+
+        ticket["position"] = max(0, ticket["number"] - served) if ticket["status"] == "queued" else 0
+        return ticket
+
+    @staticmethod
+    def _registered_ticket(ticket_id, student_id, event_id):
+        """A finished ticket built from the student's registration (None if they are not registered)"""
+        result = supabase.table("registrations").select("id, registration_status").eq(
+            "event_id", event_id
+        ).eq("student_id", student_id).execute()
+        if not result.data:
+            return None
+
+        registration = result.data[0]
+        return {
+            "id": ticket_id,
+            "event_id": event_id,
+            "student_id": student_id,
+            "number": None,
+            "status": "registered",
+            "registration_id": registration["id"],
+            "registration_status": registration["registration_status"],
+            "attempts": 0,
+            "finished_at": None,
+            "position": 0
+        }
+
+    # ---------- worker ----------
+
+    def _start(self):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._run, name="admission-queue", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(DRAIN_INTERVAL_SECONDS)
+            self._wake.clear()
+
+            try:
+                self.drain()
+                self._expire_tickets()
+            except Exception as e:
+                print(f"Error in admission queue worker: {e}")
+
+    def drain(self):
+        """Register one batch per event with queued students (events backing off are skipped)"""
+        now = clock.monotonic()
+
+        with self._lock:
+            batches = {}
+            for event_id, queue in self._queues.items():
+                if self._retry_at.get(event_id, 0) > now:
+                    continue
+
+                batch = []
+                while queue and len(batch) < BATCH_SIZE:
+                    batch.append(self._tickets[queue.popleft()])
+                if batch:
+                    batches[event_id] = batch
+
+        for event_id, batch in batches.items():
+            self._register_batch(event_id, batch)
+
+    def _register_batch(self, event_id, batch):
+        from models.event_requirements import EventRequirements
+
+        try:
+            result = supabase.rpc("reserve_seats", {
+                "p_event_id": event_id,
+                "p_student_ids": [ticket["student_id"] for ticket in batch]
+            }).execute()
+            outcomes = {row["student_id"]: row for row in (result.data or [])}
+        except Exception as e:
+            print(f"Error registering admission batch: {e}")
+            self._retry_batch(event_id, batch)
+            return
+
+        pending_ids = []
+        now = clock.monotonic()
+
+        with self._lock:
+            self._retry_at.pop(event_id, None)
+
+            for ticket in batch:
+                row = outcomes.get(ticket["student_id"])
+                ticket["status"] = row["outcome"] if row else "error"
+                ticket["finished_at"] = now
+
+                if row and row["outcome"] == "registered":
+                    ticket["registration_id"] = row["new_registration_id"]
+                    ticket["registration_status"] = row["new_status"]
+                    if row["new_status"] == "Pending":
+                        pending_ids.append(row["new_registration_id"])
+
+            self._served[event_id] = max(self._served.get(event_id, 0), batch[-1]["number"])
+
+        # Requirement tracking for limited events, one insert for the whole batch
+        if pending_ids:
+            EventRequirements.initialize_requirements_for_new_registrations(pending_ids, event_id)
+
+    def _retry_batch(self, event_id, batch):
+        """Put a failed batch back at the front of its queue, in order, unless it ran out of attempts"""
+        now = clock.monotonic()
+
+        with self._lock:
+            retry = []
+            for ticket in batch:
+                ticket["attempts"] += 1
+                if ticket["attempts"] >= MAX_ATTEMPTS:
+                    ticket["status"] = "error"
+                    ticket["finished_at"] = now
+                else:
+                    retry.append(ticket["id"])
+
+            if retry:
+                self._queues.setdefault(event_id, deque()).extendleft(reversed(retry))
+                attempts = max(self._tickets[ticket_id]["attempts"] for ticket_id in retry)
+                self._retry_at[event_id] = now + BACKOFF_SECONDS * (2 ** (attempts - 1))
+
+            # Failed tickets are no longer waiting in line
+            if len(retry) < len(batch):
+                self._served[event_id] = max(
+                    self._served.get(event_id, 0),
+                    max(ticket["number"] for ticket in batch if ticket["id"] not in retry)
+                )
+
+    def _expire_tickets(self):
+        now = clock.monotonic()
+        cutoff = now - TICKET_TTL_SECONDS
+
+        with self._lock:
+            expired = [
+                ticket_id for ticket_id, ticket in self._tickets.items()
+                if ticket["finished_at"] is not None and ticket["finished_at"] < cutoff
+            ]
+            for ticket_id in expired:
+                ticket = self._tickets.pop(ticket_id)
+                key = (ticket["event_id"], ticket["student_id"])
+                if self._by_student.get(key) == ticket_id:
+                    del self._by_student[key]
+
+            # Forget events whose queue is empty and whose tickets have all expired
+            live_events = {ticket["event_id"] for ticket in self._tickets.values()}
+            for event_id in list(self._queues):
+                if not self._queues[event_id] and event_id not in live_events:
+                    del self._queues[event_id]
+                    self._next_number.pop(event_id, None)
+                    self._served.pop(event_id, None)
+                    self._retry_at.pop(event_id, None)
+
+            self._rush_flags = {
+                event_id: cached for event_id, cached in self._rush_flags.items()
+                if now - cached[1] < RUSH_FLAG_TTL_SECONDS
+            }
+
+
+admission_queue = AdmissionQueue()
@@ -0,0 +1,299 @@
+import atexit
+import os
+import threading
+import time as clock
+from config import supabase
+
+# Pending check-ins are written once this many accumulate, or after FLUSH_SECONDS
+FLUSH_SIZE = int(os.getenv("CHECKIN_FLUSH_SIZE", 25))
+FLUSH_SECONDS = float(os.getenv("CHECKIN_FLUSH_SECONDS", 5))
+
+# A session's approved registrations are reloaded (in place, keeping unflushed
+# scans) this long after they were loaded; rejections and cancellations made
+# through the app are evicted right away, this only bounds changes made elsewhere
+SESSION_TTL_SECONDS = int(os.getenv("CHECKIN_SESSION_TTL", 10 * 60))
+
+REGISTRATION_COLUMNS = "id, event_id, registration_status, unique_code, attended, users!registrations_student_id_fkey(full_name, student_id, email)"
+
+
+class CheckinSession:
+    """
+    In-memory check-in state for one event
+    Holds the event's approved registrations keyed by unique_code so scans are
+    validated locally; attended flags are written back in batches.
+    """
+
+    def __init__(self, event_id, organizer_id):
+        self.event_id = event_id
+        self.organizer_id = organizer_id
+        self.loaded_at = clock.monotonic()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._by_code = {}
+        self._pending_ids = []
+        self._flushing_ids = []
+        self._oldest_pending = None
+
+    def load(self):
+        """
+        (Re)load the approved registrations for the event (one query)
+        Scans not yet written (queued or being flushed) stay attended in the new
+        map, so a reload never lets the same code check in twice.
+        """
+        result = supabase.table("registrations").select(REGISTRATION_COLUMNS).eq(
+            "event_id", self.event_id
+        ).eq("registration_status", "Approved").execute()
+
+        with self._lock:
+            unwritten = set(self._pending_ids) | set(self._flushing_ids)
+            by_code = {}
+            for reg in result.data or []:
+                if not reg.get("unique_code"):
+                    continue
+                if reg["id"] in unwritten:
+                    reg["attended"] = True
+                by_code[reg["unique_code"]] = reg
+
+            self._by_code = by_code
+            self.loaded_at = clock.monotonic()
+
+    def is_expired(self):
+        return clock.monotonic() - self.loaded_at > SESSION_TTL_SECONDS
+
+    def refresh_if_expired(self):
+        """Reload an expired session; one thread reloads while the others keep using the current map"""
+        if not self.is_expired() or not self._reload_lock.acquire(blocking=False):
+            return
+
+        try:
+            if self.is_expired():
+                self.load()
+        except Exception as e:
+            # Keep serving the map we have; the next scan tries again
+            print(f"Error reloading check-in session for event {self.event_id}: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending_ids)
+
+    def evict(self, registration_ids):
+        """Forget registrations that are no longer approved (and drop their unflushed scans)"""
+        registration_ids = set(registration_ids)
+        with self._lock:
+            self._by_code = {
+                code: reg for code, reg in self._by_code.items() if reg["id"] not in registration_ids
+            }
+            self._pending_ids = [pending for pending in self._pending_ids if pending not in registration_ids]
+            if not self._pending_ids:
+                self._oldest_pending = None
+
+    def scan(self, unique_code):
+        """
+        Validate a scanned code and mark it attended
+        Returns (status: str, registration: dict or None) where status is one of
+        'checked_in', 'already_attended', 'not_approved' or 'not_found'
+        """
+        with self._lock:
+            registration = self._by_code.get(unique_code)
+
+        if registration is None:
+            # Approved after the session was loaded (or not valid at all)
+            registration = self._lookup(unique_code)
+            if registration is None:
+                return "not_found", None
+            if registration.get("registration_status") != "Approved":
+                return "not_approved", registration
+
+        with self._lock:
+            if registration.get("attended"):
+                return "already_attended", registration
+
+            registration["attended"] = True
+            self._pending_ids.append(registration["id"])
+            if self._oldest_pending is None:
+                self._oldest_pending = clock.monotonic()
+
+            flush_now = len(self._pending_ids) >= FLUSH_SIZE
+
+        if flush_now:
+            self.flush()
+
+        return "checked_in", registration
+
+    def _lookup(self, unique_code):
+        result = supabase.table("registrations").select(REGISTRATION_COLUMNS).eq(
+            "unique_code", unique_code
+        ).eq("event_id", self.event_id).execute()
+
+        if not result.data:
+            return None
+
+        registration = result.data[0]
+        if registration.get("registration_status") == "Approved":
+            with self._lock:
+                registration = self._by_code.setdefault(unique_code, registration)
+
+        return registration
+
+    def flush_due(self):
+        """True if pending check-ins have waited longer than FLUSH_SECONDS"""
+        with self._lock:
+            return self._oldest_pending is not None and clock.monotonic() - self._oldest_pending >= FLUSH_SECONDS
+
+    def flush(self):
+        """Write all pending attended flags in one update"""
+        with self._lock:
+            ids = self._pending_ids
+            self._pending_ids = []
+            self._oldest_pending = None
+            self._flushing_ids = self._flushing_ids + ids
+
+        if not ids:
+            return 0
+
+        try:
+            supabase.table("registrations").update({
+                "attended": True,
+                "attended_at": "now()"
+            }).in_("id", ids).eq("attended", False).execute()
+            return len(ids)
+        except Exception as e:
+            print(f"Error flushing check-ins for event {self.event_id}: {e}")
+            # Keep them for the next flush
+            with self._lock:
+                self._pending_ids = ids + self._pending_ids
+                if self._oldest_pending is None:
+                    self._oldest_pending = clock.monotonic()
+            return 0
+        finally:
+            with self._lock:
+                flushed = set(ids)
+                self._flushing_ids = [pending for pending in self._flushing_ids if pending not in flushed]
+
+
+class CheckinSessions:
+    """
+    Registry of open check-in sessions plus the background flusher
+    A session is only ever dropped once its pending scans are written: closed
+    sessions that still hold scans stay in `_closing` until a flush succeeds.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._closing = []
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def get(self, event_id, organizer_id):
+        """
+        Return the open session for an event, loading it on first use
+        Returns None if the event does not belong to the organizer.
+        """
+        with self._lock:
+            session = self._sessions.get(event_id)
+            if session is None:
+                loading = self._loading.setdefault(event_id, threading.Lock())
+
+        if session is None:
+            # One load per event: concurrent first scans wait for it instead of loading their own
+            with loading:
+                session = self._open(event_id, organizer_id)
+            if session is None:
+                return None
+
+        if session.organizer_id != organizer_id:
+            return None
+
+        session.refresh_if_expired()
+        return session
+
+    def _open(self, event_id, organizer_id):
+        try:
+            with self._lock:
+                session = self._sessions.get(event_id)
+            if session:
+                return session
+
+            event = supabase.table("events").select("id, department_id").eq("id", event_id).execute()
+            if not event.data or event.data[0]["department_id"] != organizer_id:
+                return None
+
+            session = CheckinSession(event_id, organizer_id)
+            session.load()
+
+            with self._lock:
+                self._sessions[event_id] = session
+                self._start_flusher()
+
+            return session
+        finally:
+            with self._lock:
+                self._loading.pop(event_id, None)
+
+    def flush(self, event_id=None):
+        """Write pending check-ins for one event (or every event, closed sessions included) now"""
+        with self._lock:
+            if event_id is None:
+                sessions = list(self._sessions.values()) + list(self._closing)
+            else:
+                sessions = [self._sessions.get(event_id)] + [
+                    session for session in self._closing if session.event_id == event_id
+                ]
+
+        for session in sessions:
+            if session:
+                session.flush()
+
+        self._drop_flushed()
+
+    def evict(self, registration_ids):
+        """Remove rejected/cancelled registrations from every open (or closing) session"""
+        with self._lock:
+            sessions = list(self._sessions.values()) + list(self._closing)
+
+        for session in sessions:
+            session.evict(registration_ids)
+
+    def close(self, event_id):
+        """Stop using an event's session (e.g. the event was cancelled) and write its pending scans"""
+        with self._lock:
+            session = self._sessions.pop(event_id, None)
+            if session:
+                self._closing.append(session)
+
+        if session:
+            session.flush()
+            self._drop_flushed()
+
+    def _drop_flushed(self):
+        with self._lock:
+            self._closing = [session for session in self._closing if session.has_pending()]
+
+    def _start_flusher(self):
+        if self._flusher and self._flusher.is_alive():
+            return
+
+        self._flusher = threading.Thread(target=self._run_flusher, name="checkin-flusher", daemon=True)
+        self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            clock.sleep(1)
+
+            with self._lock:
+                sessions = list(self._sessions.values()) + list(self._closing)
+
+            for session in sessions:
+                if session.flush_due():
+                    session.flush()
+
+            self._drop_flushed()
+
+
+checkin_sessions = CheckinSessions()
+
+# Do not lose buffered scans when the worker shuts down cleanly
+atexit.register(checkin_sessions.flush)
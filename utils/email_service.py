@@ -1,13 +1,13 @@
 import os
 import random
 import string
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
 from datetime import datetime, timedelta
 from config import supabase
+from utils.mail_queue import mail_queue
+from utils.email_templates import render_email
 
 class EmailService:
-    """Service for sending emails via SendGrid"""
+    """Service for sending emails (delivered through the mail queue)"""
     
     @staticmethod
     def generate_otp(length=6):
@@ -15,30 +15,25 @@ class EmailService:
         return ''.join(random.choices(string.digits, k=length))
     
     @staticmethod
-    def send_email(to_email, subject, html_content):
-        """Send email using SendGrid"""
+    def send_email(to_email, subject, html_content, text_content=None):
+        """
+        Queue an email for delivery by the mail workers
+        With MAIL_QUEUE_ENABLED=0 the message is sent synchronously instead.
+        """
         try:
-            api_key = os.getenv('SENDGRID_API_KEY')
-            from_email = os.getenv('SENDGRID_FROM_EMAIL', 'noreply@lspu.edu.ph')
-            from_name = os.getenv('SENDGRID_FROM_NAME', 'LSPU CESMS')
-            
-            if not api_key or api_key == 'your_sendgrid_api_key_here':
+            if not mail_queue.is_configured():
                 print("⚠️  SendGrid API key not configured. Email not sent.")
                 print(f"📧 Would send to: {to_email}")
                 print(f"📝 Subject: {subject}")
                 return False, "SendGrid API key not configured"
             
-            message = Mail(
-                from_email=(from_email, from_name),
-                to_emails=to_email,
-                subject=subject,
-                html_content=html_content
-            )
+            if os.getenv("MAIL_QUEUE_ENABLED", "1") != "1":
+                mail_queue.transport.send(to_email, subject, html_content, text_content)
+                return True, "Email sent successfully"
             
-            sg = SendGridAPIClient(api_key)
-            response = sg.send(message)
+            mail_queue.enqueue(to_email, subject, html_content, text_content)
             
-            return True, "Email sent successfully"
+            return True, "Email queued for delivery"
             
         except Exception as e:
             print(f"Error sending email: {e}")
@@ -65,53 +60,14 @@ class EmailService:
                 "verified": False
             }).execute()
             
-            # Email template
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <style>
-                    body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background: linear-gradient(135deg, #1f2937 0%, #374151 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                    .content {{ background: #f9fafb; padding: 30px; border-radius: 0 0 10px 10px; }}
-                    .otp-box {{ background: white; border: 2px solid #e5e7eb; border-radius: 8px; padding: 20px; text-align: center; margin: 20px 0; }}
-                    .otp-code {{ font-size: 32px; font-weight: bold; letter-spacing: 8px; color: #1f2937; }}
-                    .footer {{ text-align: center; margin-top: 20px; color: #6b7280; font-size: 12px; }}
-                    .button {{ display: inline-block; padding: 12px 24px; background: #1f2937; color: white; text-decoration: none; border-radius: 6px; margin: 10px 0; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🎓 Welcome to LSPU CESMS</h1>
-                    </div>
-                    <div class="content">
-                        <p>Hello <strong>{full_name}</strong>,</p>
-                        <p>Thank you for signing up for the Campus Event and Student Management System!</p>
-                        <p>To verify your LSPU institutional email, please use the following One-Time Password (OTP):</p>
-                        
-                        <div class="otp-box">
-                            <div class="otp-code">{otp}</div>
-                            <p style="margin: 10px 0 0 0; color: #6b7280; font-size: 14px;">This code expires in 10 minutes</p>
-                        </div>
-                        
-                        <p>If you didn't request this verification, please ignore this email.</p>
-                        
-                        <div class="footer">
-                            <p>Laguna State Polytechnic University</p>
-                            <p>Campus Event and Student Management System</p>
-                        </div>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
+            # Email body (templates are compiled once at startup)
+            html_content, text_content = render_email("verification_otp", full_name=full_name, otp=otp)
             
             success, message = EmailService.send_email(
                 to_email=email,
                 subject="Verify Your LSPU Email - OTP Code",
-                html_content=html_content
+                html_content=html_content,
+                text_content=text_content
             )
             
             return success, message, otp if not success else None
@@ -141,55 +97,14 @@ class EmailService:
                 "used": False
             }).execute()
             
-            # Email template
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <style>
-                    body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background: linear-gradient(135deg, #1f2937 0%, #111827 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                    .content {{ background: #f9fafb; padding: 30px; border-radius: 0 0 10px 10px; }}
-                    .otp-box {{ background: white; border: 2px solid #e5e7eb; border-radius: 8px; padding: 20px; text-align: center; margin: 20px 0; }}
-                    .otp-code {{ font-size: 32px; font-weight: bold; letter-spacing: 8px; color: #1f2937; }}
-                    .warning {{ background: #f3f4f6; border-left: 4px solid #1f2937; padding: 12px; margin: 15px 0; border-radius: 4px; }}
-                    .footer {{ text-align: center; margin-top: 20px; color: #6b7280; font-size: 12px; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🔐 Password Reset Request</h1>
-                    </div>
-                    <div class="content">
-                        <p>Hello <strong>{full_name}</strong>,</p>
-                        <p>We received a request to reset your password for your LSPU CESMS account.</p>
-                        <p>Use the following One-Time Password (OTP) to reset your password:</p>
-                        
-                        <div class="otp-box">
-                            <div class="otp-code">{otp}</div>
-                            <p style="margin: 10px 0 0 0; color: #6b7280; font-size: 14px;">This code expires in 10 minutes</p>
-                        </div>
-                        
-                        <div class="warning">
-                            <strong>⚠️ Security Notice:</strong> If you didn't request a password reset, please ignore this email and ensure your account is secure.
-                        </div>
-                        
-                        <div class="footer">
-                            <p>Laguna State Polytechnic University</p>
-                            <p>Campus Event and Student Management System</p>
-                        </div>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
+            # Email body (templates are compiled once at startup)
+            html_content, text_content = render_email("password_reset_otp", full_name=full_name, otp=otp)
             
             success, message = EmailService.send_email(
                 to_email=email,
                 subject="Password Reset Request - OTP Code",
-                html_content=html_content
+                html_content=html_content,
+                text_content=text_content
             )
             
             return success, message, otp if not success else None
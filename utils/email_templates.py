@@ -0,0 +1,63 @@
+import os
+import re
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import escape
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+# Per-send values are the only thing substituted at send time. Each template is
+# rendered once with these markers in place of the values and split on them.
+# Templates must print these fields as-is (no filters on them).
+EMAIL_FIELDS = ("full_name", "otp")
+_MARKER = "@@EMAIL_FIELD_{}@@"
+_MARKER_PATTERN = re.compile(r"@@EMAIL_FIELD_(\w+)@@")
+
+EMAIL_TEMPLATES = ("verification_otp", "password_reset_otp")
+
+
+class CompiledEmailPart:
+    """A rendered template split into literal chunks and field names"""
+
+    def __init__(self, rendered, escape_values):
+        pieces = _MARKER_PATTERN.split(rendered)
+        # split() alternates: literal, field, literal, field, ..., literal
+        self.literals = pieces[0::2]
+        self.fields = pieces[1::2]
+        self.escape_values = escape_values
+
+    def render(self, values):
+        output = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            value = str(values.get(field, ""))
+            output.append(str(escape(value)) if self.escape_values else value)
+            output.append(literal)
+        return "".join(output)
+
+
+def _compile_all():
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(["html"])
+    )
+    markers = {field: _MARKER.format(field) for field in EMAIL_FIELDS}
+
+    compiled = {}
+    for name in EMAIL_TEMPLATES:
+        html = env.get_template(f"emails/{name}.html").render(**markers)
+        text = env.get_template(f"emails/{name}.txt").render(**markers)
+        compiled[name] = (CompiledEmailPart(html, True), CompiledEmailPart(text, False))
+
+    return compiled
+
+
+# Built once when the module is imported (at app startup)
+_compiled = _compile_all()
+
+
+def render_email(name, **values):
+    """
+    Fill a precompiled email template
+    Returns (html_content, text_content)
+    """
+    html_part, text_part = _compiled[name]
+    return html_part.render(values), text_part.render(values)
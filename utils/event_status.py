@@ -0,0 +1,69 @@
+from datetime import datetime
+from flask import g, has_app_context
+from utils.schedule_index import parse_time
+
+
+def reference_now():
+    """
+    The "now" that display statuses are computed against
+    Fixed for the rest of a request so every event on a page is classified
+    against the same instant; outside a request it is simply datetime.now().
+    """
+    if not has_app_context():
+        return datetime.now()
+
+    if "status_reference_now" not in g:
+        g.status_reference_now = datetime.now()
+    return g.status_reference_now
+
+
+def _date_key(value):
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def classify_events(events, now=None):
+    """
+    Display statuses for a list of events, in the same order
+    Active events dated before/after today are settled by comparing dates;
+    only today's events need their times, which records (models/records.py)
+    already carry parsed and plain rows parse through the cached parse_time.
+    """
+    now = now or reference_now()
+    today = now.date()
+    today_key = today.isoformat()
+    current_time = now.time()
+
+    statuses = []
+    for event in events:
+        status = event.get("status", "Active")
+        event_date = event.get("date")
+        start_time = event.get("start_time")
+        end_time = event.get("end_time")
+
+        if status != "Active" or not (event_date and start_time and end_time):
+            statuses.append(status)
+            continue
+
+        # Records come with the date and times already parsed
+        parsed_date = getattr(event, "event_date", None)
+        if parsed_date is not None:
+            order = (parsed_date > today) - (parsed_date < today)
+            start, end = event.start, event.end
+        else:
+            event_day = _date_key(event_date)
+            order = (event_day > today_key) - (event_day < today_key)
+            start = end = None
+
+        if order < 0:
+            statuses.append("Completed")
+        elif order > 0:
+            statuses.append("Active")
+        elif current_time > (end or parse_time(end_time)):
+            statuses.append("Completed")
+        elif current_time >= (start or parse_time(start_time)):
+            statuses.append("Ongoing")
+        else:
+            # Event is today but hasn't started yet
+            statuses.append("Active")
+
+    return statuses
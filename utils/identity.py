@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import g, session, has_app_context
+
+
+class IdentityCache:
+    """Process-wide TTL/LRU cache of user rows keyed by email"""
+
+    def __init__(self, max_size=1024, ttl_seconds=60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, email):
+        """Return the cached user row, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+
+            user, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[email]
+                return None
+
+            # Mark as most recently used
+            self._entries.move_to_end(email)
+            return user
+
+    def set(self, email, user):
+        """Store a user row, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[email] = (user, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(email)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email=None):
+        """Drop one email from the cache, or everything if no email is given"""
+        with self._lock:
+            if email is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(email, None)
+
+
+_identity_cache = IdentityCache(
+    max_size=int(os.getenv("IDENTITY_CACHE_SIZE", 1024)),
+    ttl_seconds=int(os.getenv("IDENTITY_CACHE_TTL", 60))
+)
+
+
+def current_user():
+    """
+    Get the logged-in user's row for this request
+    Looks in flask.g first, then the process cache, and only queries
+    Supabase on a miss. Returns None if not logged in or the user is gone.
+    """
+    email = session.get("user_email")
+    if not email:
+        return None
+
+    # Memoized for the rest of this request
+    if g.get("current_user_email") == email:
+        return g.current_user
+
+    user = _identity_cache.get(email)
+
+    if user is None:
+        from models.user import User
+
+        user_response = User.get_identity_by_email(email)
+        user = user_response.data[0] if user_response.data else None
+
+        if user:
+            _identity_cache.set(email, user)
+
+    # Each request gets its own copy so controllers can't mutate the cached row
+    g.current_user_email = email
+    g.current_user = dict(user) if user else None
+    return g.current_user
+
+
+def invalidate_user(email=None):
+    """Forget a cached identity (call whenever a user's role or department changes)"""
+    _identity_cache.invalidate(email)
+
+    if has_app_context() and (email is None or g.get("current_user_email") == email):
+        g.pop("current_user_email", None)
+        g.pop("current_user", None)
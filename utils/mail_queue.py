@@ -0,0 +1,269 @@
+import os
+import queue
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from config import supabase
+
+FROM_EMAIL = os.getenv('SENDGRID_FROM_EMAIL', 'noreply@lspu.edu.ph')
+FROM_NAME = os.getenv('SENDGRID_FROM_NAME', 'LSPU CESMS')
+
+WORKER_COUNT = int(os.getenv("MAIL_WORKERS", 2))
+MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", 5))
+BACKOFF_SECONDS = float(os.getenv("MAIL_BACKOFF_SECONDS", 2))
+
+# A row stuck in 'sending' longer than this belonged to a worker that died
+STALE_SENDING_MINUTES = 10
+
+
+class SendGridTransport:
+    """Delivers through the SendGrid API with one shared client"""
+
+    name = "sendgrid"
+
+    def __init__(self, api_key):
+        from sendgrid import SendGridAPIClient
+        self.client = SendGridAPIClient(api_key)
+
+    def send(self, to_email, subject, html_content, text_content=None):
+        from sendgrid.helpers.mail import Mail
+
+        message = Mail(
+            from_email=(FROM_EMAIL, FROM_NAME),
+            to_emails=to_email,
+            subject=subject,
+            html_content=html_content,
+            plain_text_content=text_content
+        )
+        self.client.send(message)
+
+
+class SmtpTransport:
+    """Delivers through an SMTP server (e.g. a local MailHog/smtp4dev sink)"""
+
+    name = "smtp"
+
+    def __init__(self):
+        self.host = os.getenv("SMTP_HOST", "localhost")
+        self.port = int(os.getenv("SMTP_PORT", 25))
+        self.username = os.getenv("SMTP_USERNAME")
+        self.password = os.getenv("SMTP_PASSWORD")
+        self.use_tls = os.getenv("SMTP_USE_TLS", "0") == "1"
+
+    def send(self, to_email, subject, html_content, text_content=None):
+        message = _build_message(to_email, subject, html_content, text_content)
+
+        with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+
+class FileTransport:
+    """Writes each message as an .eml file instead of sending it (for tests and local runs)"""
+
+    name = "file"
+
+    def __init__(self):
+        self.directory = os.getenv("MAIL_FILE_DIR", "sent_emails")
+        os.makedirs(self.directory, exist_ok=True)
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def send(self, to_email, subject, html_content, text_content=None):
+        message = _build_message(to_email, subject, html_content, text_content)
+
+        with self._lock:
+            self._counter += 1
+            filename = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self._counter:04d}.eml"
+
+        with open(os.path.join(self.directory, filename), "wb") as f:
+            f.write(message.as_bytes())
+
+
+def _build_message(to_email, subject, html_content, text_content):
+    message = EmailMessage()
+    message["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
+    message["To"] = to_email
+    message["Subject"] = subject
+    message.set_content(text_content or "This message requires an HTML-capable email client.")
+    message.add_alternative(html_content, subtype="html")
+    return message
+
+
+def create_transport():
+    """
+    Pick the transport from MAIL_TRANSPORT (sendgrid, smtp or file)
+    Returns None when nothing is configured, which callers treat as dev mode.
+    """
+    name = os.getenv("MAIL_TRANSPORT", "sendgrid").lower()
+
+    if name == "smtp":
+        return SmtpTransport()
+
+    if name == "file":
+        return FileTransport()
+
+    api_key = os.getenv('SENDGRID_API_KEY')
+    if not api_key or api_key == 'your_sendgrid_api_key_here':
+        return None
+
+    return SendGridTransport(api_key)
+
+
+class MailQueue:
+    """
+    Outbound mail queue backed by the email_outbox table
+    Handlers only insert a row and hand its id to the worker pool; the
+    workers claim the row, send it and retry failures with exponential backoff.
+    """
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._transport = None
+        self._transport_loaded = False
+
+    @property
+    def transport(self):
+        with self._lock:
+            if not self._transport_loaded:
+                self._transport = create_transport()
+                self._transport_loaded = True
+            return self._transport
+
+    def is_configured(self):
+        """True if there is a transport to deliver with"""
+        return self.transport is not None
+
+    def start(self):
+        """Start the worker pool and re-queue anything left in the outbox"""
+        with self._lock:
+            if self._threads:
+                return
+
+            for index in range(WORKER_COUNT):
+                thread = threading.Thread(target=self._run, name=f"mail-worker-{index + 1}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+        self.recover()
+
+    def enqueue(self, to_email, subject, html_content, text_content=None):
+        """
+        Persist a message to the outbox and queue it for delivery
+        Returns the outbox row id
+        """
+        result = supabase.table("email_outbox").insert({
+            "to_email": to_email,
+            "subject": subject,
+            "html_content": html_content,
+            "text_content": text_content,
+            "status": "pending",
+            "attempts": 0
+        }).execute()
+
+        outbox_id = result.data[0]["id"]
+
+        self.start()
+        self._jobs.put(outbox_id)
+        return outbox_id
+
+    def recover(self):
+        """Queue pending rows (and rows abandoned mid-send) left by a previous process"""
+        try:
+            cutoff = (datetime.now() - timedelta(minutes=STALE_SENDING_MINUTES)).isoformat()
+
+            supabase.table("email_outbox").update({
+                "status": "pending"
+            }).eq("status", "sending").lt("locked_at", cutoff).execute()
+
+            pending = supabase.table("email_outbox").select("id").eq("status", "pending").order("created_at").execute()
+
+            for row in pending.data or []:
+                self._jobs.put(row["id"])
+
+            if pending.data:
+                print(f"Mail queue: re-queued {len(pending.data)} message(s) from the outbox")
+        except Exception as e:
+            print(f"Error recovering email outbox: {e}")
+
+    def _run(self):
+        while True:
+            outbox_id = self._jobs.get()
+            try:
+                self._deliver(outbox_id)
+            except Exception as e:
+                print(f"Error in mail worker: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def _deliver(self, outbox_id):
+        # Claim the row so another worker/process does not send it twice
+        claimed = supabase.table("email_outbox").update({
+            "status": "sending",
+            "locked_at": datetime.now().isoformat()
+        }).eq("id", outbox_id).eq("status", "pending").execute()
+
+        if not claimed.data:
+            return
+
+        message = claimed.data[0]
+        attempts = (message.get("attempts") or 0) + 1
+
+        try:
+            transport = self.transport
+            if transport is None:
+                raise RuntimeError("No mail transport configured")
+
+            transport.send(
+                message["to_email"],
+                message["subject"],
+                message["html_content"],
+                message.get("text_content")
+            )
+
+            # The body holds the OTP, so it is not kept once delivered
+            supabase.table("email_outbox").update({
+                "status": "sent",
+                "attempts": attempts,
+                "sent_at": "now()",
+                "html_content": None,
+                "text_content": None,
+                "last_error": None
+            }).eq("id", outbox_id).execute()
+
+        except Exception as e:
+            print(f"Error sending email to {message['to_email']} (attempt {attempts}): {e}")
+
+            if attempts >= MAX_ATTEMPTS:
+                supabase.table("email_outbox").update({
+                    "status": "failed",
+                    "attempts": attempts,
+                    "last_error": str(e)
+                }).eq("id", outbox_id).execute()
+                return
+
+            supabase.table("email_outbox").update({
+                "status": "pending",
+                "attempts": attempts,
+                "last_error": str(e)
+            }).eq("id", outbox_id).execute()
+
+            delay = BACKOFF_SECONDS * (2 ** (attempts - 1))
+            timer = threading.Timer(delay, self._jobs.put, args=(outbox_id,))
+            timer.daemon = True
+            timer.start()
+
+
+mail_queue = MailQueue()
+
+
+def start_mail_queue():
+    """Start the mail workers unless disabled with MAIL_QUEUE_ENABLED=0"""
+    if os.getenv("MAIL_QUEUE_ENABLED", "1") == "1" and mail_queue.is_configured():
+        mail_queue.start()
@@ -0,0 +1,22 @@
+import uuid
+from datetime import date
+
+
+def parse_page_cursor(cursor, key_type=date):
+    """
+    Split a keyset cursor '<key>_<id>' into (key, id) strings
+    key_type is date for '2025-03-01_<id>' cursors or datetime for
+    '<created_at>_<id>'. Returns None if the cursor is malformed (e.g. an
+    edited ?after= link), so nothing unchecked reaches a PostgREST filter.
+    """
+    if not cursor or "_" not in cursor:
+        return None
+
+    key, row_id = cursor.split("_", 1)
+    try:
+        key_type.fromisoformat(key)
+        row_id = str(uuid.UUID(row_id))
+    except ValueError:
+        return None
+
+    return key, row_id
@@ -0,0 +1,50 @@
+import contextvars
+import os
+import time as clock
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+FANOUT_WORKERS = int(os.getenv("QUERY_FANOUT_WORKERS", 8))
+
+# Default time a page waits for each query before giving up on it
+FANOUT_TIMEOUT_SECONDS = float(os.getenv("QUERY_FANOUT_TIMEOUT_SECONDS", 5))
+
+# One bounded pool shared by all requests; queries are I/O bound (HTTP to PostgREST)
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="query-fanout")
+
+
+def fan_out(queries, defaults=None, timeouts=None, timeout=FANOUT_TIMEOUT_SECONDS):
+    """
+    Run independent queries concurrently and collect their results by name
+    queries: {name: callable}. Each callable runs on the shared pool inside a
+    copy of the caller's context, so flask's g / current_app keep working.
+    A query that fails or runs past its timeout (timeouts[name], else
+    `timeout`) falls back to defaults[name]; without a default its error is
+    raised to the caller. The page waits for the slowest query, not the sum.
+    """
+    defaults = defaults or {}
+    timeouts = timeouts or {}
+
+    started = clock.monotonic()
+    futures = {
+        name: _executor.submit(contextvars.copy_context().run, query)
+        for name, query in queries.items()
+    }
+
+    results = {}
+    for name, future in futures.items():
+        limit = timeouts.get(name, timeout)
+        try:
+            results[name] = future.result(timeout=max(0, started + limit - clock.monotonic()))
+        except FutureTimeout:
+            future.cancel()
+            if name not in defaults:
+                raise TimeoutError(f"Query '{name}' timed out after {limit}s")
+            print(f"Query '{name}' timed out after {limit}s")
+            results[name] = defaults[name]
+        except Exception as e:
+            if name not in defaults:
+                raise
+            print(f"Error in query '{name}': {e}")
+            results[name] = defaults[name]
+
+    return results
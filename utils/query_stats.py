@@ -0,0 +1,173 @@
+import json
+import os
+import time as clock
+from collections import Counter
+from flask import g, has_app_context
+
+# Record every PostgREST call made while handling a request (set QUERY_STATS=1 to turn on;
+# the X-DB-Queries header exposes query counts and timings, so keep it off in production)
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS", "0") == "1"
+
+# Log every request's query summary, not only the ones with repeated queries
+QUERY_STATS_LOG_ALL = os.getenv("QUERY_STATS_LOG", "0") == "1"
+
+# The same query shape (filters with different values) this many times in one
+# request is reported as a likely N+1 loop; identical queries are reported from 2
+REPEATED_SHAPE_THRESHOLD = int(os.getenv("QUERY_STATS_REPEAT_THRESHOLD", 5))
+
+
+class InstrumentedClient:
+    """
+    Wraps the Supabase client (or utils/sqlite_backend.SQLiteClient) so every
+    .execute() is timed and recorded in flask.g for the current request
+    Everything else (auth, ...) passes straight through.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name):
+        return InstrumentedQuery(self._client.table(name), name, ())
+
+    from_ = table
+
+    def rpc(self, name, params=None):
+        return InstrumentedQuery(self._client.rpc(name, params or {}), f"rpc:{name}", (("params", (params,), {}),))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class InstrumentedQuery:
+    """A query builder that remembers the calls made on it"""
+
+    def __init__(self, query, table, calls):
+        self._query = query
+        self._table = table
+        self._calls = calls
+
+    def __getattr__(self, name):
+        attr = getattr(self._query, name)
+
+        # Properties such as not_ return the next builder directly
+        if hasattr(attr, "execute") and not callable(attr):
+            return InstrumentedQuery(attr, self._table, self._calls + ((name, None, None),))
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                return InstrumentedQuery(result, self._table, self._calls + ((name, args, kwargs),))
+            return result
+
+        return call
+
+    def execute(self):
+        started = clock.perf_counter()
+        response = self._query.execute()
+        elapsed_ms = (clock.perf_counter() - started) * 1000
+
+        record_query(self._table, self._calls, response, elapsed_ms)
+        return response
+
+
+def _describe(calls, with_values=True):
+    parts = []
+    for name, args, kwargs in calls:
+        if args is None:
+            parts.append(name)
+            continue
+        if with_values:
+            values = [repr(arg) for arg in args] + [f"{key}={value!r}" for key, value in kwargs.items()]
+        else:
+            # Keep column names (first argument) and drop the values being compared
+            values = [repr(args[0])] if args and name != "params" else []
+            values += [f"{key}=?" for key in kwargs]
+        parts.append(f"{name}({', '.join(values)})")
+    return ".".join(parts)
+
+
+def start_query_stats():
+    """before_request hook: give the request an empty query list"""
+    g.db_queries = []
+
+
+def record_query(table, calls, response, elapsed_ms):
+    """Add one executed query to the current request's stats (no-op outside a request)"""
+    if not has_app_context():
+        return
+
+    # Set by start_query_stats before any handler (or fan-out thread) runs
+    queries = g.get("db_queries")
+    if queries is None:
+        return
+
+    data = getattr(response, "data", None)
+    if isinstance(data, list):
+        rows = len(data)
+    else:
+        rows = 0 if data is None else 1
+
+    try:
+        payload_bytes = len(json.dumps(data, default=str))
+    except (TypeError, ValueError):
+        payload_bytes = 0
+
+    # Queries fanned out to other threads share this list (list.append is atomic)
+    queries.append({
+        "table": table,
+        "query": f"{table}.{_describe(calls)}",
+        "shape": f"{table}.{_describe(calls, with_values=False)}",
+        "rows": rows,
+        "bytes": payload_bytes,
+        "ms": elapsed_ms
+    })
+
+
+def request_summary():
+    """
+    Totals for the current request, or None if it made no queries
+    Returns {"count", "ms", "rows", "bytes", "repeated": [(query, times)], "suspected_n_plus_one": [(shape, times)]}
+    """
+    if not has_app_context():
+        return None
+
+    queries = g.get("db_queries")
+    if not queries:
+        return None
+
+    identical = Counter(query["query"] for query in queries)
+    shapes = Counter(query["shape"] for query in queries)
+
+    return {
+        "count": len(queries),
+        "ms": sum(query["ms"] for query in queries),
+        "rows": sum(query["rows"] for query in queries),
+        "bytes": sum(query["bytes"] for query in queries),
+        "repeated": [(query, times) for query, times in identical.most_common() if times > 1],
+        "suspected_n_plus_one": [
+            (shape, times) for shape, times in shapes.most_common() if times >= REPEATED_SHAPE_THRESHOLD
+        ]
+    }
+
+
+def add_query_stats(response, request_path):
+    """after_request hook: X-DB-Queries header plus a log line for repeated queries"""
+    summary = request_summary()
+    if summary is None:
+        return response
+
+    response.headers["X-DB-Queries"] = f"{summary['count']}; {summary['ms']:.0f}ms"
+
+    if QUERY_STATS_LOG_ALL or summary["repeated"] or summary["suspected_n_plus_one"]:
+        print(
+            f"[db] {request_path}: {summary['count']} queries, {summary['ms']:.0f}ms, "
+            f"{summary['rows']} rows, {summary['bytes']} bytes"
+        )
+        for query, times in summary["repeated"]:
+            print(f"[db]   repeated {times}x (likely N+1): {query}")
+        for shape, times in summary["suspected_n_plus_one"]:
+            print(f"[db]   same query shape {times}x (likely N+1): {shape}")
+
+    return response
@@ -0,0 +1,331 @@
+import os
+import threading
+import time as clock
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time
+from functools import lru_cache
+from config import supabase
+
+# How long the index is trusted before it is reloaded from the database.
+# Writes made through this process are applied immediately; the reload only
+# picks up changes made by other app workers. Previews read the index as is;
+# paths that book a slot pass fresh=True to re-read that (location, date) first.
+INDEX_TTL_SECONDS = int(os.getenv("SCHEDULE_INDEX_TTL", 300))
+
+# PostgREST returns at most this many rows per request
+PAGE_SIZE = 1000
+
+EVENT_COLUMNS = "id, event_request_id, event_name, location, date, start_time, end_time, status"
+REQUEST_COLUMNS = "id, event_name, location, date, start_time, end_time, status"
+
+
+@lru_cache(maxsize=4096)
+def _parse_time_string(value):
+    # Try both formats: HH:MM:SS and HH:MM
+    try:
+        return datetime.strptime(value, "%H:%M:%S").time()
+    except ValueError:
+        return datetime.strptime(value, "%H:%M").time()
+
+
+def parse_time(value):
+    """Convert a 'HH:MM:SS' / 'HH:MM' string (or a time) to a time object"""
+    if isinstance(value, time):
+        return value
+    return _parse_time_string(value)
+
+
+def format_time_range(start, end):
+    """Format a slot the way conflict messages show it, e.g. '09:00 AM - 11:00 AM'"""
+    return f"{start.strftime('%I:%M %p')} - {end.strftime('%I:%M %p')}"
+
+
+def _seconds(value):
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+class _Slot:
+    """One booked interval (an Active event or a Pending request)"""
+
+    __slots__ = ("kind", "id", "event_request_id", "name", "start", "end", "key", "label")
+
+    def __init__(self, kind, row):
+        self.kind = kind
+        self.id = row["id"]
+        self.event_request_id = row.get("event_request_id")
+        self.name = row["event_name"]
+        self.start = parse_time(row["start_time"])
+        self.end = parse_time(row["end_time"])
+        self.key = (str(row["location"]), str(row["date"]))
+        self.label = format_time_range(self.start, self.end)
+
+    def as_conflict(self):
+        return {"type": self.kind, "name": self.name, "time": self.label}
+
+
+class _Bucket:
+    """Slots for one (location, date), kept sorted by start time"""
+
+    __slots__ = ("starts", "slots", "max_duration")
+
+    def __init__(self):
+        self.starts = []
+        self.slots = []
+        self.max_duration = 0
+
+    def add(self, slot):
+        start = _seconds(slot.start)
+        position = bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.slots.insert(position, slot)
+        self.max_duration = max(self.max_duration, _seconds(slot.end) - start)
+
+    def remove(self, slot):
+        position = bisect_left(self.starts, _seconds(slot.start))
+        while position < len(self.slots):
+            if self.slots[position] is slot:
+                del self.starts[position]
+                del self.slots[position]
+                return
+            position += 1
+
+    def overlapping(self, start, end):
+        """
+        Slots with (slot.start < end) and (slot.end > start)
+        Only starts in (start - longest slot, end) can overlap, so this is two
+        bisects plus a scan of the candidates.
+        """
+        start_seconds = _seconds(start)
+        low = bisect_right(self.starts, start_seconds - self.max_duration)
+        high = bisect_left(self.starts, _seconds(end))
+
+        return [slot for slot in self.slots[low:high] if slot.end > start]
+
+
+class ScheduleIndex:
+    """
+    In-memory interval index of Active events and Pending requests per (location, date)
+    Answers the same questions as the old per-call conflict queries without
+    touching the database.
+    """
+
+    def __init__(self, ttl=INDEX_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._buckets = {}
+        self._slots = {}
+        self._loaded_at = None
+
+    # ---------- loading ----------
+
+    def load(self):
+        """(Re)build the index from the database: one paged query per table"""
+        events = _fetch_all("events", EVENT_COLUMNS, "status", "Active")
+        requests = _fetch_all("event_requests", REQUEST_COLUMNS, "status", "Pending")
+
+        with self._lock:
+            self._buckets = {}
+            self._slots = {}
+            for row in events:
+                self._add("approved_event", row)
+            for row in requests:
+                self._add("pending_request", row)
+            self._loaded_at = clock.monotonic()
+
+    def reload_slot(self, location, date):
+        """Re-read one (location, date) from the database (two small queries)"""
+        events = supabase.table("events").select(EVENT_COLUMNS).eq("status", "Active").eq(
+            "location", location
+        ).eq("date", date).execute().data or []
+        requests = supabase.table("event_requests").select(REQUEST_COLUMNS).eq("status", "Pending").eq(
+            "location", location
+        ).eq("date", date).execute().data or []
+
+        with self._lock:
+            bucket = self._buckets.get((str(location), str(date)))
+            for slot in list(bucket.slots) if bucket else []:
+                self._remove((slot.kind, slot.id))
+
+            for kind, rows in (("approved_event", events), ("pending_request", requests)):
+                for row in rows:
+                    # The row may sit under another (location, date) in a stale index
+                    self._remove((kind, row["id"]))
+                    self._add(kind, row)
+
+    def invalidate(self):
+        """Force a reload on the next query"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded_at is not None and clock.monotonic() - self._loaded_at < self.ttl:
+                return
+            self.load()
+
+    # ---------- keeping in sync ----------
+
+    def sync_events(self, rows):
+        """Apply inserted/updated event rows (only Active events are kept)"""
+        self._sync("approved_event", rows, "Active")
+
+    def sync_requests(self, rows):
+        """Apply inserted/updated event request rows (only Pending requests are kept)"""
+        self._sync("pending_request", rows, "Pending")
+
+    def remove_request(self, request_id):
+        """Drop a deleted event request"""
+        with self._lock:
+            self._remove(("pending_request", request_id))
+
+    def _sync(self, kind, rows, live_status):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+
+            for row in rows or []:
+                if "id" not in row:
+                    continue
+
+                self._remove((kind, row["id"]))
+
+                # Partial rows (e.g. a status-only update) cannot be re-indexed; reload later
+                if not all(row.get(column) for column in ("location", "date", "start_time", "end_time", "status")):
+                    self._loaded_at = None
+                    continue
+
+                if row["status"] == live_status:
+                    self._add(kind, row)
+
+    def _add(self, kind, row):
+        slot = _Slot(kind, row)
+        self._slots[(kind, slot.id)] = slot
+        self._buckets.setdefault(slot.key, _Bucket()).add(slot)
+
+    def _remove(self, slot_id):
+        slot = self._slots.pop(slot_id, None)
+        if slot is None:
+            return
+
+        bucket = self._buckets.get(slot.key)
+        if bucket:
+            bucket.remove(slot)
+            if not bucket.slots:
+                del self._buckets[slot.key]
+
+    # ---------- queries ----------
+
+    def find_conflicts(self, location, date, start_time, end_time,
+                       exclude_event_id=None, exclude_request_id=None, include_requests=True, fresh=False):
+        """
+        Return conflict detail dicts for a proposed slot, approved events first:
+        {"type": "approved_event" | "pending_request", "name": ..., "time": "09:00 AM - 11:00 AM"}
+        exclude_request_id skips that request and the event created from it.
+        fresh=True re-reads this (location, date) from the database first.
+        """
+        self._ensure_loaded()
+        if fresh:
+            self.reload_slot(location, date)
+
+        start = parse_time(start_time)
+        end = parse_time(end_time)
+
+        with self._lock:
+            bucket = self._buckets.get((str(location), str(date)))
+            if not bucket:
+                return []
+            candidates = bucket.overlapping(start, end)
+
+        approved = []
+        pending = []
+        for slot in candidates:
+            if slot.kind == "approved_event":
+                if exclude_event_id and slot.id == exclude_event_id:
+                    continue
+                if exclude_request_id and slot.event_request_id == exclude_request_id:
+                    continue
+                approved.append(slot.as_conflict())
+            elif include_requests:
+                if exclude_request_id and slot.id == exclude_request_id:
+                    continue
+                pending.append(slot.as_conflict())
+
+        return approved + pending
+
+
+def _fetch_all(table, columns, status_column, status):
+    """Read every row with the given status, page by page"""
+    rows = []
+    offset = 0
+
+    while True:
+        page = supabase.table(table).select(columns).eq(status_column, status).order("id").range(
+            offset, offset + PAGE_SIZE - 1
+        ).execute()
+        data = page.data or []
+        rows.extend(data)
+
+        if len(data) < PAGE_SIZE:
+            return rows
+        offset += PAGE_SIZE
+
+
+schedule_index = ScheduleIndex()
+
+
+def conflicts_for_requests(requests, events, pending_requests):
+    """
+    Compute the conflicts of many pending requests in one pass
+    events / pending_requests are the Active events and Pending requests for
+    the dates involved. Slots are grouped by (location, date) and each group is
+    swept once in start order. Returns {request_id: [conflict dicts]} with the
+    same contents and ordering as find_conflicts(..., exclude_request_id=id).
+    """
+    target_ids = {req["id"] for req in requests}
+
+    groups = {}
+    seen_requests = set()
+    for row in events:
+        slot = _Slot("approved_event", row)
+        groups.setdefault(slot.key, []).append(slot)
+    for row in list(pending_requests) + list(requests):
+        if row["id"] in seen_requests:
+            continue
+        seen_requests.add(row["id"])
+        slot = _Slot("pending_request", row)
+        groups.setdefault(slot.key, []).append(slot)
+
+    overlaps = {}
+    for slots in groups.values():
+        if not any(slot.kind == "pending_request" and slot.id in target_ids for slot in slots):
+            continue
+
+        slots.sort(key=lambda slot: slot.start)
+        open_slots = []
+        for slot in slots:
+            # Slots that ended before this one starts can never overlap again
+            open_slots = [other for other in open_slots if other.end > slot.start]
+
+            for other in open_slots:
+                if not other.start < slot.end:
+                    continue
+                for target, hit in ((slot, other), (other, slot)):
+                    if target.kind == "pending_request" and target.id in target_ids:
+                        overlaps.setdefault(target.id, []).append(hit)
+
+            if slot.end > slot.start:
+                open_slots.append(slot)
+
+    conflicts_map = {}
+    for request_id, hits in overlaps.items():
+        hits.sort(key=lambda slot: slot.start)
+        approved = [
+            hit.as_conflict() for hit in hits
+            if hit.kind == "approved_event" and hit.event_request_id != request_id
+        ]
+        pending = [hit.as_conflict() for hit in hits if hit.kind == "pending_request"]
+
+        if approved or pending:
+            conflicts_map[request_id] = approved + pending
+
+    return conflicts_map
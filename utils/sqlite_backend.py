@@ -0,0 +1,862 @@
+"""
+Local SQLite backend for load testing and benchmarking
+
+The models talk to the database through the Supabase (PostgREST) query
+builder: supabase.table(...).select(...).eq(...).order(...).execute().
+SQLiteClient implements the same builder on top of a local SQLite file, so
+with DATA_BACKEND=sqlite (see config.py) the whole app runs against seeded
+data (seed_local_database.py) without a Supabase project.
+
+Supported, because the app uses it:
+  * select with column lists, count="exact" and embedded resources
+    (users!events_department_id_fkey(...), !inner joins, nested embeds)
+  * eq/neq/gt/gte/lt/lte/like/ilike/is_/in_, not_, or_ (with reference_table)
+    and filters on embedded columns ("users.role")
+  * order, limit, range, insert (single or list), update, delete and
+    upsert (on_conflict, ignore_duplicates)
+  * the RPCs from the database_*.sql migrations, run in Python inside one
+    BEGIN IMMEDIATE transaction
+  * PostgREST's db-max-rows cap (1000 on Supabase): a select or RPC returns
+    at most max_rows rows, whatever limit()/range() asked for, while
+    count="exact" still counts every match
+
+The RPCs are Python ports of the plpgsql functions, not the functions
+themselves, so the .sql file stays the source of truth. Each port names its
+file; tests/test_sqlite_rpc_parity.py pins the outcomes and remaining_seats
+values the plpgsql returns, and a change to either side has to keep them in
+step.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database_sqlite_schema.sql")
+
+# Foreign keys as (child table, column, parent table); PostgREST names them
+# "<child>_<column>_fkey", which is what the select strings use as hints.
+FOREIGN_KEYS = [
+    ("events", "department_id", "users"),
+    ("events", "event_request_id", "event_requests"),
+    ("event_requests", "department_id", "users"),
+    ("registrations", "student_id", "users"),
+    ("registrations", "event_id", "events"),
+    ("event_requirements", "event_id", "events"),
+    ("registration_requirements", "registration_id", "registrations"),
+    ("registration_requirements", "requirement_id", "event_requirements"),
+    ("event_feedback", "event_id", "events"),
+    ("event_feedback", "student_id", "users"),
+    ("event_feedback", "registration_id", "registrations"),
+]
+
+OPERATORS = {
+    "eq": "=",
+    "neq": "<>",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "like": "LIKE",
+    "ilike": "LIKE",
+}
+
+# Keeps IN (...) lists well below SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+# Supabase's default "Max rows" API setting
+DEFAULT_MAX_ROWS = 1000
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class APIResponse:
+    """The parts of postgrest's APIResponse the app reads"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class LocalAuth:
+    """
+    Stand-in for supabase.auth
+    Sign-in always fails so user_controller.login falls back to the password
+    stored in the users table, which is how seeded accounts log in.
+    """
+
+    def sign_in_with_password(self, credentials):
+        raise Exception("Invalid login credentials")
+
+    def sign_up(self, credentials):
+        return SimpleNamespace(user={"email": credentials.get("email")}, session=None)
+
+    def sign_out(self):
+        return None
+
+
+# ---------- select strings ----------
+
+def _split_top_level(text):
+    """Split on commas that are not inside parentheses or double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _parse_select(text):
+    """
+    Parse a PostgREST select string
+    Returns (columns, embeds): columns is None for "*" or a list of
+    (alias, column); embeds are dicts with alias, table, hint, inner, select.
+    """
+    columns = []
+    star = False
+    embeds = []
+
+    for part in _split_top_level(text or "*"):
+        if not part:
+            continue
+
+        if "(" in part:
+            head, inner_select = part.split("(", 1)
+            inner_select = inner_select[:-1]
+            alias = None
+            if ":" in head:
+                alias, head = head.split(":", 1)
+            names = head.strip().split("!")
+            embeds.append({
+                "alias": (alias or names[0]).strip(),
+                "table": names[0].strip(),
+                "hint": next((n for n in names[1:] if n != "inner"), None),
+                "inner": "inner" in names[1:],
+                "select": inner_select,
+            })
+        elif part == "*":
+            star = True
+        else:
+            alias, _, column = part.rpartition(":")
+            columns.append((alias or column, column))
+
+    return (None if star else columns), embeds
+
+
+# ---------- filters ----------
+
+def _parse_value(raw):
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] == '"':
+        return raw[1:-1]
+    return raw
+
+
+def _parse_condition(text):
+    """Parse one item of an or_/and() filter string into a filter node"""
+    negate = False
+    if text.startswith("not."):
+        negate, text = True, text[4:]
+
+    for group in ("and", "or"):
+        if text.startswith(group + "("):
+            children = [_parse_condition(item) for item in _split_top_level(text[len(group) + 1:-1])]
+            return {"group": group, "children": children, "negate": negate}
+
+    column, operator, value = text.split(".", 2)
+    if operator == "not":
+        operator, value = value.split(".", 1)
+        negate = not negate
+
+    if operator == "in":
+        value = [_parse_value(item) for item in _split_top_level(value.strip()[1:-1])]
+    else:
+        value = _parse_value(value)
+
+    return {"column": column, "operator": operator, "value": value, "negate": negate}
+
+
+class SQLiteClient:
+    """Drop-in for the supabase Client's table(), rpc() and auth"""
+
+    def __init__(self, path, max_rows=DEFAULT_MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows  # None or 0 disables the cap
+        self.auth = LocalAuth()
+        self._local = threading.local()
+
+        conn = self.connection()
+        with open(SCHEMA_PATH, encoding="utf-8") as schema:
+            conn.executescript(schema.read())
+
+        # Declared column types drive the bool/JSON conversions
+        self.column_types = {}
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')").fetchall()
+        for (name,) in tables:
+            self.column_types[name] = {
+                row[1]: (row[2] or "").upper()
+                for row in conn.execute(f'PRAGMA table_info("{name}")')
+            }
+
+    def connection(self):
+        """One connection per thread (the app serves requests and runs workers on threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def table(self, name):
+        return QueryBuilder(self, name)
+
+    from_ = table
+
+    def rpc(self, name, params=None):
+        return RPCCall(self, name, params or {})
+
+    # ---------- row conversion ----------
+
+    def encode(self, table, row, new=False):
+        """Python values -> SQLite values for one row to be written (new rows get a UUID)"""
+        types = self.column_types.get(table, {})
+        encoded = {}
+        for key, value in row.items():
+            if value == "now()":
+                value = _now()
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            encoded[key] = value
+
+        if new and types.get("id") == "TEXT" and not encoded.get("id"):
+            encoded["id"] = str(uuid.uuid4())
+        return encoded
+
+    def decode(self, table, columns, values):
+        """A fetched SQLite row -> the dict PostgREST would have returned"""
+        types = self.column_types.get(table, {})
+        row = {}
+        for column, value in zip(columns, values):
+            declared = types.get(column, "")
+            if value is not None:
+                if declared == "BOOLEAN":
+                    value = bool(value)
+                elif declared == "JSON":
+                    value = json.loads(value)
+            row[column] = value
+        return row
+
+    def fetch(self, table, sql, params=()):
+        cursor = self.connection().execute(sql, params)
+        columns = [description[0] for description in cursor.description or []]
+        return [self.decode(table, columns, values) for values in cursor.fetchall()]
+
+    # ---------- relationships ----------
+
+    def relationship(self, table, embed):
+        """
+        Resolve an embed of `table` to (kind, child_column, other_table)
+        kind is "one" when `table` holds the foreign key, "many" otherwise.
+        """
+        candidates = []
+        for child, column, parent in FOREIGN_KEYS:
+            constraint = f"{child}_{column}_fkey"
+            if embed["hint"] not in (None, constraint, column):
+                continue
+            if child == table and parent == embed["table"]:
+                candidates.append(("one", column, parent))
+            elif parent == table and child == embed["table"]:
+                candidates.append(("many", column, child))
+
+        if len(candidates) != 1:
+            raise Exception(f"Could not embed '{embed['table']}' in '{table}' (hint: {embed['hint']})")
+        return candidates[0]
+
+
+class RPCCall:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        handler = RPC_FUNCTIONS.get(self.name)
+        if handler is None:
+            raise Exception(f"Could not find the function public.{self.name}")
+
+        conn = self.client.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            data = handler(self.client, **self.params)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if self.client.max_rows and isinstance(data, list):
+            data = data[:self.client.max_rows]
+        return APIResponse(data)
+
+
+class QueryBuilder:
+    """The postgrest request builder, compiled to SQL on execute()"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table_name = table
+        self.method = "select"
+        self.select_text = "*"
+        self.count_mode = None
+        self.values = None
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.offset_count = None
+        self._negate_next = False
+
+    # ---------- methods ----------
+
+    def select(self, *columns, count=None):
+        self.select_text = ",".join(columns) if columns else "*"
+        self.count_mode = count
+        return self
+
+    def insert(self, values, **kwargs):
+        self.method = "insert"
+        self.values = values
+        return self
+
+    def upsert(self, values, on_conflict=None, ignore_duplicates=False, **kwargs):
+        self.method = "upsert"
+        self.values = values
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values, **kwargs):
+        self.method = "update"
+        self.values = values
+        return self
+
+    def delete(self, **kwargs):
+        self.method = "delete"
+        return self
+
+    # ---------- filters ----------
+
+    @property
+    def not_(self):
+        self._negate_next = True
+        return self
+
+    def _add(self, column, operator, value):
+        self.filters.append({"column": column, "operator": operator, "value": value, "negate": self._negate_next})
+        self._negate_next = False
+        return self
+
+    def eq(self, column, value):
+        return self._add(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._add(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._add(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._add(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._add(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._add(column, "lte", value)
+
+    def like(self, column, pattern):
+        return self._add(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._add(column, "ilike", pattern)
+
+    def is_(self, column, value):
+        return self._add(column, "is", value)
+
+    def in_(self, column, values):
+        return self._add(column, "in", list(values))
+
+    def filter(self, column, operator, criteria):
+        node = _parse_condition(f"{column}.{operator}.{criteria}")
+        node["negate"] = node["negate"] != self._negate_next
+        self._negate_next = False
+        self.filters.append(node)
+        return self
+
+    def or_(self, filters, reference_table=None):
+        children = [_parse_condition(item) for item in _split_top_level(filters)]
+        if reference_table:
+            for child in children:
+                _prefix_columns(child, reference_table)
+        self.filters.append({"group": "or", "children": children, "negate": self._negate_next})
+        self._negate_next = False
+        return self
+
+    def order(self, column, desc=False, nullsfirst=None, **kwargs):
+        self.orders.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size, **kwargs):
+        self.limit_count = size
+        return self
+
+    def range(self, start, end, **kwargs):
+        self.offset_count = start
+        self.limit_count = end - start + 1
+        return self
+
+    # ---------- execution ----------
+
+    def execute(self):
+        if self.method == "select":
+            return self._execute_select()
+        if self.method in ("insert", "upsert"):
+            return self._execute_insert()
+        if self.method == "update":
+            return self._execute_update()
+        return self._execute_delete()
+
+    def _execute_select(self):
+        columns, embeds = _parse_select(self.select_text)
+        where, params = _compile_where(self.client, self.table_name, "t0", self.filters, embeds, 0)
+
+        sql = f'SELECT t0.* FROM "{self.table_name}" AS t0{where}'
+        if self.orders:
+            sql += " ORDER BY " + ", ".join(
+                f'"{column}" {"DESC" if desc else "ASC"} NULLS {_nulls(desc, nullsfirst)}'
+                for column, desc, nullsfirst in self.orders
+            )
+        limit = self.limit_count
+        if self.client.max_rows:
+            limit = self.client.max_rows if limit is None else min(limit, self.client.max_rows)
+        if limit is not None or self.offset_count:
+            sql += f" LIMIT {int(limit if limit is not None else -1)}"
+            sql += f" OFFSET {int(self.offset_count or 0)}"
+
+        rows = self.client.fetch(self.table_name, sql, params)
+        _embed(self.client, self.table_name, rows, embeds, self.filters)
+        rows = [_project(row, columns, embeds) for row in rows]
+
+        count = None
+        if self.count_mode:
+            count_sql = f'SELECT COUNT(*) FROM "{self.table_name}" AS t0{where}'
+            count = self.client.connection().execute(count_sql, params).fetchone()[0]
+
+        return APIResponse(rows, count)
+
+    def _rows(self):
+        rows = self.values if isinstance(self.values, list) else [self.values]
+        return [self.client.encode(self.table_name, row, new=self.method != "update") for row in rows]
+
+    def _execute_insert(self):
+        rows = self._rows()
+        if not rows:
+            return APIResponse([])
+
+        # Bulk writes use the union of the keys; missing ones are written as NULL
+        keys = list(dict.fromkeys(key for row in rows for key in row))
+        column_list = ", ".join(f'"{key}"' for key in keys)
+        placeholders = ", ".join("?" for _ in keys)
+
+        sql = f'INSERT INTO "{self.table_name}" ({column_list}) VALUES ({placeholders})'
+        if self.method == "upsert":
+            conflict = [column.strip() for column in (self.on_conflict or "id").split(",")]
+            target = ", ".join(f'"{column}"' for column in conflict)
+            updates = [key for key in keys if key not in conflict and key != "id"]
+            if self.ignore_duplicates or not updates:
+                sql += f" ON CONFLICT ({target}) DO NOTHING"
+            else:
+                sql += f" ON CONFLICT ({target}) DO UPDATE SET " + ", ".join(
+                    f'"{key}" = excluded."{key}"' for key in updates
+                )
+        sql += " RETURNING *"
+
+        conn = self.client.connection()
+        inserted = []
+        conn.execute("BEGIN")
+        try:
+            for row in rows:
+                cursor = conn.execute(sql, [row.get(key) for key in keys])
+                columns = [description[0] for description in cursor.description]
+                inserted.extend(self.client.decode(self.table_name, columns, values) for values in cursor.fetchall())
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        columns, _ = _parse_select(self.select_text)
+        return APIResponse([_project(row, columns, []) for row in inserted])
+
+    def _execute_update(self):
+        row = self._rows()[0]
+        where, params = _compile_where(self.client, self.table_name, "t0", self.filters, [], 0)
+        assignments = ", ".join(f'"{key}" = ?' for key in row)
+        sql = f'UPDATE "{self.table_name}" AS t0 SET {assignments}{where} RETURNING *'
+        return APIResponse(self.client.fetch(self.table_name, sql, list(row.values()) + params))
+
+    def _execute_delete(self):
+        where, params = _compile_where(self.client, self.table_name, "t0", self.filters, [], 0)
+        sql = f'DELETE FROM "{self.table_name}" AS t0{where} RETURNING *'
+        return APIResponse(self.client.fetch(self.table_name, sql, params))
+
+
+def _nulls(desc, nullsfirst):
+    # Postgres defaults: ASC NULLS LAST, DESC NULLS FIRST
+    if nullsfirst is None:
+        nullsfirst = desc
+    return "FIRST" if nullsfirst else "LAST"
+
+
+def _prefix_columns(node, prefix):
+    if "group" in node:
+        for child in node["children"]:
+            _prefix_columns(child, prefix)
+    else:
+        node["column"] = f"{prefix}.{node['column']}"
+
+
+def _filter_path(node):
+    """The embed a filter node applies to ("" for the table itself)"""
+    if "group" in node:
+        paths = {_filter_path(child) for child in node["children"]}
+        return paths.pop() if len(paths) == 1 else ""
+    return node["column"].rpartition(".")[0]
+
+
+def _strip_path(node, path):
+    """A copy of the node with `path.` removed from its column names"""
+    if "group" in node:
+        return dict(node, children=[_strip_path(child, path) for child in node["children"]])
+    return dict(node, column=node["column"][len(path) + 1:])
+
+
+def _scoped_filters(filters, path):
+    """Filters aimed at the embed `path`, rewritten relative to it"""
+    scoped = []
+    for node in filters:
+        node_path = _filter_path(node)
+        if node_path == path or node_path.startswith(path + "."):
+            scoped.append(_strip_path(node, path))
+    return scoped
+
+
+def _compile_where(client, table, alias, filters, embeds, depth):
+    """
+    Compile the filters on `table` (and its !inner embeds) to a WHERE clause
+    Filters on embedded columns ("users.role") become EXISTS subqueries for
+    inner joins; for plain embeds they only narrow the embedded rows.
+    """
+    clauses, params = [], []
+
+    for node in filters:
+        if _filter_path(node) == "":
+            sql, node_params = _compile_node(client, table, alias, node)
+            clauses.append(sql)
+            params.extend(node_params)
+
+    for embed in embeds:
+        if not embed["inner"]:
+            continue
+
+        kind, column, other = client.relationship(table, embed)
+        sub_alias = f"t{depth + 1}"
+        if kind == "one":
+            join = f'{sub_alias}.id = {alias}."{column}"'
+        else:
+            join = f'{sub_alias}."{column}" = {alias}.id'
+
+        _, sub_embeds = _parse_select(embed["select"])
+        sub_where, sub_params = _compile_where(
+            client, other, sub_alias, _scoped_filters(filters, embed["alias"]), sub_embeds, depth + 1
+        )
+        sub_where = f"{sub_where} AND {join}" if sub_where else f" WHERE {join}"
+        clauses.append(f'EXISTS (SELECT 1 FROM "{other}" AS {sub_alias}{sub_where})')
+        params.extend(sub_params)
+
+    if not clauses:
+        return "", []
+    return " WHERE " + " AND ".join(clauses), params
+
+
+def _compile_node(client, table, alias, node):
+    if "group" in node:
+        parts, params = [], []
+        for child in node["children"]:
+            sql, child_params = _compile_node(client, table, alias, child)
+            parts.append(sql)
+            params.extend(child_params)
+        joiner = " OR " if node["group"] == "or" else " AND "
+        sql = "(" + joiner.join(parts) + ")"
+        return (f"NOT {sql}" if node["negate"] else sql), params
+
+    column = node["column"].rpartition(".")[2]
+    declared = client.column_types.get(table, {}).get(column, "")
+    target = f'{alias}."{column}"'
+    operator, value = node["operator"], node["value"]
+
+    if operator == "is":
+        if isinstance(value, str):
+            value = {"null": None, "true": True, "false": False}[value.lower()]
+        sql, params = f"{target} IS ?", [None if value is None else int(value)]
+    elif operator == "in":
+        values = [_coerce(value_item, declared) for value_item in value]
+        if values:
+            sql, params = f"{target} IN ({', '.join('?' for _ in values)})", values
+        else:
+            sql, params = "0", []
+    elif operator in OPERATORS:
+        if operator in ("like", "ilike"):
+            value = str(value).replace("*", "%")
+        sql, params = f"{target} {OPERATORS[operator]} ?", [_coerce(value, declared)]
+    else:
+        raise Exception(f"Unsupported filter operator: {operator}")
+
+    return (f"NOT ({sql})" if node["negate"] else sql), params
+
+
+def _coerce(value, declared):
+    if declared == "BOOLEAN" and isinstance(value, str):
+        return {"true": 1, "false": 0}.get(value.lower(), value)
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _embed(client, table, rows, embeds, filters, path=""):
+    """Attach embedded resources to `rows` with one query per embed"""
+    for embed in embeds:
+        kind, column, other = client.relationship(table, embed)
+        embed_path = f"{path}.{embed['alias']}" if path else embed["alias"]
+        columns, sub_embeds = _parse_select(embed["select"])
+        scoped = _scoped_filters(filters, embed_path)
+        where_filters = [node for node in scoped if _filter_path(node) == ""]
+
+        if kind == "one":
+            keys = list({row[column] for row in rows if row.get(column) is not None})
+            match_column = "id"
+        else:
+            keys = list({row["id"] for row in rows})
+            match_column = column
+
+        related = []
+        for start in range(0, len(keys), IN_CHUNK_SIZE):
+            chunk = keys[start:start + IN_CHUNK_SIZE]
+            nodes = where_filters + [{"column": match_column, "operator": "in", "value": chunk, "negate": False}]
+            where, params = _compile_where(client, other, "t0", nodes, sub_embeds, 0)
+            related.extend(client.fetch(other, f'SELECT t0.* FROM "{other}" AS t0{where}', params))
+
+        _embed(client, other, related, sub_embeds, filters, embed_path)
+
+        if kind == "one":
+            by_id = {item["id"]: _project(item, columns, sub_embeds) for item in related}
+            for row in rows:
+                row[embed["alias"]] = by_id.get(row.get(column))
+        else:
+            grouped = {}
+            for item in related:
+                grouped.setdefault(item[column], []).append(_project(item, columns, sub_embeds))
+            for row in rows:
+                row[embed["alias"]] = grouped.get(row["id"], [])
+
+
+def _project(row, columns, embeds):
+    """Keep only the selected columns (plus embeds), like PostgREST does"""
+    if columns is None:
+        return row
+    projected = {alias: row.get(column) for alias, column in columns}
+    for embed in embeds:
+        projected[embed["alias"]] = row.get(embed["alias"])
+    return projected
+
+
+# ---------- RPCs (database_*.sql functions) ----------
+
+def _one(client, sql, params=()):
+    rows = client.fetch("", sql, params)
+    return rows[0] if rows else None
+
+
+def _approved_count(client, event_id):
+    return _one(
+        client,
+        "SELECT COUNT(*) AS total FROM registrations WHERE event_id = ? AND registration_status = 'Approved'",
+        (event_id,)
+    )["total"]
+
+
+def _insert_registration(client, event_id, student_id, status):
+    registration_id = str(uuid.uuid4())
+    client.connection().execute(
+        "INSERT INTO registrations (id, student_id, event_id, registration_status, unique_code, created_at) "
+        "VALUES (?, ?, ?, ?, NULL, ?)",
+        (registration_id, student_id, event_id, status, _now())
+    )
+    return registration_id
+
+
+def _reserve_seats(client, p_event_id, p_student_ids):
+    """database_add_rush_mode.sql: reserve_seats"""
+    event = _one(client, "SELECT participant_limit, status FROM events WHERE id = ?", (p_event_id,))
+
+    if event is None or event["status"] != "Active":
+        outcome = "not_found" if event is None else "closed"
+        return [
+            {"student_id": student_id, "outcome": outcome, "new_registration_id": None, "new_status": None, "remaining_seats": None}
+            for student_id in p_student_ids
+        ]
+
+    limit = event["participant_limit"]
+    status = "Approved" if limit is None else "Pending"
+    remaining = None if limit is None else limit - _approved_count(client, p_event_id)
+
+    results = []
+    for student_id in p_student_ids:
+        duplicate = _one(
+            client, "SELECT 1 AS found FROM registrations WHERE event_id = ? AND student_id = ?", (p_event_id, student_id)
+        )
+        if duplicate:
+            results.append({"student_id": student_id, "outcome": "duplicate", "new_registration_id": None, "new_status": None, "remaining_seats": remaining})
+            continue
+
+        if limit is not None and remaining <= 0:
+            results.append({"student_id": student_id, "outcome": "full", "new_registration_id": None, "new_status": None, "remaining_seats": 0})
+            continue
+
+        registration_id = _insert_registration(client, p_event_id, student_id, status)
+        results.append({"student_id": student_id, "outcome": "registered", "new_registration_id": registration_id, "new_status": status, "remaining_seats": remaining})
+
+    return results
+
+
+def _reserve_seat(client, p_event_id, p_student_id):
+    """database_add_seat_reservation.sql: reserve_seat"""
+    row = _reserve_seats(client, p_event_id, [p_student_id])[0]
+    row.pop("student_id")
+    # reserve_seat, unlike reserve_seats, returns no seat count for a duplicate
+    if row["outcome"] == "duplicate":
+        row["remaining_seats"] = None
+    return [row]
+
+
+def _approve_registrations_with_seats(client, p_event_id, p_registration_ids):
+    """database_add_seat_reservation.sql: approve_registrations_with_seats"""
+    event = _one(client, "SELECT participant_limit FROM events WHERE id = ?", (p_event_id,))
+    if event is None:
+        return []
+
+    limit = event["participant_limit"]
+    remaining = None if limit is None else limit - _approved_count(client, p_event_id)
+
+    results = []
+    for registration_id in p_registration_ids:
+        current = _one(
+            client, "SELECT registration_status FROM registrations WHERE id = ? AND event_id = ?", (registration_id, p_event_id)
+        )
+        if current is None:
+            results.append({"registration_id": registration_id, "outcome": "not_found", "unique_code": None, "remaining_seats": remaining})
+            continue
+        if current["registration_status"] != "Pending":
+            results.append({"registration_id": registration_id, "outcome": "not_pending", "unique_code": None, "remaining_seats": remaining})
+            continue
+        if limit is not None and remaining <= 0:
+            results.append({"registration_id": registration_id, "outcome": "full", "unique_code": None, "remaining_seats": 0})
+            continue
+
+        code = str(uuid.uuid4())
+        client.connection().execute(
+            "UPDATE registrations SET registration_status = 'Approved', unique_code = ?, approved_at = ? WHERE id = ?",
+            (code, _now(), registration_id)
+        )
+        if limit is not None:
+            remaining -= 1
+        results.append({"registration_id": registration_id, "outcome": "approved", "unique_code": code, "remaining_seats": remaining})
+
+    return results
+
+
+def _approve_event_request(client, p_request_id):
+    """database_add_approve_event_request.sql: approve_event_request"""
+    request = client.fetch("event_requests", "SELECT * FROM event_requests WHERE id = ?", (p_request_id,))
+    if not request:
+        return [{"outcome": "not_found", "request_status": None, "request": None, "event": None}]
+
+    request = request[0]
+    if request["status"] != "Pending":
+        return [{"outcome": "not_pending", "request_status": request["status"], "request": None, "event": None}]
+
+    request = client.fetch(
+        "event_requests", "UPDATE event_requests SET status = 'Approved' WHERE id = ? RETURNING *", (p_request_id,)
+    )[0]
+
+    event = client.encode("events", new=True, row={
+        "event_request_id": request["id"],
+        "event_name": request["event_name"],
+        "description": request["description"],
+        "location": request["location"],
+        "date": request["date"],
+        "start_time": request["start_time"],
+        "end_time": request["end_time"],
+        "participant_limit": request["participant_limit"],
+        "department_id": request["department_id"],
+        "status": "Active",
+        "created_at": "now()",
+    })
+    event = client.fetch(
+        "events",
+        f'INSERT INTO events ({", ".join(event)}) VALUES ({", ".join("?" for _ in event)}) RETURNING *',
+        list(event.values())
+    )[0]
+
+    if isinstance(request.get("requirements"), list):
+        client.connection().executemany(
+            "INSERT INTO event_requirements (id, event_id, requirement_name, description, created_at) VALUES (?, ?, ?, NULL, ?)",
+            [(str(uuid.uuid4()), event["id"], name, _now()) for name in request["requirements"]]
+        )
+
+    return [{"outcome": "approved", "request_status": request["status"], "request": request, "event": event}]
+
+
+def _refresh_department_kpi_snapshot(client, p_department_id=None):
+    # department_kpi_snapshot is a view here, always up to date
+    return None
+
+
+RPC_FUNCTIONS = {
+    "reserve_seat": _reserve_seat,
+    "reserve_seats": _reserve_seats,
+    "approve_registrations_with_seats": _approve_registrations_with_seats,
+    "approve_event_request": _approve_event_request,
+    "refresh_department_kpi_snapshot": _refresh_department_kpi_snapshot,
+}
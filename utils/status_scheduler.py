@@ -0,0 +1,113 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from config import supabase
+
+WATERMARK_NAME = "event_status"
+
+# Upper bound on how long the worker sleeps, so events created or edited by
+# another worker are still picked up without a page view
+MAX_SLEEP_SECONDS = int(os.getenv("STATUS_SCHEDULER_INTERVAL", 300))
+MIN_SLEEP_SECONDS = 5
+
+
+class StatusScheduler:
+    """Background worker that flips finished events from Active to Completed"""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the worker thread (no-op if it is already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._run, name="status-scheduler", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Ask the worker to re-check now (e.g. after an event was created or moved)"""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            next_run_at = self.tick()
+
+            sleep_seconds = MAX_SLEEP_SECONDS
+            if next_run_at:
+                until_due = (next_run_at - datetime.now()).total_seconds()
+                sleep_seconds = max(MIN_SLEEP_SECONDS, min(MAX_SLEEP_SECONDS, until_due))
+
+            self._wake.wait(sleep_seconds)
+            self._wake.clear()
+
+    def tick(self):
+        """
+        Run one transition pass if the persisted watermark says it is due
+        Returns the next time a transition is expected
+        """
+        from models.event_management import EventManagement
+
+        try:
+            now = datetime.now()
+            next_run_at = get_watermark()
+
+            if next_run_at and next_run_at > now:
+                return next_run_at
+
+            updated = EventManagement.complete_due_events()
+            if updated:
+                print(f"Status scheduler: marked {updated} event(s) as Completed")
+
+            next_run_at = EventManagement.get_next_status_transition()
+            # Nothing scheduled: look again on the next regular interval
+            set_watermark(next_run_at or now + timedelta(seconds=MAX_SLEEP_SECONDS), ran=True)
+            return next_run_at
+        except Exception as e:
+            print(f"Error in status scheduler tick: {e}")
+            return None
+
+
+def get_watermark():
+    """Read the persisted 'next transition at' time"""
+    result = supabase.table("scheduler_watermarks").select("next_run_at").eq("name", WATERMARK_NAME).execute()
+
+    if not result.data or not result.data[0].get("next_run_at"):
+        return None
+
+    return datetime.fromisoformat(result.data[0]["next_run_at"])
+
+
+def set_watermark(next_run_at, ran=False):
+    """Persist the next transition time (None means 'run on the next tick')"""
+    watermark = {
+        "name": WATERMARK_NAME,
+        "next_run_at": next_run_at.isoformat() if next_run_at else None
+    }
+
+    if ran:
+        watermark["last_run_at"] = "now()"
+
+    supabase.table("scheduler_watermarks").upsert(watermark, on_conflict="name").execute()
+
+
+def request_status_recheck():
+    """
+    Clear the watermark after an event is created or rescheduled
+    Its end time may be earlier than the one the worker is waiting for.
+    """
+    try:
+        set_watermark(None)
+        status_scheduler.wake()
+    except Exception as e:
+        print(f"Error resetting status watermark: {e}")
+
+
+status_scheduler = StatusScheduler()
+
+
+def start_status_scheduler():
+    """Start the background worker unless disabled with STATUS_SCHEDULER_ENABLED=0"""
+    if os.getenv("STATUS_SCHEDULER_ENABLED", "1") == "1":
+        status_scheduler.start()
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+# Bump when the rendering below changes so cached images and ETags are replaced
+RENDER_VERSION = "qr-v1-box10-border5"
+
+MEMORY_CACHE_SIZE = int(os.getenv("TICKET_IMAGE_CACHE_SIZE", 256))
+
+# Optional directory for rendered PNGs shared across restarts/workers (unset = memory only)
+DISK_CACHE_DIR = os.getenv("TICKET_IMAGE_CACHE_DIR")
+
+
+def _render_qr_png(unique_code):
+    """Render the ticket QR code for a registration's unique code as PNG bytes"""
+    import qrcode
+
+    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+    qr.add_data(unique_code)
+    qr.make(fit=True)
+
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    buffered = BytesIO()
+    img.save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def ticket_etag(unique_code):
+    """ETag for a ticket image; known without rendering the image"""
+    return hashlib.sha256(f"{RENDER_VERSION}:{unique_code}".encode()).hexdigest()[:32]
+
+
+class TicketImageCache:
+    """Bounded LRU of rendered ticket PNGs, backed by an optional disk cache"""
+
+    def __init__(self, max_entries=MEMORY_CACHE_SIZE, disk_dir=DISK_CACHE_DIR):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get_png(self, unique_code):
+        """Return the PNG for a unique code, rendering it only on the first request"""
+        with self._lock:
+            png = self._images.get(unique_code)
+            if png is not None:
+                self._images.move_to_end(unique_code)
+                return png
+
+        png = self._read_disk(unique_code)
+        if png is None:
+            png = _render_qr_png(unique_code)
+            self._write_disk(unique_code, png)
+
+        with self._lock:
+            self._images[unique_code] = png
+            self._images.move_to_end(unique_code)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+        return png
+
+    def _disk_path(self, unique_code):
+        # File names are derived from a hash so a code can never escape the directory
+        return os.path.join(self.disk_dir, f"{ticket_etag(unique_code)}.png")
+
+    def _read_disk(self, unique_code):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(unique_code), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Error reading ticket image cache: {e}")
+            return None
+
+    def _write_disk(self, unique_code, png):
+        if not self.disk_dir:
+            return
+        try:
+            # Write to a temp file first so readers never see a partial image
+            path = self._disk_path(unique_code)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(png)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing ticket image cache: {e}")
+
+
+ticket_images = TicketImageCache()